@@ -0,0 +1,206 @@
+"""일정 장소 -> 기상청 예보 격자/중기예보 구역 변환 모듈
+
+단기예보는 5km 격자(nx, ny) 단위, 중기예보는 광역 구역(regId) 단위로 발표됩니다.
+일정의 장소 문자열에서 서울 밖 도시/지역을 먼저 찾고, 없으면 서울시 구를 찾아 그
+좌표를 기상청 람베르트 정각원추도법(LCC) 격자로 변환하며, 같은 지명에서 중기예보
+구역을 함께 고릅니다. 같은 격자에 속하는 일정들은 같은 예보를 공유하므로 예보
+요청은 서로 다른 격자 수만큼만 발생합니다.
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from chatbot.graph_modules.districts import seoul_district_coordinates, seoul_districts
+
+# 기상청 단기예보 격자 변환 상수 (동네예보 격자 좌표계)
+EARTH_RADIUS_KM = 6371.00877
+GRID_SPACING_KM = 5.0
+STANDARD_LAT1 = 30.0
+STANDARD_LAT2 = 60.0
+ORIGIN_LON = 126.0
+ORIGIN_LAT = 38.0
+ORIGIN_X = 43
+ORIGIN_Y = 136
+
+# 기본 위치: 서울 시청 (기존 고정 격자 60, 127)
+DEFAULT_COORDINATES = (37.5665, 126.9780)
+DEFAULT_MID_REGION = "11B00000"  # 서울/인천/경기
+
+# 서울 밖 주요 도시 (지명 -> 중심 좌표(위도, 경도), 중기 육상예보 구역)
+CITY_TARGETS = {
+    "인천": ((37.4563, 126.7052), "11B00000"),
+    "수원": ((37.2636, 127.0286), "11B00000"),
+    # 광역시 "광주"보다 먼저 비교되도록 긴 이름으로 등록
+    "경기광주": ((37.4295, 127.2550), "11B00000"),
+    "경기도광주": ((37.4295, 127.2550), "11B00000"),
+    "춘천": ((37.8813, 127.7298), "11D10000"),
+    "강릉": ((37.7519, 128.8761), "11D20000"),
+    "대전": ((36.3504, 127.3845), "11C20000"),
+    "청주": ((36.6424, 127.4890), "11C10000"),
+    "전주": ((35.8242, 127.1480), "11F10000"),
+    "광주": ((35.1595, 126.8526), "11F20000"),
+    "대구": ((35.8714, 128.6014), "11H10000"),
+    "울산": ((35.5384, 129.3114), "11H20000"),
+    "부산": ((35.1796, 129.0756), "11H20000"),
+    "제주": ((33.4996, 126.5312), "11G00000"),
+    "서귀포": ((33.2541, 126.5601), "11G00000"),
+}
+
+# 도시를 찾지 못했을 때 지역명으로 고르는 중기 육상예보 구역 (구역 대표 도시 좌표)
+MID_TERM_REGIONS = [
+    (("인천", "경기"), "11B00000", CITY_TARGETS["수원"][0]),
+    (("강원영서", "춘천", "원주", "홍천"), "11D10000", CITY_TARGETS["춘천"][0]),
+    (("강원", "강릉", "속초", "동해"), "11D20000", CITY_TARGETS["강릉"][0]),
+    # "세종로", "세종문화회관" 같은 서울 지명과 겹치지 않도록 "세종시"로 비교
+    (("대전", "세종시", "세종특별", "충남", "천안", "공주"), "11C20000", CITY_TARGETS["대전"][0]),
+    (("충북", "청주", "충주"), "11C10000", CITY_TARGETS["청주"][0]),
+    (("광주", "전남", "목포", "여수", "순천"), "11F20000", CITY_TARGETS["광주"][0]),
+    (("전북", "전주", "군산", "익산"), "11F10000", CITY_TARGETS["전주"][0]),
+    (("대구", "경북", "포항", "경주", "안동"), "11H10000", CITY_TARGETS["대구"][0]),
+    (("부산", "울산", "경남", "창원", "김해"), "11H20000", CITY_TARGETS["부산"][0]),
+    (("제주", "서귀포"), "11G00000", CITY_TARGETS["제주"][0]),
+]
+
+# 행정동 이름에 없는 자주 쓰는 지명
+PLACE_HINTS = {
+    "홍대": "마포구",
+    "합정": "마포구",
+    "잠실": "송파구",
+    "여의도": "영등포구",
+    "이태원": "용산구",
+    "성수": "성동구",
+    "건대": "광진구",
+    "신촌": "서대문구",
+    "강남역": "강남구",
+    "광화문": "종로구",
+    "인사동": "종로구",
+}
+
+
+class WeatherTarget(NamedTuple):
+    """예보를 공유하는 단위 (단기예보 격자 + 중기예보 구역)"""
+
+    nx: int
+    ny: int
+    reg_id: str
+
+
+def latlon_to_grid(lat: float, lon: float) -> Tuple[int, int]:
+    """위경도를 기상청 단기예보 격자 좌표(nx, ny)로 변환 (LCC 투영)
+
+    Args:
+        lat: 위도
+        lon: 경도
+
+    Returns:
+        (nx, ny) 튜플 (예: 서울 시청 -> (60, 127))
+    """
+    degrad = math.pi / 180.0
+    re_ = EARTH_RADIUS_KM / GRID_SPACING_KM
+    slat1 = STANDARD_LAT1 * degrad
+    slat2 = STANDARD_LAT2 * degrad
+    olon = ORIGIN_LON * degrad
+    olat = ORIGIN_LAT * degrad
+
+    sn = math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
+    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
+    sf = math.tan(math.pi * 0.25 + slat1 * 0.5)
+    sf = math.pow(sf, sn) * math.cos(slat1) / sn
+    ro = math.tan(math.pi * 0.25 + olat * 0.5)
+    ro = re_ * sf / math.pow(ro, sn)
+
+    ra = math.tan(math.pi * 0.25 + lat * degrad * 0.5)
+    ra = re_ * sf / math.pow(ra, sn)
+    theta = lon * degrad - olon
+    if theta > math.pi:
+        theta -= 2.0 * math.pi
+    if theta < -math.pi:
+        theta += 2.0 * math.pi
+    theta *= sn
+
+    nx = math.floor(ra * math.sin(theta) + ORIGIN_X + 0.5)
+    ny = math.floor(ro - ra * math.cos(theta) + ORIGIN_Y + 0.5)
+    return nx, ny
+
+
+def _dong_base_name(dong: str) -> str:
+    """행정동 이름에서 번호/접미사를 뺀 기본 이름 (예: "역삼1동" -> "역삼")"""
+    return re.sub(r"(제?[\d·.,]*(본)?동|[\d·.,]+가동)$", "", dong)
+
+
+@lru_cache(maxsize=1)
+def _dong_to_district() -> Dict[str, str]:
+    """행정동 기본 이름 -> 구 (두 글자 이상, 먼저 나온 구 우선)"""
+    mapping = {}
+    for district, dongs in seoul_districts.items():
+        for dong in dongs:
+            base = _dong_base_name(dong)
+            if len(base) >= 2:
+                mapping.setdefault(base, district)
+    return mapping
+
+
+def find_district(location: Optional[str]) -> Optional[str]:
+    """장소 문자열에서 서울시 구 이름 찾기 (구 이름, 지명, 행정동 순)"""
+    if not location:
+        return None
+    text = location.replace(" ", "")
+    for district in seoul_districts:
+        if district in text:
+            return district
+    for hint, district in PLACE_HINTS.items():
+        if hint in text:
+            return district
+    # 긴 이름부터 비교해 "신사"보다 "압구정" 같은 구체적인 이름을 우선
+    for base, district in sorted(
+        _dong_to_district().items(), key=lambda item: -len(item[0])
+    ):
+        if base in text:
+            return district
+    return None
+
+
+def find_region(location: Optional[str]) -> Optional[Tuple[Tuple[float, float], str]]:
+    """장소 문자열에서 서울 밖 도시/지역 찾기 (긴 도시 이름 -> 지역명 순)
+
+    Returns:
+        (좌표, 중기예보 구역 ID) 튜플 (서울 밖 지명이 없으면 None)
+    """
+    text = (location or "").replace(" ", "")
+    for city in sorted(CITY_TARGETS, key=len, reverse=True):
+        if city in text:
+            return CITY_TARGETS[city]
+    for keywords, reg_id, coordinates in MID_TERM_REGIONS:
+        if any(keyword in text for keyword in keywords):
+            return coordinates, reg_id
+    return None
+
+
+def find_mid_region(location: Optional[str]) -> str:
+    """장소 문자열에 맞는 중기예보 구역 ID (찾지 못하면 서울/인천/경기)"""
+    return get_weather_target(location).reg_id
+
+
+@lru_cache(maxsize=1024)
+def get_weather_target(location: Optional[str] = None) -> WeatherTarget:
+    """일정 장소에 해당하는 예보 단위 (격자 + 중기예보 구역)
+
+    "서울"이 없는 장소에서 서울 밖 도시/지역을 먼저 찾아 그 좌표와 중기예보 구역을
+    함께 사용합니다 ("부산 중구", "제주 공항"이 서울 구/행정동과 겹치지 않도록).
+    서울 밖 지명이 없으면 서울시 구청 좌표, 구도 찾지 못하면 서울 시청 격자를
+    사용합니다.
+    """
+    text = (location or "").replace(" ", "")
+    region = None if "서울" in text else find_region(location)
+    if region:
+        coordinates, reg_id = region
+        return WeatherTarget(*latlon_to_grid(*coordinates), reg_id)
+
+    district = find_district(location)
+    coordinates = seoul_district_coordinates[district] if district else DEFAULT_COORDINATES
+    return WeatherTarget(*latlon_to_grid(*coordinates), DEFAULT_MID_REGION)
+
+
+DEFAULT_TARGET = WeatherTarget(*latlon_to_grid(*DEFAULT_COORDINATES), DEFAULT_MID_REGION)
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.6 on 2026-10-19 18:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_app', '0002_recommendedplace'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherForecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nx', models.PositiveSmallIntegerField()),
+                ('ny', models.PositiveSmallIntegerField()),
+                ('reg_id', models.CharField(max_length=8)),
+                ('date', models.DateField()),
+                ('time', models.CharField(blank=True, default='', max_length=4)),
+                ('temperature', models.CharField(blank=True, max_length=20)),
+                ('rain_probability', models.CharField(blank=True, max_length=10)),
+                ('sky', models.CharField(blank=True, max_length=2, null=True)),
+                ('pty', models.CharField(blank=True, max_length=2, null=True)),
+                ('icon', models.CharField(blank=True, max_length=20)),
+                ('description', models.CharField(blank=True, max_length=100)),
+                ('issued_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['date', 'time'],
+                'constraints': [models.UniqueConstraint(fields=('nx', 'ny', 'reg_id', 'date', 'time'), name='weather_forecast_slot_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-19 18:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_app', '0003_weatherforecast'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['user', 'date'], name='schedule_user_date_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-19 18:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_app', '0004_schedule_user_date_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recommendedplace',
+            index=models.Index(fields=['user', 'date', 'place_type'], name='recplace_user_date_type_idx'),
+        ),
+    ]
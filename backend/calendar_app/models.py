@@ -19,6 +19,10 @@ class Schedule(models.Model):
 
     class Meta:
         ordering = ['-date', '-created_at']
+        indexes = [
+            # 사용자별 날짜 범위 조회 / (date, -id) 커서 페이지네이션
+            models.Index(fields=['user', 'date'], name='schedule_user_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.date} - {self.location}"
@@ -41,6 +45,44 @@ class RecommendedPlace(models.Model):
     
     class Meta:
         ordering = ['-date', '-created_at']
+        indexes = [
+            # 사용자별 날짜(+유형) 추천 장소 조회 / 달력 요약 집계
+            models.Index(fields=['user', 'date', 'place_type'], name='recplace_user_date_type_idx'),
+        ]
         
     def __str__(self):
         return f"{self.date} - {self.place_name}"
+
+
+class WeatherForecast(models.Model):
+    """예보 격자/구역별 날씨 예보 (발표 시각마다 갱신 작업이 일괄 upsert)
+
+    단기예보는 시간대(time)별, 중기예보는 하루 한 건(time="")으로 저장합니다.
+    같은 격자·날짜·시간대는 최신 발표분으로 덮어쓰고, 지난 날짜는 이력으로 남습니다.
+    """
+    nx = models.PositiveSmallIntegerField()  # 단기예보 격자 X
+    ny = models.PositiveSmallIntegerField()  # 단기예보 격자 Y
+    reg_id = models.CharField(max_length=8)  # 중기예보 구역 ID
+    date = models.DateField()
+    time = models.CharField(max_length=4, blank=True, default='')  # HHMM, 중기예보는 빈 문자열
+    temperature = models.CharField(max_length=20, blank=True)  # 중기예보는 "최저~최고"
+    rain_probability = models.CharField(max_length=10, blank=True)
+    sky = models.CharField(max_length=2, blank=True, null=True)  # SKY 코드 (단기예보)
+    pty = models.CharField(max_length=2, blank=True, null=True)  # PTY 코드 (단기예보)
+    icon = models.CharField(max_length=20, blank=True)
+    description = models.CharField(max_length=100, blank=True)  # 중기예보 날씨 설명
+    issued_at = models.DateTimeField()  # 예보 발표 시각
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['date', 'time']
+        constraints = [
+            # upsert 대상 키 + 격자별 날짜 범위 조회 인덱스
+            models.UniqueConstraint(
+                fields=['nx', 'ny', 'reg_id', 'date', 'time'],
+                name='weather_forecast_slot_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.time} ({self.nx}, {self.ny}, {self.reg_id})"
@@ -0,0 +1,96 @@
+"""일정 목록 조회용 날짜 범위/커서(keyset) 페이지네이션 모듈
+
+일정은 날짜 오름차순, 같은 날짜 안에서는 id 내림차순(최근 생성 순)으로 정렬하고,
+다음 페이지는 OFFSET 대신 마지막으로 반환한 일정의 (date, id) 다음부터 읽습니다.
+(user, date) 인덱스를 타므로 사용자의 일정이 몇 년 치로 늘어나도 페이지마다 읽는
+행 수와 응답 크기가 일정합니다.
+
+기존 목록(Meta.ordering: -date, -created_at)은 날짜 내림차순이었지만, 달력 범위 조회와
+커서 페이지네이션을 위해 날짜는 오름차순으로 바뀌었습니다. 같은 날짜의 일정은 기존과
+같이 최근 일정이 먼저 오므로 `?date=` 조회의 첫 일정이 추천 장소 메모를 붙이는 일정
+(views.add_recommended_places, 그날의 가장 최근 일정)과 같습니다.
+"""
+
+import base64
+import datetime
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q
+
+
+class InvalidQueryParam(ValueError):
+    """잘못된 날짜/커서/개수 쿼리 파라미터"""
+
+
+def parse_date_param(value: Optional[str], name: str) -> Optional[datetime.date]:
+    """YYYY-MM-DD 쿼리 파라미터를 date로 변환 (없으면 None)
+
+    Raises:
+        InvalidQueryParam: 형식이 잘못됨
+    """
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value[:10])
+    except ValueError:
+        raise InvalidQueryParam(f"{name}은(는) YYYY-MM-DD 형식이어야 합니다.")
+
+
+def parse_limit_param(value: Optional[str]) -> int:
+    """페이지 크기 (기본 SCHEDULE_PAGE_SIZE, 최대 SCHEDULE_MAX_PAGE_SIZE)"""
+    if not value:
+        return settings.SCHEDULE_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise InvalidQueryParam("limit은 숫자여야 합니다.")
+    if limit < 1:
+        raise InvalidQueryParam("limit은 1 이상이어야 합니다.")
+    return min(limit, settings.SCHEDULE_MAX_PAGE_SIZE)
+
+
+def encode_cursor(date: datetime.date, pk: int) -> str:
+    """마지막으로 반환한 일정의 (date, id)를 불투명한 커서 문자열로 변환"""
+    raw = f"{date.isoformat()}:{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime.date, int]:
+    """커서 문자열을 (date, id)로 변환
+
+    Raises:
+        InvalidQueryParam: 잘못된 커서
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_str, pk = base64.urlsafe_b64decode(padded).decode().split(":")
+        return datetime.date.fromisoformat(date_str), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidQueryParam("잘못된 cursor 값입니다.")
+
+
+def paginate_by_date(queryset, cursor: Optional[str], limit: int):
+    """(date 오름차순, id 내림차순) keyset 페이지 하나와 다음 페이지 커서 반환
+
+    limit + 1개를 읽어 다음 페이지가 있는지 판단하므로 COUNT 쿼리가 필요 없습니다.
+
+    Args:
+        queryset: date, id 필드가 있는 일정 쿼리셋
+        cursor: 이전 페이지의 next_cursor (없으면 첫 페이지)
+        limit: 페이지 크기
+
+    Returns:
+        (일정 목록, 다음 페이지 커서 또는 None) 튜플
+    """
+    queryset = queryset.order_by("date", "-id")
+    if cursor:
+        last_date, last_pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(date__gt=last_date) | Q(date=last_date, id__lt=last_pk)
+        )
+    items = list(queryset[: limit + 1])
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, encode_cursor(items[-1].date, items[-1].id)
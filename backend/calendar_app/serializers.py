@@ -2,12 +2,25 @@ from rest_framework import serializers
 from .models import Schedule
 from datetime import datetime
 
+# 목록 API 기본 필드 (memo는 상세 조회에서만 반환)
+SCHEDULE_LIST_FIELDS = ['id', 'date', 'location', 'companion', 'weather_main', 'weather_icon', 'created_at', 'updated_at']
+
+
 class ScheduleSerializer(serializers.ModelSerializer):
     class Meta:
         model = Schedule
         fields = ['id', 'date', 'location', 'companion', 'memo', 'weather_main', 'weather_icon', 'created_at', 'updated_at']
         read_only_fields = ['created_at', 'updated_at', 'weather_main', 'weather_icon']
 
+    def __init__(self, *args, fields=None, **kwargs):
+        """
+        fields: 직렬화할 필드 이름 목록 (선택, 없으면 모든 필드)
+        """
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     def validate_date(self, value):
         """
         날짜 유효성 검사
@@ -1,3 +1,586 @@
-from django.test import TestCase
+import datetime
+import re
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from . import utils, weather
+from .grid import DEFAULT_TARGET, WeatherTarget, get_weather_target, latlon_to_grid
+from .models import RecommendedPlace, Schedule, WeatherForecast
+
+
+class QueryPlanAssertionsMixin:
+    """쿼리 수와 실행 계획(EXPLAIN) 형태 검증 도우미
+
+    뷰 실행 중 캡처한 SQL을 그대로 EXPLAIN해 인덱스를 타는지 확인합니다.
+    PostgreSQL은 테스트용 작은 테이블이면 항상 순차 스캔을 고르므로 enable_seqscan을
+    끄고 계획을 확인합니다 (인덱스를 쓸 수 없는 쿼리만 순차 스캔으로 남음).
+    """
+
+    def explain(self, sql):
+        """SQL의 실행 계획을 한 문자열로 반환"""
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute(f"EXPLAIN {sql}")
+                return "\n".join(row[0] for row in cursor.fetchall())
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+
+    def find_query(self, queries, table):
+        """캡처한 쿼리 중 table을 읽는 첫 SELECT 문"""
+        for query in queries:
+            sql = query["sql"]
+            if sql.lstrip().upper().startswith("SELECT") and f'FROM "{table}"' in sql:
+                return sql
+        self.fail(f"{table} 조회 쿼리가 없습니다: {[q['sql'] for q in queries]}")
+
+    def assertNoSeqScan(self, sql, table):
+        plan = self.explain(sql)
+        self.assertNotIn(f"Seq Scan on {table}", plan, plan)
+        self.assertIsNone(re.search(rf"\bSCAN {table}\b", plan), plan)
+        return plan
+
+    def assertUsesIndex(self, queries, table, index_name):
+        """table 조회 쿼리가 index_name 인덱스를 타고 순차 스캔이 없는지 확인"""
+        plan = self.assertNoSeqScan(self.find_query(queries, table), table)
+        self.assertIn(index_name, plan)
+
+
+@mock.patch("calendar_app.weather.refresh_weather_in_background")
+class CalendarQueryCountTests(QueryPlanAssertionsMixin, TestCase):
+    """일정/달력/추천 장소 API의 쿼리 수와 실행 계획 회귀 테스트
+
+    기상청 갱신은 백그라운드 스레드에서 외부 API를 호출하므로 막아둡니다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="planner", nickname="planner", email="planner@example.com"
+        )
+        other = User.objects.create_user(
+            username="other", nickname="other", email="other@example.com"
+        )
+        cls.today = timezone.localdate()
+        for owner in (cls.user, other):
+            Schedule.objects.bulk_create(
+                Schedule(
+                    user=owner,
+                    date=cls.today + datetime.timedelta(days=i % 40),
+                    location="강남구",
+                    companion="친구",
+                    memo="메모" * 200,
+                )
+                for i in range(60)
+            )
+            RecommendedPlace.objects.bulk_create(
+                RecommendedPlace(
+                    user=owner,
+                    date=cls.today + datetime.timedelta(days=i % 5),
+                    place_name=f"장소 {i}",
+                    place_type="event" if i % 2 else "general",
+                )
+                for i in range(10)
+            )
+        WeatherForecast.objects.create(
+            nx=DEFAULT_TARGET.nx,
+            ny=DEFAULT_TARGET.ny,
+            reg_id=DEFAULT_TARGET.reg_id,
+            date=cls.today,
+            time="1200",
+            temperature="20",
+            rain_probability="10",
+            icon="☀️",
+            issued_at=timezone.now(),
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_schedule_list_range(self, _refresh):
+        start = self.today.isoformat()
+        end = (self.today + datetime.timedelta(days=30)).isoformat()
+        # 일정 1 + 저장된 예보 1
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/calendar/schedules/", {"start": start, "end": end, "limit": 20}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(len(response.data["schedules"]), 20)
+        self.assertIsNotNone(response.data["next_cursor"])
+        self.assertUsesIndex(queries, "calendar_app_schedule", "schedule_user_date_idx")
+        self.assertNoSeqScan(
+            self.find_query(queries, "calendar_app_weatherforecast"),
+            "calendar_app_weatherforecast",
+        )
+        # 목록에서는 memo를 읽지 않음
+        self.assertNotIn('"memo"', self.find_query(queries, "calendar_app_schedule"))
+
+    def test_schedule_list_next_page(self, _refresh):
+        first = self.client.get("/calendar/schedules/", {"limit": 25})
+        # 다음 페이지는 일정 1 (날씨는 첫 페이지에만 포함)
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                "/calendar/schedules/",
+                {"limit": 25, "cursor": first.data["next_cursor"]},
+            )
+        ids = [s["id"] for s in first.data["schedules"] + response.data["schedules"]]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(response.data["weather"], [])
+
+    def test_same_date_schedule_matches_memo_target(self, _refresh):
+        # 같은 날짜 일정이 여러 개면 목록의 첫 일정(최근 일정)에 추천 장소 메모를 붙임
+        date = self.today + datetime.timedelta(days=50)
+        older, newer = (
+            Schedule.objects.create(user=self.user, date=date, location=name, companion="")
+            for name in ("먼저", "나중")
+        )
+        listed = self.client.get(
+            "/calendar/schedules/", {"date": date.isoformat(), "fields": "id,date"}
+        )
+        self.assertEqual(
+            [s["id"] for s in listed.data["schedules"]], [newer.id, older.id]
+        )
+        response = self.client.post(
+            "/calendar/add-recommended-places/",
+            {"date": date.isoformat(), "places": [{"place_name": "추천"}]},
+            format="json",
+        )
+        self.assertEqual(response.data["schedule_id"], newer.id)
+
+    def test_schedule_list_sparse_fields(self, _refresh):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/calendar/schedules/", {"fields": "id,date", "limit": 5}
+            )
+        self.assertEqual(set(response.data["schedules"][0]), {"id", "date"})
+        sql = self.find_query(queries, "calendar_app_schedule")
+        self.assertNotIn('"location"', sql)
+        self.assertEqual(
+            self.client.get("/calendar/schedules/", {"fields": "memo"}).status_code, 400
+        )
+
+    def test_schedule_detail(self, _refresh):
+        schedule = Schedule.objects.filter(user=self.user).first()
+        # 일정 1 + 저장된 예보 1
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/calendar/schedules/{schedule.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("memo", response.data)
+
+    def test_calendar_summary(self, _refresh):
+        # 일정/추천 장소 집계 UNION ALL 1 + 저장된 예보 1
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/calendar/summary/",
+                {"year": self.today.year, "month": self.today.month},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 2)
+        plan = self.explain(self.find_query(queries, "calendar_app_schedule"))
+        self.assertIn("schedule_user_date_idx", plan)
+        self.assertIn("recplace_user_date_type_idx", plan)
+        today = next(d for d in response.data["days"] if d["date"] == self.today.isoformat())
+        self.assertGreater(today["schedule_count"], 0)
+        self.assertEqual(today["recommended_count"], 2)
+
+    def test_calendar_summary_month_bounds(self, _refresh):
+        response = self.client.get("/calendar/summary/", {"year": 9999, "month": 12})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["days"], [])
+        response = self.client.get("/calendar/summary/", {"year": 2025, "month": 13})
+        self.assertEqual(response.status_code, 400)
+
+    def test_recommended_place_list(self, _refresh):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/calendar/recommended-places/",
+                {"date": self.today.isoformat(), "place_type": "event"},
+            )
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(all(p["place_type"] == "event" for p in response.data))
+        self.assertUsesIndex(
+            queries, "calendar_app_recommendedplace", "recplace_user_date_type_idx"
+        )
+
+    def test_bulk_add_recommended_places(self, _refresh):
+        date = self.today + datetime.timedelta(days=1)
+        places = [{"place_name": f"추천 {i}", "place_location": "성수"} for i in range(5)]
+        # SAVEPOINT + INSERT(일괄) + 일정 조회 + 메모 UPDATE + RELEASE
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/calendar/add-recommended-places/",
+                {"date": date.isoformat(), "places": places},
+                format="json",
+            )
+        # 기존 일정에 추가하면 단건 API와 같이 200
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 5)
+        self.assertEqual(len(response.data["recommended_place_ids"]), 5)
+        self.assertUsesIndex(queries, "calendar_app_schedule", "schedule_user_date_idx")
+        memo = Schedule.objects.get(pk=response.data["schedule_id"]).memo
+        self.assertIn("추천 4", memo)
+
+
+@mock.patch("calendar_app.weather.refresh_weather_in_background")
+class CalendarWriteQueryCountTests(QueryPlanAssertionsMixin, TestCase):
+    """일정/추천 장소 생성·수정·삭제 API의 쿼리 수와 실행 계획 회귀 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="writer", nickname="writer", email="writer@example.com"
+        )
+        cls.today = timezone.localdate()
+        Schedule.objects.bulk_create(
+            Schedule(
+                user=cls.user,
+                date=cls.today + datetime.timedelta(days=i),
+                location="강남구",
+                companion="친구",
+            )
+            for i in range(30)
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.date = self.today + datetime.timedelta(days=60)
+
+    def schedule_payload(self, **overrides):
+        return {
+            "date": self.date.isoformat(),
+            "location": "마포구",
+            "companion": "가족",
+            "memo": "메모",
+            **overrides,
+        }
+
+    def test_create_schedule(self, _refresh):
+        # 일정 장소의 저장된 예보 1 + INSERT 1
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/calendar/schedules/", self.schedule_payload(), format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(queries), 2)
+        self.assertNoSeqScan(
+            self.find_query(queries, "calendar_app_weatherforecast"),
+            "calendar_app_weatherforecast",
+        )
+
+    def test_update_schedule(self, _refresh):
+        schedule = Schedule.objects.create(
+            user=self.user, date=self.date, location="마포구", companion=""
+        )
+        # 일정 조회 1 + 저장된 예보 1 + UPDATE 1
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(
+                f"/calendar/schedules/{schedule.id}/",
+                self.schedule_payload(location="종로구"),
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 3)
+        self.assertNoSeqScan(
+            self.find_query(queries, "calendar_app_schedule"), "calendar_app_schedule"
+        )
+        schedule.refresh_from_db()
+        self.assertEqual(schedule.location, "종로구")
+
+    def test_delete_schedule(self, _refresh):
+        schedule = Schedule.objects.create(
+            user=self.user, date=self.date, location="마포구", companion=""
+        )
+        # 일정 조회 1 + DELETE 1
+        with self.assertNumQueries(2):
+            response = self.client.delete(f"/calendar/schedules/{schedule.id}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Schedule.objects.filter(pk=schedule.id).exists())
+
+    def test_add_recommended_place_to_existing_schedule(self, _refresh):
+        schedule = Schedule.objects.create(
+            user=self.user, date=self.date, location="성수", companion="", memo=None
+        )
+        Schedule.objects.filter(pk=schedule.pk).update(
+            updated_at=timezone.now() - datetime.timedelta(days=1)
+        )
+        # SAVEPOINT + INSERT + 일정 조회 + 메모 UPDATE + RELEASE
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/calendar/add-recommended-place/",
+                {"date": self.date.isoformat(), "place_name": "카페", "place_location": "성수"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 5)
+        self.assertEqual(response.data["schedule_id"], schedule.id)
+        self.assertUsesIndex(queries, "calendar_app_schedule", "schedule_user_date_idx")
+        # NULL 메모는 구분자 없이 추천 내용으로 채우고 updated_at도 갱신
+        schedule.refresh_from_db()
+        self.assertTrue(schedule.memo.startswith("[추천된 장소]\n이름: 카페"))
+        self.assertGreater(
+            schedule.updated_at, timezone.now() - datetime.timedelta(minutes=1)
+        )
+
+    def test_add_recommended_place_creates_schedule(self, _refresh):
+        # SAVEPOINT + INSERT + 일정 조회 + 일정 INSERT + RELEASE
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/calendar/add-recommended-place/",
+                {"date": self.date.isoformat(), "place_name": "공연", "place_type": "event"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(queries), 5)
+        schedule = Schedule.objects.get(pk=response.data["schedule_id"])
+        self.assertEqual(schedule.date, self.date)
+        self.assertTrue(schedule.memo.startswith("[추천된 이벤트]"))
+
+    def test_bulk_add_creates_schedule(self, _refresh):
+        places = [{"place_name": f"추천 {i}"} for i in range(3)]
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                "/calendar/add-recommended-places/",
+                {"date": self.date.isoformat(), "places": places},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+        memo = Schedule.objects.get(pk=response.data["schedule_id"]).memo
+        self.assertEqual(memo.count("[추천된 장소]"), 3)
+        self.assertEqual(
+            RecommendedPlace.objects.filter(user=self.user, date=self.date).count(), 3
+        )
+
+    def test_bulk_add_to_empty_memo(self, _refresh):
+        schedule = Schedule.objects.create(
+            user=self.user, date=self.date, location="", companion="", memo=""
+        )
+        response = self.client.post(
+            "/calendar/add-recommended-places/",
+            {"date": self.date.isoformat(), "places": [{"place_name": "전시"}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        schedule.refresh_from_db()
+        self.assertTrue(schedule.memo.startswith("[추천된 장소]"))
+
+    def test_recommended_place_detail(self, _refresh):
+        place = RecommendedPlace.objects.create(
+            user=self.user, date=self.date, place_name="박물관"
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/calendar/recommended-places/{place.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+        self.assertNoSeqScan(
+            self.find_query(queries, "calendar_app_recommendedplace"),
+            "calendar_app_recommendedplace",
+        )
+        # 추천 장소 조회 1 + DELETE 1
+        with self.assertNumQueries(2):
+            response = self.client.delete(f"/calendar/recommended-places/{place.id}/")
+        self.assertEqual(response.status_code, 204)
+
+
+class ScheduleWeatherRefreshTests(TestCase):
+    """발표분이 저장된 격자부터 일정 날씨를 반영하는지 확인"""
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(
+            username="traveler", nickname="traveler", email="traveler@example.com"
+        )
+        date = timezone.localdate() + datetime.timedelta(days=1)
+        self.seoul = Schedule.objects.create(
+            user=user, date=date, location="강남구", companion=""
+        )
+        self.busan = Schedule.objects.create(
+            user=user, date=date, location="부산 해운대", companion=""
+        )
+        self.date = date
+
+    def save_forecast(self, location, icon):
+        target = get_weather_target(location)
+        WeatherForecast.objects.create(
+            nx=target.nx,
+            ny=target.ny,
+            reg_id=target.reg_id,
+            date=self.date,
+            time="1200",
+            icon=icon,
+            issued_at=weather.get_issue_time(),
+        )
+        return target
+
+    def test_refreshed_grids_update_without_waiting_for_others(self):
+        seoul_target = self.save_forecast("강남구", "☀️")
+        busan_target = get_weather_target("부산 해운대")
+
+        # 부산 격자 갱신이 실패해도 서울 격자 일정은 바로 반영
+        weather._refresh_schedules_once([seoul_target])
+        self.seoul.refresh_from_db()
+        self.busan.refresh_from_db()
+        self.assertEqual(self.seoul.weather_icon, "☀️")
+        self.assertIsNone(self.busan.weather_icon)
+
+        # 재시도에서 부산 격자가 저장되면 그 격자 일정만 추가로 반영
+        self.save_forecast("부산 해운대", "🌧️")
+        weather._refresh_schedules_once([seoul_target, busan_target])
+        self.busan.refresh_from_db()
+        self.assertEqual(self.busan.weather_icon, "🌧️")
+
+
+class SaveForecastsTests(TestCase):
+    """새 발표분 저장 시 같은 날짜의 이전 발표분 행 정리"""
+
+    def test_new_issue_replaces_superseded_rows(self):
+        today = datetime.date.today()
+        moved = today + datetime.timedelta(days=3)
+        untouched = today + datetime.timedelta(days=8)
+        previous = weather.get_issue_time() - datetime.timedelta(hours=6)
+        # 이전 발표분: 3일 후는 중기예보, 8일 후도 중기예보
+        weather.save_forecasts(
+            DEFAULT_TARGET,
+            [
+                {"date": f"{day:%Y%m%d}", "icon": "☁️", "description": "흐림"}
+                for day in (moved, untouched)
+            ],
+            previous,
+        )
+        # 새 발표분: 3일 후가 단기예보 범위로 들어옴
+        with CaptureQueriesContext(connection) as queries:
+            weather.save_forecasts(
+                DEFAULT_TARGET,
+                [
+                    {"date": f"{moved:%Y%m%d}", "time": slot, "icon": "☀️"}
+                    for slot in ("0900", "1800")
+                ],
+                weather.get_issue_time(),
+            )
+        # SAVEPOINT + upsert + 이전 발표분 DELETE + RELEASE
+        self.assertEqual(len(queries), 4)
+
+        weather_by_target, _ = weather._load_forecasts([DEFAULT_TARGET])
+        items = [
+            (item["date"], item.get("time"), item["icon"])
+            for item in weather_by_target[DEFAULT_TARGET]
+        ]
+        self.assertEqual(
+            items,
+            [
+                (f"{moved:%Y%m%d}", "0900", "☀️"),
+                (f"{moved:%Y%m%d}", "1800", "☀️"),
+                # 새 발표분에 없는 날짜는 이전 발표분 유지
+                (f"{untouched:%Y%m%d}", None, "☁️"),
+            ],
+        )
+
+
+class WeatherIssueTimeTests(TestCase):
+    """기상청에 이미 발표된 예보만 조회하는지 확인"""
+
+    def setUp(self):
+        cache.clear()
+        self.today = datetime.date.today()
+        self.yesterday = self.today - datetime.timedelta(days=1)
+
+    def at(self, day, hour):
+        return datetime.datetime.combine(day, datetime.time(hour, 30))
+
+    def test_issue_for_each_window(self):
+        today, yesterday = f"{self.today:%Y%m%d}", f"{self.yesterday:%Y%m%d}"
+        cases = [
+            (3, (yesterday, "2300"), f"{yesterday}1800"),
+            (7, (today, "0500"), f"{today}0600"),
+            (13, (today, "1100"), f"{today}0600"),
+            (19, (today, "1700"), f"{today}1800"),
+        ]
+        for hour, short_base, mid_tmfc in cases:
+            now = self.at(self.today, hour)
+            with self.subTest(hour=hour):
+                self.assertEqual(utils.get_short_term_base(now), short_base)
+                self.assertEqual(utils.get_mid_term_tmfc(now), mid_tmfc)
+                self.assertEqual(
+                    f"{weather.get_issue_time(now):%Y%m%d%H%M}", "".join(short_base)
+                )
+
+    def test_before_six_fetches_previous_day_issues(self):
+        urls = []
+
+        def fake_request(url, read_timeout):
+            urls.append(url)
+            if "tmFc=" in url:
+                body = [{"wf4Am": "맑음", "taMin4": "10", "taMax4": "20"}]
+            else:
+                body = [
+                    {
+                        "fcstDate": f"{self.today:%Y%m%d}",
+                        "fcstTime": "0900",
+                        "category": "TMP",
+                        "fcstValue": "12",
+                    }
+                ]
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {"response": {"body": {"items": {"item": body}}}}
+            return response
+
+        with mock.patch.object(utils, "request_kma", side_effect=fake_request):
+            data = utils.get_full_weather(
+                60, 127, "11B00000", use_last_good=False, now=self.at(self.today, 3)
+            )
+
+        yesterday = f"{self.yesterday:%Y%m%d}"
+        self.assertTrue(any(f"base_date={yesterday}&base_time=2300" in url for url in urls))
+        self.assertTrue(any(f"tmFc={yesterday}1800" in url for url in urls))
+        # 중기예보 날짜는 발표일(전날) 기준 4일 후
+        mid_dates = [item["date"] for item in data if "time" not in item]
+        self.assertEqual(mid_dates[0], f"{self.yesterday + datetime.timedelta(days=4):%Y%m%d}")
+        self.assertIn(
+            {"date": f"{self.today:%Y%m%d}", "time": "0900"},
+            [{"date": item["date"], "time": item.get("time")} for item in data],
+        )
+
+
+class WeatherGridTests(SimpleTestCase):
+    """장소 문자열 -> 예보 격자/중기예보 구역 변환"""
+
+    def test_latlon_to_grid(self):
+        # 기상청 격자 좌표 예시 (서울 시청, 부산 시청, 제주 시청)
+        self.assertEqual(latlon_to_grid(37.5665, 126.9780), (60, 127))
+        self.assertEqual(latlon_to_grid(35.1796, 129.0756), (98, 76))
+        self.assertEqual(latlon_to_grid(33.4996, 126.5312), (53, 38))
+
+    def test_seoul_locations(self):
+        gangnam = get_weather_target("강남구 코엑스")
+        self.assertEqual(gangnam.reg_id, "11B00000")
+        self.assertNotEqual(gangnam, DEFAULT_TARGET)
+        # 지명/행정동으로 구를 찾고, "서울"이 있으면 서울 구를 우선
+        self.assertEqual(get_weather_target("홍대 앞"), get_weather_target("마포구"))
+        self.assertEqual(get_weather_target("서울 중구"), get_weather_target("중구"))
+        self.assertEqual(get_weather_target("세종문화회관"), DEFAULT_TARGET)
+        self.assertEqual(get_weather_target(None), DEFAULT_TARGET)
+        self.assertEqual(get_weather_target("어딘가"), DEFAULT_TARGET)
+
+    def test_non_seoul_locations_use_their_own_grid_and_region(self):
+        cases = {
+            "제주 공항": (latlon_to_grid(33.4996, 126.5312), "11G00000"),
+            "삼성전자 수원": (latlon_to_grid(37.2636, 127.0286), "11B00000"),
+            "경기도 광주": (latlon_to_grid(37.4295, 127.2550), "11B00000"),
+            "광주광역시": (latlon_to_grid(35.1595, 126.8526), "11F20000"),
+            "부산 중구": (latlon_to_grid(35.1796, 129.0756), "11H20000"),
+            # 도시 좌표가 없는 지역은 같은 구역의 대표 도시 좌표 사용
+            "경남 통영": (latlon_to_grid(35.1796, 129.0756), "11H20000"),
+        }
+        for location, (grid, reg_id) in cases.items():
+            with self.subTest(location=location):
+                self.assertEqual(get_weather_target(location), WeatherTarget(*grid, reg_id))
@@ -6,7 +6,9 @@ urlpatterns = [
     # 기본 CRUD 엔드포인트
     path('schedules/', views.ScheduleListCreateView.as_view(), name='schedule-list-create'),
     path('schedules/<int:pk>/', views.ScheduleDetailView.as_view(), name='schedule-detail'),
+    path('summary/', views.CalendarSummaryView.as_view(), name='calendar-summary'),
     path('add-recommended-place/', views.AddRecommendedPlaceView.as_view(), name='add-recommended-place'),
+    path('add-recommended-places/', views.AddRecommendedPlacesBulkView.as_view(), name='add-recommended-places'),
     path('recommended-places/', views.RecommendedPlaceListView.as_view(), name='recommended-place-list'),
     path('recommended-places/<int:pk>/', views.RecommendedPlaceDetailView.as_view(), name='recommended-place-detail'),
 ]
\ No newline at end of file
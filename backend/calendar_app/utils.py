@@ -2,18 +2,132 @@ import requests
 import datetime
 import logging
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.cache import cache
+from vacation.circuit import get_breaker, record_fallback
+from vacation.metrics import timed
+from vacation.ratelimit import get_limiter, is_retryable_status
+from vacation.upstreams import kma_api_url
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
 # 기상청 API 정보
-KMA_MID_API = "http://apis.data.go.kr/1360000/MidFcstInfoService/getMidLandFcst"
-KMA_SHORT_API = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getVilageFcst"
+KMA_MID_API = kma_api_url("/1360000/MidFcstInfoService/getMidLandFcst")
+KMA_SHORT_API = kma_api_url("/1360000/VilageFcstInfoService_2.0/getVilageFcst")
 SERVICE_KEY = "r%2BPaRCx%2FnPqwl4wHoqkGLV%2B3V8E0yU8angC8RSjJGIxrHqvEI3qVYQwWJb3lP5xjY38zDp0UKaAsQw9mptNzqQ%3D%3D"
 
-def get_base_time():
+# 기상청 API 연결을 재사용하는 공용 세션 (keep-alive 연결 풀)
+_kma_session = None
+# 단기/중기예보를 동시에 가져오는 스레드 풀
+_kma_executor = None
+_kma_lock = threading.Lock()
+
+
+def get_kma_session():
+    """기상청 API 호출용 공용 requests.Session (스레드 간 공유)"""
+    global _kma_session
+    if _kma_session is None:
+        with _kma_lock:
+            if _kma_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=2,
+                    pool_maxsize=settings.KMA_FETCH_WORKERS,
+                    max_retries=0,  # 재시도는 호출 한도 모듈의 백오프가 담당
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _kma_session = session
+    return _kma_session
+
+
+def get_kma_executor():
+    """단기/중기예보 동시 조회용 스레드 풀"""
+    global _kma_executor
+    if _kma_executor is None:
+        with _kma_lock:
+            if _kma_executor is None:
+                _kma_executor = ThreadPoolExecutor(
+                    max_workers=settings.KMA_FETCH_WORKERS, thread_name_prefix="kma"
+                )
+    return _kma_executor
+
+
+def request_kma(url, read_timeout):
+    """기상청 API 호출 (호출 한도, 서킷 브레이커, 연결/읽기 타임아웃 적용)
+
+    호출 한도 -> 차단기 -> 요청 순으로 감싸므로 토큰 대기, 한도/할당량 초과,
+    재시도 백오프는 차단기의 실패/지연으로 세지 않고 실제 요청 결과만 셉니다.
+
+    Args:
+        url: 요청 URL
+        read_timeout: 응답 읽기 타임아웃 (초, 예보 종류별 설정)
+
+    Raises:
+        CircuitOpenError: 기상청 API 차단기가 열려 있음
+        RateLimitExceeded: 호출 한도 대기 시간 초과 또는 일일 할당량 초과
+    """
+    return get_limiter("kma").call(
+        get_breaker("kma").call,
+        get_kma_session().get,
+        url,
+        timeout=(settings.KMA_CONNECT_TIMEOUT, read_timeout),
+        status_of=lambda r: r.status_code,
+        is_failure=lambda r: is_retryable_status(r.status_code),
+    )
+
+
+def get_last_good_weather(name):
+    """저장된 마지막 정상 날씨 (없으면 빈 목록)"""
+    last_good = cache.get(f"weather:last_good:{name}")
+    if last_good:
+        logger.warning(f"날씨 API 응답 없음, 마지막 정상 데이터 사용: {name}")
+        record_fallback("kma", "last_good_weather")
+        return last_good
+    return []
+
+
+def with_last_good_weather(name, fetch, use_last_good=True):
+    """fetch() 결과를 마지막 정상 날씨로 저장하고, 결과가 비면 저장된 값 반환
+
+    API 오류나 차단기가 열려 빈 목록이 오면 이전에 받은 날씨를 대신 사용합니다.
+
+    Args:
+        name: 저장 키 이름 (예: "short_term:60:127")
+        fetch: 날씨 목록을 반환하는 함수 (실패 시 빈 목록)
+        use_last_good: False면 실패 시 저장된 값 대신 빈 목록 반환
+    """
+    data = fetch()
+    if data:
+        cache.set(
+            f"weather:last_good:{name}", data, timeout=settings.WEATHER_LAST_GOOD_TTL
+        )
+        return data
+    return get_last_good_weather(name) if use_last_good else []
+
+
+def _result_within(future, started, timeout, name, use_last_good=True):
+    """요청 시작(started) 후 timeout초 안에 끝난 결과를 반환하고, 늦으면 마지막 정상 날씨 사용
+
+    늦은 요청은 백그라운드에서 계속 진행되어 끝나면 마지막 정상 날씨를 갱신합니다.
+    use_last_good이 False면 늦은 결과는 빈 목록으로 처리합니다.
+    """
+    try:
+        return future.result(timeout=max(started + timeout - time.monotonic(), 0))
+    except FutureTimeoutError:
+        logger.warning(f"날씨 조회 시간 초과 ({timeout}초): {name}")
+        return get_last_good_weather(name) if use_last_good else []
+
+
+def get_base_time(now=None):
     """아침, 점심, 저녁 기준으로 `base_time` 설정"""
-    now = datetime.datetime.now()
+    now = now or datetime.datetime.now()
     hour = now.hour
 
     if hour < 6:
@@ -25,6 +139,32 @@ def get_base_time():
     else:
         return "1700"
 
+
+def get_short_term_base(now=None):
+    """현재 단기예보 발표분의 (base_date, base_time)
+
+    자정~06시의 base_time "2300"은 전날 발표분이므로 전날 날짜를 사용합니다.
+    """
+    now = now or datetime.datetime.now()
+    base_time = get_base_time(now)
+    base_date = now.date()
+    if base_time == "2300":
+        base_date -= datetime.timedelta(days=1)
+    return base_date.strftime("%Y%m%d"), base_time
+
+
+def get_mid_term_tmfc(now=None):
+    """이미 발표된 최신 중기예보의 발표 시각 `tmFc` (YYYYMMDDHHMM)
+
+    중기예보는 06시, 18시에 발표되므로 06시 전에는 전날 18시 발표분을 사용합니다.
+    """
+    now = now or datetime.datetime.now()
+    if now.hour < 6:
+        return f"{now.date() - datetime.timedelta(days=1):%Y%m%d}1800"
+    if now.hour < 18:
+        return f"{now:%Y%m%d}0600"
+    return f"{now:%Y%m%d}1800"
+
 # (1) 날씨 상태를 아이콘으로 변환하는 함수 (중기예보용)
 def get_weather_icon(sky=None, pty=None, description=None):
     try:
@@ -95,12 +235,26 @@ PTY_ICON_MAP = {
     "4": "🌩️"   # 소나기
 }
 
-def get_short_term_weather(nx=60, ny=127):
-    """단기예보 (오늘~3일 후)에서 필요한 시간대만 반환"""
+def get_short_term_weather(nx=60, ny=127, use_last_good=True, base=None):
+    """단기예보 (오늘~3일 후)에서 필요한 시간대만 반환 (실패 시 마지막 정상 데이터)
+
+    Args:
+        nx, ny: 단기예보 격자
+        use_last_good: False면 실패 시 마지막 정상 데이터 대신 빈 목록 반환
+        base: 조회할 발표분 (base_date, base_time) (없으면 get_short_term_base())
+    """
+    base_date, base_time = base or get_short_term_base()
+    return with_last_good_weather(
+        f"short_term:{nx}:{ny}",
+        lambda: _fetch_short_term_weather(nx, ny, base_date, base_time),
+        use_last_good=use_last_good,
+    )
+
+
+def _fetch_short_term_weather(nx, ny, base_date, base_time):
+    """단기예보 API 조회 및 가공 (base_date/base_time 발표분)"""
     try:
         today = datetime.datetime.today()
-        today_str = today.strftime("%Y%m%d")  # 오늘 날짜
-        base_time = "0500"  # 예보 발표 시간
         
         # 오늘, 내일의 모든 시간대
         full_times = ["0600", "0900", "1200", "1500", "1800", "2100"]
@@ -110,10 +264,11 @@ def get_short_term_weather(nx=60, ny=127):
         # Postman과 동일한 방식으로 URL 직접 구성
         url = f"{KMA_SHORT_API}?serviceKey={SERVICE_KEY}"
         url += f"&numOfRows=1000&pageNo=1&dataType=JSON"
-        url += f"&base_date={today_str}&base_time={base_time}"
+        url += f"&base_date={base_date}&base_time={base_time}"
         url += f"&nx={nx}&ny={ny}"
         
-        response = requests.get(url, timeout=15)
+        with timed("http", "kma_short_term"):
+            response = request_kma(url, settings.KMA_SHORT_TERM_TIMEOUT)
         
         if response.status_code != 200:
             logger.error(f"단기예보 API 오류: 상태 코드 {response.status_code}")
@@ -214,10 +369,6 @@ def get_short_term_weather(nx=60, ny=127):
             if not item["rain_probability"]:
                 item["rain_probability"] = "10"
             
-            # 필요 없는 필드 제거
-            item.pop("sky", None)
-            item.pop("pty", None)
-            
             result.append(item)
         
         # 날짜와 시간순으로 정렬
@@ -273,10 +424,10 @@ def get_sample_hourly_weather():
     
     sample_data = []
     
-    for i, time in enumerate(times):
+    for i, slot in enumerate(times):
         sample_data.append({
             "date": today,
-            "time": time,
+            "time": slot,
             "temperature": temperatures[i],
             "rain_probability": rain_probs[i],
             "icon": icons[i]
@@ -285,19 +436,45 @@ def get_sample_hourly_weather():
     return sample_data
 
 # (3) 중기예보 가져오기
-def get_mid_term_weather():
-    """중기예보 (4~10일 후) 데이터 가져오기"""
+def get_mid_term_weather(reg_id="11B00000", use_last_good=True, tmfc=None):
+    """중기예보 (발표일 4~10일 후) 데이터 가져오기 (실패 시 마지막 정상 데이터)
+
+    같은 구역을 쓰는 여러 격자가 한 번 받은 발표분(06시, 18시 발표)을 공유합니다.
+
+    Args:
+        reg_id: 중기 육상예보 구역 ID (기본값: 서울/인천/경기)
+        use_last_good: False면 실패 시 마지막 정상 데이터 대신 빈 목록 반환
+        tmfc: 조회할 발표 시각 YYYYMMDDHHMM (없으면 get_mid_term_tmfc())
+    """
+    tmfc = tmfc or get_mid_term_tmfc()
+    issue_key = f"weather:mid_term:{tmfc}:{reg_id}"
+    data = cache.get(issue_key)
+    if data:
+        return data
+
+    def fetch():
+        data = _fetch_mid_term_weather(reg_id, tmfc)
+        if data:
+            cache.set(issue_key, data, timeout=settings.WEATHER_CACHE_TTL)
+        return data
+
+    return with_last_good_weather(
+        f"mid_term:{reg_id}", fetch, use_last_good=use_last_good
+    )
+
+
+def _fetch_mid_term_weather(reg_id, tmfc):
+    """중기예보 API 조회 및 가공 (tmfc 발표분, 날짜는 발표일 기준)"""
     try:
-        reg_id = "11B00000"  # 서울/경기 지역
-        today = datetime.datetime.today().strftime("%Y%m%d")
-        tmFc = f"{today}0600"
+        issue_date = datetime.datetime.strptime(tmfc[:8], "%Y%m%d")
         
         # API URL 직접 구성
         url = f"{KMA_MID_API}?serviceKey={SERVICE_KEY}"
         url += f"&numOfRows=10&pageNo=1&dataType=JSON"
-        url += f"&regId={reg_id}&tmFc={tmFc}"
+        url += f"&regId={reg_id}&tmFc={tmfc}"
         
-        response = requests.get(url, timeout=15)
+        with timed("http", "kma_mid_term"):
+            response = request_kma(url, settings.KMA_MID_TERM_TIMEOUT)
         
         if response.status_code != 200:
             return []
@@ -320,7 +497,7 @@ def get_mid_term_weather():
         
         # 4~10일 후 날씨 데이터 생성
         for i in range(4, 11):
-            forecast_date = datetime.datetime.today() + datetime.timedelta(days=i)
+            forecast_date = issue_date + datetime.timedelta(days=i)
             date_str = forecast_date.strftime("%Y%m%d")
             
             # 날씨 상태 키
@@ -400,20 +577,57 @@ def get_mid_term_weather():
         return []
 
 # (5) 날씨 데이터 가져오기 (단기예보 + 중기예보 결합)
-def get_full_weather():
+def get_full_weather(nx=60, ny=127, reg_id="11B00000", use_last_good=True, now=None):
+    """단기예보 격자(nx, ny)와 중기예보 구역(reg_id)의 예보를 합친 10일치 날씨
+
+    Args:
+        nx, ny: 단기예보 격자
+        reg_id: 중기예보 구역 ID
+        use_last_good: False면 마지막 정상 데이터를 쓰지 않고, 단기/중기예보 중
+            하나라도 새로 받지 못하면 빈 목록 반환 (발표분 저장용)
+        now: 이 시각에 발표돼 있는 단기/중기예보를 조회 (없으면 현재 시각)
+    """
     try:
+        now = now or datetime.datetime.now()
+        short_base = get_short_term_base(now)
+        mid_tmfc = get_mid_term_tmfc(now)
+
         # 오늘 날짜
         today = datetime.datetime.today()
         today_str = today.strftime("%Y%m%d")
         logger.info(f"날씨 데이터 가져오기 시작 - 오늘 날짜: {today_str}")
         
-        # 1. 단기예보 데이터 가져오기 (오늘~3일 후)
-        short_term_data = get_short_term_weather()
+        # 1~2. 단기예보(오늘~3일 후)와 중기예보(4~10일 후)를 동시에 요청하고
+        # 예보 종류별 제한 시간 안에 끝난 결과만 사용 (늦으면 마지막 정상 데이터)
+        executor = get_kma_executor()
+        started = time.monotonic()
+        short_future = executor.submit(
+            get_short_term_weather, nx, ny, use_last_good, short_base
+        )
+        mid_future = executor.submit(get_mid_term_weather, reg_id, use_last_good, mid_tmfc)
+
+        short_term_data = _result_within(
+            short_future,
+            started,
+            settings.KMA_SHORT_TERM_TIMEOUT,
+            f"short_term:{nx}:{ny}",
+            use_last_good,
+        )
         logger.info(f"단기예보 데이터 개수: {len(short_term_data)}")
         
-        # 2. 중기예보 데이터 가져오기 (4~10일 후)
-        mid_term_data = get_mid_term_weather()
+        mid_term_data = _result_within(
+            mid_future,
+            started,
+            settings.KMA_MID_TERM_TIMEOUT,
+            f"mid_term:{reg_id}",
+            use_last_good,
+        )
         logger.info(f"중기예보 데이터 개수: {len(mid_term_data) if mid_term_data else 0}")
+
+        if not use_last_good and not (short_term_data and mid_term_data):
+            # 새로 받은 예보만 현재 발표분으로 저장 (실패하면 재시도 대상)
+            logger.warning(f"새 예보를 받지 못함: 단기 {nx}:{ny}, 중기 {reg_id}")
+            return []
         
         # 3. 결과 데이터 준비
         final_weather_data = []
@@ -2,31 +2,47 @@ from django.shortcuts import render, get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from django.db.models import Q
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Case,
+    CharField,
+    Count,
+    F,
+    IntegerField,
+    Max,
+    Q,
+    TextField,
+    Value,
+    When,
+)
+from django.db.models.functions import Concat, Now
 from datetime import datetime
 from .models import Schedule, RecommendedPlace
-from .serializers import ScheduleSerializer
-from .utils import get_full_weather  # 날씨 데이터 가져오는 함수
+from .pagination import (
+    InvalidQueryParam,
+    paginate_by_date,
+    parse_date_param,
+    parse_limit_param,
+)
+from .serializers import SCHEDULE_LIST_FIELDS, ScheduleSerializer
+from .weather import (  # 저장된 날씨 데이터 (네트워크 호출 없음)
+    describe_weather,
+    get_cached_weather,
+)
+import calendar
 import json
 import logging
 import traceback
 
 logger = logging.getLogger(__name__)
 
-# 날씨 아이콘과 텍스트 매핑
-WEATHER_ICON_TO_TEXT = {
-    "☀️": "맑음",
-    "🌤️": "구름조금",
-    "⛅": "구름많음",
-    "☁️": "흐림",
-    "🌧️": "비",
-    "❄️": "눈",
-    "🌨️": "비/눈",
-    "🌦️": "소나기",
-    "🌫️": "안개",
-    "⚡": "번개",
-    "🌪️": "폭풍",
-}
+def format_weather_dates(weather_data):
+    """날씨 목록의 날짜 형식 통일 (YYYYMMDD -> YYYY-MM-DD) 후 날짜별 딕셔너리 반환"""
+    for item in weather_data:
+        if "date" in item and len(item["date"]) == 8 and item["date"].isdigit():
+            item["date"] = f"{item['date'][:4]}-{item['date'][4:6]}-{item['date'][6:8]}"
+    return {item["date"]: item for item in weather_data}
 
 
 class ScheduleListCreateView(APIView):
@@ -34,53 +50,78 @@ class ScheduleListCreateView(APIView):
 
     def get(self, request):
         """
-        사용자의 일정 목록 조회 + 날씨 데이터 포함
+        사용자의 일정 목록 조회 + 날씨 데이터 포함 (날짜순, 같은 날짜는 최근 일정 먼저)
 
         query params:
         - date: 특정 날짜의 일정만 조회 (선택, YYYY-MM-DD 형식)
-        """
-        date = request.query_params.get("date")
+        - start, end: 이 날짜 범위(양 끝 포함)의 일정만 조회 (선택, YYYY-MM-DD 형식)
+        - limit: 페이지 크기 (선택, 기본 SCHEDULE_PAGE_SIZE)
+        - cursor: 이전 응답의 next_cursor (선택, 다음 페이지 조회)
+        - fields: 반환할 일정 필드 (선택, 쉼표로 구분, 예: id,date)
 
-        if date:
-            # 특정 날짜 일정 조회
-            schedules = Schedule.objects.filter(user=request.user, date=date)
-        else:
-            # 모든 일정 조회
-            schedules = Schedule.objects.filter(user=request.user)
-
-        # 날씨 데이터 가져오기
-        weather_data = get_full_weather()  # 1~10일치 날씨 데이터 가져오기
-
-        # 날짜 형식 통일 (YYYYMMDD -> YYYY-MM-DD)
-        for item in weather_data:
-            if "date" in item and len(item["date"]) == 8 and item["date"].isdigit():
-                item["date"] = (
-                    f"{item['date'][:4]}-{item['date'][4:6]}-{item['date'][6:8]}"
+        memo는 목록에서 반환하지 않고 상세 조회(ScheduleDetailView)에서만 반환합니다.
+        """
+        fields = SCHEDULE_LIST_FIELDS
+        if request.query_params.get("fields"):
+            fields = [
+                name.strip()
+                for name in request.query_params["fields"].split(",")
+                if name.strip()
+            ]
+            invalid = [name for name in fields if name not in SCHEDULE_LIST_FIELDS]
+            if invalid:
+                return Response(
+                    {
+                        "error": f"지원하지 않는 필드입니다: {', '.join(invalid)}",
+                        "allowed_fields": SCHEDULE_LIST_FIELDS,
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
                 )
 
-        # JSON 직렬화
-        serializer = ScheduleSerializer(schedules, many=True)
+        try:
+            date = parse_date_param(request.query_params.get("date"), "date")
+            start = parse_date_param(request.query_params.get("start"), "start")
+            end = parse_date_param(request.query_params.get("end"), "end")
+            limit = parse_limit_param(request.query_params.get("limit"))
+            cursor = request.query_params.get("cursor")
+
+            # (user, date) 인덱스 범위 조회 (요청한 필드만 SELECT, memo 제외)
+            schedules = Schedule.objects.filter(user=request.user).only(
+                *{"id", "date", *fields}
+            )
+            if date:
+                # 특정 날짜 일정 조회
+                start = end = date
+            if start:
+                schedules = schedules.filter(date__gte=start)
+            if end:
+                schedules = schedules.filter(date__lte=end)
+
+            schedules, next_cursor = paginate_by_date(schedules, cursor, limit)
+        except InvalidQueryParam as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # JSON 직렬화 (일정별 날씨는 새 예보 발표마다 일괄 갱신되는
+        # weather_main/weather_icon 필드를 그대로 사용)
+        serializer = ScheduleSerializer(schedules, many=True, fields=fields)
         schedule_data = serializer.data
 
-        # 날짜별 날씨 데이터 매핑
-        weather_dict = {item["date"]: item for item in weather_data}
-
-        # 일정 데이터에 날씨 추가
-        for schedule in schedule_data:
-            schedule_date = schedule["date"]  # 일정의 날짜
-            # 날짜 형식 통일
-            if schedule_date and len(schedule_date) > 10:
-                schedule_date = schedule_date[:10]
-
-            if schedule_date in weather_dict:
-                schedule["weather"] = weather_dict[
-                    schedule_date
-                ]  # 해당 날짜의 날씨 추가
+        # 기본 위치 1~10일치 날씨 데이터 (달력 날짜별 아이콘, 첫 페이지에만 포함)
+        weather_data = []
+        if not cursor:
+            weather_data = [
+                item
+                for item in get_cached_weather()
+                if (not start or item["date"] >= f"{start:%Y%m%d}")
+                and (not end or item["date"] <= f"{end:%Y%m%d}")
+            ]
+            format_weather_dates(weather_data)
 
         return Response(
             {
                 "schedules": schedule_data,
-                "weather": weather_data,  # 전체 날씨 데이터도 포함
+                "weather": weather_data,  # 조회 범위의 날씨 데이터도 포함
+                "next_cursor": next_cursor,  # 다음 페이지가 없으면 None
             }
         )
 
@@ -89,22 +130,10 @@ class ScheduleListCreateView(APIView):
         serializer = ScheduleSerializer(data=request.data)
         if serializer.is_valid():
             try:
-                # 날씨 데이터 가져오기
-                weather_data = get_full_weather()
-
-                # 날짜 형식 통일
-                for item in weather_data:
-                    if (
-                        "date" in item
-                        and len(item["date"]) == 8
-                        and item["date"].isdigit()
-                    ):
-                        item["date"] = (
-                            f"{item['date'][:4]}-{item['date'][4:6]}-{item['date'][6:8]}"
-                        )
-
-                # 날짜별 날씨 데이터 매핑
-                weather_dict = {item["date"]: item for item in weather_data}
+                # 일정 장소의 날씨 데이터를 날짜별로 매핑
+                weather_dict = format_weather_dates(
+                    get_cached_weather(request.data.get("location"))
+                )
 
                 # 해당 날짜의 날씨 정보 찾기
                 schedule_date = request.data.get("date", "")
@@ -114,17 +143,8 @@ class ScheduleListCreateView(APIView):
                 # 날씨 정보 찾기
                 weather_info = weather_dict.get(schedule_date, {})
 
-                # 날씨 아이콘과 상태 추출
-                weather_icon = weather_info.get("icon", "")
-
-                # 날씨 상태 텍스트 결정
-                weather_main = weather_info.get("weather_main", "")
-                if not weather_main:
-                    weather_main = weather_info.get("description", "")
-                if not weather_main and weather_icon in WEATHER_ICON_TO_TEXT:
-                    weather_main = WEATHER_ICON_TO_TEXT[weather_icon]
-                if not weather_main:
-                    weather_main = weather_info.get("sky", "")
+                # 날씨 상태 텍스트와 아이콘 결정
+                weather_main, weather_icon = describe_weather(weather_info)
 
                 # 날씨 정보와 함께 일정 저장
                 schedule = serializer.save(
@@ -158,17 +178,8 @@ class ScheduleDetailView(APIView):
         serializer = ScheduleSerializer(schedule)
         schedule_data = serializer.data
 
-        # 1~10일치 날씨 데이터 가져오기
-        weather_data = get_full_weather()
-
-        # 날짜 형식 통일
-        for item in weather_data:
-            if "date" in item and len(item["date"]) == 8 and item["date"].isdigit():
-                item["date"] = (
-                    f"{item['date'][:4]}-{item['date'][4:6]}-{item['date'][6:8]}"
-                )
-
-        weather_dict = {item["date"]: item for item in weather_data}
+        # 일정 장소의 1~10일치 날씨 데이터를 날짜별로 매핑
+        weather_dict = format_weather_dates(get_cached_weather(schedule.location))
 
         # 일정에 해당하는 날짜의 날씨 추가
         schedule_date = schedule_data["date"]
@@ -186,22 +197,10 @@ class ScheduleDetailView(APIView):
 
         if serializer.is_valid():
             try:
-                # 날씨 데이터 가져오기
-                weather_data = get_full_weather()
-
-                # 날짜 형식 통일
-                for item in weather_data:
-                    if (
-                        "date" in item
-                        and len(item["date"]) == 8
-                        and item["date"].isdigit()
-                    ):
-                        item["date"] = (
-                            f"{item['date'][:4]}-{item['date'][4:6]}-{item['date'][6:8]}"
-                        )
-
-                # 날짜별 날씨 데이터 매핑
-                weather_dict = {item["date"]: item for item in weather_data}
+                # 일정 장소의 날씨 데이터를 날짜별로 매핑
+                weather_dict = format_weather_dates(
+                    get_cached_weather(request.data.get("location"))
+                )
 
                 # 해당 날짜의 날씨 정보 찾기
                 schedule_date = request.data.get("date", "")
@@ -211,17 +210,8 @@ class ScheduleDetailView(APIView):
                 # 날씨 정보 찾기
                 weather_info = weather_dict.get(schedule_date, {})
 
-                # 날씨 아이콘과 상태 추출
-                weather_icon = weather_info.get("icon", "")
-
-                # 날씨 상태 텍스트 결정
-                weather_main = weather_info.get("weather_main", "")
-                if not weather_main:
-                    weather_main = weather_info.get("description", "")
-                if not weather_main and weather_icon in WEATHER_ICON_TO_TEXT:
-                    weather_main = WEATHER_ICON_TO_TEXT[weather_icon]
-                if not weather_main:
-                    weather_main = weather_info.get("sky", "")
+                # 날씨 상태 텍스트와 아이콘 결정
+                weather_main, weather_icon = describe_weather(weather_info)
 
                 # 날씨 정보와 함께 일정 업데이트
                 updated_schedule = serializer.save(
@@ -243,6 +233,200 @@ class ScheduleDetailView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class CalendarSummaryView(APIView):
+    """달력 월 보기용 날짜별 요약 API (일정 수, 날씨 아이콘, 추천 장소 수)"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        """
+        한 달의 날짜별 요약 조회
+
+        query params:
+        - year, month: 조회할 연월 (선택, 기본값: 이번 달)
+
+        일정과 추천 장소를 날짜별로 묶은 집계(Count)를 UNION ALL 쿼리 한 번으로 읽고,
+        저장된 예보와 합칩니다. 날씨 아이콘은 일정에 저장된 날씨(일정 장소 기준)를
+        우선하고, 없으면 기본 위치 예보를 사용합니다.
+        """
+        today = datetime.now().date()
+        try:
+            year = int(request.query_params.get("year", today.year))
+            month = int(request.query_params.get("month", today.month))
+            first_day = datetime(year, month, 1).date()
+        except ValueError:
+            return Response(
+                {"error": "year, month 값이 올바르지 않습니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        # 9999년 12월에도 날짜 계산이 넘치지 않도록 달력으로 마지막 날 계산
+        last_day = first_day.replace(day=calendar.monthrange(year, month)[1])
+
+        # 날짜별 일정 집계 + 추천 장소 집계 (같은 컬럼 구성으로 UNION ALL)
+        schedule_counts = (
+            Schedule.objects.filter(user=request.user, date__range=(first_day, last_day))
+            .order_by()
+            .values("date")
+            .annotate(
+                schedule_count=Count("id"),
+                place_count=Value(0, output_field=IntegerField()),
+                weather_icon=Max("weather_icon"),
+                weather_main=Max("weather_main"),
+            )
+        )
+        place_counts = (
+            RecommendedPlace.objects.filter(
+                user=request.user, date__range=(first_day, last_day)
+            )
+            .order_by()
+            .values("date")
+            .annotate(
+                schedule_count=Value(0, output_field=IntegerField()),
+                place_count=Count("id"),
+                weather_icon=Value(None, output_field=CharField()),
+                weather_main=Value(None, output_field=CharField()),
+            )
+        )
+
+        days = {}
+
+        def get_day(date_str):
+            return days.setdefault(
+                date_str,
+                {
+                    "date": date_str,
+                    "schedule_count": 0,
+                    "recommended_count": 0,
+                    "weather_icon": "",
+                    "weather_main": "",
+                },
+            )
+
+        for row in schedule_counts.union(place_counts, all=True):
+            day = get_day(row["date"].isoformat())
+            day["schedule_count"] += row["schedule_count"]
+            day["recommended_count"] += row["place_count"]
+            if row["weather_icon"]:
+                day["weather_icon"] = row["weather_icon"]
+                day["weather_main"] = row["weather_main"] or ""
+
+        # 저장된 기본 위치 예보로 아이콘이 없는 날짜 채우기
+        weather_dict = format_weather_dates(get_cached_weather())
+        for date_str, weather_info in weather_dict.items():
+            if not first_day.isoformat() <= date_str <= last_day.isoformat():
+                continue
+            day = get_day(date_str)
+            if not day["weather_icon"]:
+                day["weather_main"], day["weather_icon"] = describe_weather(weather_info)
+
+        return Response(
+            {
+                "year": year,
+                "month": month,
+                "days": sorted(days.values(), key=lambda day: day["date"]),
+            }
+        )
+
+
+# 추천 장소 요청 필드 (요청 키 -> 기본값)
+RECOMMENDED_PLACE_FIELDS = {
+    "place_name": "",
+    "place_location": "",
+    "recommendation_reason": "",
+    "additional_info": "",
+    "place_url": "",
+    "place_type": "general",
+    "event_date": "",
+}
+
+
+def build_recommendation_memo(place):
+    """추천 장소 하나를 일정 메모에 붙일 문자열로 변환"""
+    if place["place_type"] == "event":
+        # 이벤트 형식
+        memo_content = f"[추천된 이벤트]\n이름: {place['place_name']}\n"
+        if place["event_date"]:
+            memo_content += f"일시: {place['event_date']}\n"
+        memo_content += f"장소: {place['place_location']}\n\n"
+    else:
+        # 일반 장소 형식
+        memo_content = (
+            f"[추천된 장소]\n이름: {place['place_name']}\n"
+            f"위치: {place['place_location']}\n\n"
+        )
+
+    if place["recommendation_reason"]:
+        memo_content += f"추천 이유: {place['recommendation_reason']}\n\n"
+    if place["place_url"] and place["place_url"] != "정보 없음":
+        memo_content += f"참고 링크: {place['place_url']}\n\n"
+    if place["additional_info"]:
+        memo_content += f"참고 정보: {place['additional_info']}\n\n"
+    return memo_content
+
+
+def add_recommended_places(user, date, places):
+    """추천 장소들을 저장하고 해당 날짜 일정 메모에 추가 (트랜잭션 하나)
+
+    RecommendedPlace는 bulk_create 한 번으로 저장하고, 메모는 읽지 않고
+    UPDATE ... SET memo = memo || 추가 내용 한 문장으로 붙이므로 여러 탭에서
+    동시에 추가해도 내용이 사라지지 않습니다. 해당 날짜에 일정이 없으면 새로 만듭니다.
+
+    Args:
+        user: 사용자
+        date: 일정 날짜 (date)
+        places: RECOMMENDED_PLACE_FIELDS 키를 모두 가진 딕셔너리 목록
+
+    Returns:
+        (일정 ID, 일정 생성 여부, 추천 장소 목록) 튜플
+    """
+    memo_content = "\n\n".join(build_recommendation_memo(place) for place in places)
+
+    with transaction.atomic():
+        recommended_places = RecommendedPlace.objects.bulk_create(
+            [RecommendedPlace(user=user, date=date, **place) for place in places]
+        )
+
+        # 해당 날짜의 가장 최근 일정 메모에 추가 (일정 목록의 같은 날짜 첫 일정과 같은 기준)
+        schedule_id = (
+            Schedule.objects.filter(user=user, date=date)
+            .order_by("-id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        if schedule_id is not None:
+            # update()는 auto_now를 적용하지 않으므로 updated_at도 같은 문장에서 갱신
+            Schedule.objects.filter(pk=schedule_id).update(
+                memo=Case(
+                    When(Q(memo__isnull=True) | Q(memo=""), then=Value(memo_content)),
+                    default=Concat(F("memo"), Value("\n\n" + memo_content)),
+                    output_field=TextField(),
+                ),
+                updated_at=Now(),
+            )
+            return schedule_id, False, recommended_places
+
+        # 새 일정 생성
+        schedule = Schedule.objects.create(
+            user=user,
+            date=date,
+            location="",  # 위치 필드는 비워둠
+            companion="",  # 기본값
+            memo=memo_content,
+        )
+        return schedule.id, True, recommended_places
+
+
+def parse_recommended_place(data):
+    """요청 데이터에서 추천 장소 필드 추출 (장소 이름이 없으면 None)"""
+    place = {
+        field: data.get(field) or default
+        for field, default in RECOMMENDED_PLACE_FIELDS.items()
+    }
+    if not place["place_name"]:
+        return None
+    return place
+
+
 class AddRecommendedPlaceView(APIView):
     """추천 장소를 일정에 추가하는 API"""
 
@@ -265,15 +449,9 @@ class AddRecommendedPlaceView(APIView):
         try:
             # 요청 데이터 파싱
             date = request.data.get("date")
-            place_name = request.data.get("place_name")
-            place_location = request.data.get("place_location", "")
-            recommendation_reason = request.data.get("recommendation_reason", "")
-            additional_info = request.data.get("additional_info", "")
-            place_url = request.data.get("place_url", "")
-            place_type = request.data.get("place_type", "general")
-            event_date = request.data.get("event_date", "")
-
-            if not date or not place_name:
+            place = parse_recommended_place(request.data)
+
+            if not date or place is None:
                 return Response(
                     {
                         "success": False,
@@ -282,87 +460,90 @@ class AddRecommendedPlaceView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # 1. RecommendedPlace 모델에 저장
-            recommended_place = RecommendedPlace.objects.create(
-                user=request.user,
-                date=date,
-                place_name=place_name,
-                place_location=place_location,
-                recommendation_reason=recommendation_reason,
-                place_url=place_url,
-                place_type=place_type,
-                event_date=event_date,
-                additional_info=additional_info,
+            # 추천 장소 저장 + 해당 날짜의 일정에 메모로 추가
+            schedule_id, created, recommended_places = add_recommended_places(
+                request.user, date, [place]
             )
 
-            # 2. 해당 날짜의 일정에 메모로 추가
-            schedule = Schedule.objects.filter(user=request.user, date=date).first()
-
-            # 일정 정보 구성
-            memo_content = ""
-            if place_type == "event":
-                # 이벤트 형식
-                memo_content = f"[추천된 이벤트]\n이름: {place_name}\n"
-                if event_date:
-                    memo_content += f"일시: {event_date}\n"
-                memo_content += f"장소: {place_location}\n\n"
-            else:
-                # 일반 장소 형식
-                memo_content = (
-                    f"[추천된 장소]\n이름: {place_name}\n위치: {place_location}\n\n"
-                )
+            return Response(
+                {
+                    "success": True,
+                    "message": (
+                        "새 일정에 추천 장소가 추가되었습니다."
+                        if created
+                        else "기존 일정에 추천 장소가 추가되었습니다."
+                    ),
+                    "schedule_id": schedule_id,
+                    "recommended_place_id": recommended_places[0].id,
+                    "date": date,
+                    "place_name": place["place_name"],
+                    "place_location": place["place_location"],
+                    "place_type": place["place_type"],
+                },
+                status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+            )
 
-            if recommendation_reason:
-                memo_content += f"추천 이유: {recommendation_reason}\n\n"
-            if place_url and place_url != "정보 없음":
-                memo_content += f"참고 링크: {place_url}\n\n"
-            if additional_info:
-                memo_content += f"참고 정보: {additional_info}\n\n"
-
-            if schedule:
-                # 기존 일정이 있으면 메모에 추가
-                if schedule.memo:
-                    schedule.memo += "\n\n" + memo_content
-                else:
-                    schedule.memo = memo_content
-                schedule.save()
-                return Response(
-                    {
-                        "success": True,
-                        "message": "기존 일정에 추천 장소가 추가되었습니다.",
-                        "schedule_id": schedule.id,
-                        "recommended_place_id": recommended_place.id,
-                        "date": date,
-                        "place_name": place_name,
-                        "place_location": place_location,
-                        "place_type": place_type,
-                    },
-                    status=status.HTTP_200_OK,
-                )
-            else:
-                # 새 일정 생성
-                new_schedule = Schedule(
-                    user=request.user,
-                    date=date,
-                    location="",  # 위치 필드는 비워둠
-                    companion="",  # 기본값
-                    memo=memo_content,
-                )
-                new_schedule.save()
-                return Response(
-                    {
-                        "success": True,
-                        "message": "새 일정에 추천 장소가 추가되었습니다.",
-                        "schedule_id": new_schedule.id,
-                        "recommended_place_id": recommended_place.id,
-                        "date": date,
-                        "place_name": place_name,
-                        "place_location": place_location,
-                        "place_type": place_type,
-                    },
-                    status=status.HTTP_201_CREATED,
-                )
+        except Exception as e:
+            return Response(
+                {
+                    "success": False,
+                    "message": f"일정 추가 중 오류가 발생했습니다: {str(e)}",
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class AddRecommendedPlacesBulkView(APIView):
+    """한 날짜에 여러 추천 장소를 한 번에 추가하는 API"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        """
+        채팅 추천 장소 여러 개를 일정에 추가하고 RecommendedPlace 모델에도 저장
 
+        요청 데이터:
+        - date: 일정 날짜 (YYYY-MM-DD)
+        - places: 추천 장소 목록 (각 항목은 AddRecommendedPlaceView 요청 데이터와
+          같은 필드, place_name 필수, 최대 RECOMMENDED_PLACES_BULK_MAX개)
+        """
+        date = request.data.get("date")
+        places = request.data.get("places")
+        try:
+            date = datetime.strptime(str(date), "%Y-%m-%d").date()
+        except ValueError:
+            return Response(
+                {"success": False, "message": "date는 YYYY-MM-DD 형식이어야 합니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not isinstance(places, list) or not places:
+            return Response(
+                {"success": False, "message": "places는 비어 있지 않은 목록이어야 합니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(places) > settings.RECOMMENDED_PLACES_BULK_MAX:
+            return Response(
+                {
+                    "success": False,
+                    "message": f"한 번에 최대 {settings.RECOMMENDED_PLACES_BULK_MAX}개까지 추가할 수 있습니다.",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        parsed = [
+            parse_recommended_place(place) if isinstance(place, dict) else None
+            for place in places
+        ]
+        if any(place is None for place in parsed):
+            return Response(
+                {"success": False, "message": "모든 추천 장소에 장소 이름이 필요합니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            schedule_id, created, recommended_places = add_recommended_places(
+                request.user, date, parsed
+            )
         except Exception as e:
             return Response(
                 {
@@ -372,6 +553,20 @@ class AddRecommendedPlaceView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+        return Response(
+            {
+                "success": True,
+                "message": f"{len(recommended_places)}개의 추천 장소가 "
+                + ("새 일정에" if created else "기존 일정에")
+                + " 추가되었습니다.",
+                "schedule_id": schedule_id,
+                "recommended_place_ids": [place.id for place in recommended_places],
+                "date": date.isoformat(),
+            },
+            # 단건 추가 API와 같이 새 일정을 만들었을 때만 201
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
 
 class RecommendedPlaceListView(APIView):
     """추천된 장소/이벤트 목록 조회 API"""
@@ -0,0 +1,504 @@
+"""발표 시각 기준으로 저장하는 날씨 서비스 모듈
+
+기상청 예보는 정해진 발표 시각에만 바뀌므로, 단기+중기 예보를 합친 결과를 예보
+격자(calendar_app.grid) 단위로 WeatherForecast 테이블에 일괄 upsert합니다.
+백그라운드 스레드가 발표 시각(get_issue_time)이 바뀐 직후 지금까지 요청된 격자들을
+새로 받아 저장하고, 뷰는 인덱스를 타는 쿼리 한 번으로 테이블만 읽으므로 일정
+조회/생성 요청이 기상청 API나 원본 JSON 파싱을 기다리지 않습니다. 모든 워커가 같은
+테이블을 공유하며, 현재 발표분이 아직 없으면 직전 발표분을 반환하면서 백그라운드
+갱신을 시작합니다.
+
+새 발표분을 저장한 뒤에는 다가오는 일정들의 weather_main/weather_icon을 격자별로
+묶어 bulk_update로 다시 계산하므로, 일정 목록은 저장된 필드를 그대로 보여줍니다.
+"""
+
+import datetime
+import logging
+import threading
+import time
+from functools import reduce
+from operator import or_
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from vacation.metrics import timed
+from vacation.swr_cache import cache_requests
+
+from .grid import DEFAULT_TARGET, WeatherTarget, get_weather_target
+from .models import Schedule, WeatherForecast
+from .utils import get_full_weather, get_short_term_base
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 발표 시각 구간이 바뀌는 시각 (utils.get_base_time 기준)
+ISSUE_BOUNDARY_HOURS = [0, 6, 12, 18]
+
+# 오늘부터 조회할 예보 일수 (단기 + 중기예보)
+FORECAST_DAYS = 10
+
+# upsert 시 덮어쓸 필드 (격자, 날짜, 시간대가 같은 행)
+FORECAST_UNIQUE_FIELDS = ["nx", "ny", "reg_id", "date", "time"]
+FORECAST_UPDATE_FIELDS = [
+    "temperature",
+    "rain_probability",
+    "sky",
+    "pty",
+    "icon",
+    "description",
+    "issued_at",
+    "updated_at",
+]
+
+# 날씨 아이콘과 텍스트 매핑
+WEATHER_ICON_TO_TEXT = {
+    "☀️": "맑음",
+    "🌤️": "구름조금",
+    "⛅": "구름많음",
+    "☁️": "흐림",
+    "🌧️": "비",
+    "❄️": "눈",
+    "🌨️": "비/눈",
+    "🌦️": "소나기",
+    "🌫️": "안개",
+    "⚡": "번개",
+    "🌪️": "폭풍",
+}
+
+_refresher_started = False
+_refresher_lock = threading.Lock()
+
+# 이 프로세스에서 요청된 예보 격자 (백그라운드 스레드가 발표 시각마다 갱신)
+_known_targets: Set[WeatherTarget] = {DEFAULT_TARGET}
+# 백그라운드 갱신 중인 격자 (요청이 몰려도 격자당 스레드 하나)
+_refreshing_targets: Set[WeatherTarget] = set()
+_targets_lock = threading.Lock()
+
+
+def _target_suffix(target: WeatherTarget) -> str:
+    return f"{target.nx}:{target.ny}:{target.reg_id}"
+
+
+def _target_filter(target: WeatherTarget) -> Q:
+    return Q(nx=target.nx, ny=target.ny, reg_id=target.reg_id)
+
+
+def _refresh_failed_key(target: WeatherTarget) -> str:
+    return f"weather:full:refresh_failed:{_target_suffix(target)}"
+
+
+def get_issue_time(now: Optional[datetime.datetime] = None) -> datetime.datetime:
+    """현재 단기예보 발표분의 발표 시각 (aware datetime)
+
+    get_full_weather(now=now)가 조회하는 단기예보 발표분과 같습니다 (자정~06시는
+    전날 23시 발표분).
+    """
+    base_date, base_time = get_short_term_base(now)
+    issued = datetime.datetime.strptime(base_date + base_time, "%Y%m%d%H%M")
+    return timezone.make_aware(issued)
+
+
+def seconds_until_next_issue(now: Optional[datetime.datetime] = None) -> float:
+    """다음 발표 시각 구간이 시작될 때까지 남은 시간 (초)"""
+    now = now or datetime.datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    for hour in ISSUE_BOUNDARY_HOURS + [24]:
+        boundary = today + datetime.timedelta(hours=hour)
+        if boundary > now:
+            return (boundary - now).total_seconds()
+    return 0.0
+
+
+def save_forecasts(
+    target: WeatherTarget, weather_data: List[dict], issued_at: datetime.datetime
+) -> int:
+    """get_full_weather 결과를 WeatherForecast에 일괄 upsert
+
+    격자·날짜·시간대가 같은 행은 INSERT ... ON CONFLICT DO UPDATE 한 번으로
+    최신 발표분 값으로 덮어쓰고, 새 발표분이 있는 날짜의 이전 발표분 행(단기예보로
+    바뀐 날짜의 중기예보 행, 빠진 시간대)은 지워 한 날짜에 한 발표분만 남깁니다.
+
+    Args:
+        target: 예보 격자
+        weather_data: 날씨 목록 (date는 YYYYMMDD, 중기예보 항목은 time 없음)
+        issued_at: 예보 발표 시각
+
+    Returns:
+        저장한 행 수
+    """
+    rows = {}
+    for item in weather_data:
+        try:
+            date = datetime.datetime.strptime(item["date"], "%Y%m%d").date()
+        except (KeyError, ValueError):
+            continue
+        time_slot = item.get("time") or ""
+        # 같은 슬롯이 두 번 오면 마지막 값 사용 (한 문장에서 같은 키를 두 번 갱신할 수 없음)
+        rows[(date, time_slot)] = WeatherForecast(
+            nx=target.nx,
+            ny=target.ny,
+            reg_id=target.reg_id,
+            date=date,
+            time=time_slot,
+            temperature=str(item.get("temperature") or ""),
+            rain_probability=str(item.get("rain_probability") or ""),
+            sky=item.get("sky"),
+            pty=item.get("pty"),
+            icon=item.get("icon") or "",
+            description=(item.get("description") or "")[:100],
+            issued_at=issued_at,
+        )
+    if not rows:
+        return 0
+    with transaction.atomic():
+        WeatherForecast.objects.bulk_create(
+            rows.values(),
+            update_conflicts=True,
+            unique_fields=FORECAST_UNIQUE_FIELDS,
+            update_fields=FORECAST_UPDATE_FIELDS,
+        )
+        WeatherForecast.objects.filter(
+            _target_filter(target),
+            date__in={date for date, _ in rows},
+            issued_at__lt=issued_at,
+        ).delete()
+    return len(rows)
+
+
+def refresh_weather(target: WeatherTarget = DEFAULT_TARGET, force: bool = False) -> bool:
+    """격자 하나의 현재 발표분 날씨를 기상청에서 받아 WeatherForecast에 저장
+
+    여러 워커가 동시에 갱신하지 않도록 격자별 캐시 락을 잡고, 이미 현재 발표분이
+    저장돼 있으면 건너뜁니다.
+
+    Args:
+        target: 예보 격자
+        force: 현재 발표분이 이미 있어도 다시 받기
+
+    Returns:
+        현재 발표분이 저장돼 있으면 True (기상청에서 단기/중기예보를 모두 새로
+        받지 못하면 마지막 정상 데이터로 대신하지 않고 False)
+    """
+    # 발표분 판단과 기상청 조회에 같은 시각을 사용 (구간 경계에서 엇갈리지 않도록)
+    now = datetime.datetime.now()
+    issued_at = get_issue_time(now)
+    current = WeatherForecast.objects.filter(
+        _target_filter(target), issued_at__gte=issued_at
+    )
+    if not force and current.exists():
+        return True
+    lock_key = f"weather:full:refresh_lock:{_target_suffix(target)}"
+    if not cache.add(lock_key, True, timeout=settings.WEATHER_REFRESH_LOCK_TIMEOUT):
+        # 다른 워커/스레드가 갱신 중
+        return False
+    try:
+        with timed("weather", "refresh"):
+            data = get_full_weather(
+                target.nx, target.ny, target.reg_id, use_last_good=False, now=now
+            )
+        if not data:
+            logger.warning(f"날씨 갱신 실패: 기상청 응답 없음 ({_target_suffix(target)})")
+            # 재시도는 갱신 스레드가 WEATHER_RETRY_INTERVAL마다 하고, 그동안 요청이
+            # 백그라운드 갱신을 다시 시작하지 않음 (기상청 일일 한도 보호)
+            cache.set(
+                _refresh_failed_key(target), True, timeout=settings.WEATHER_RETRY_INTERVAL
+            )
+            return False
+        with timed("weather", "save"):
+            saved = save_forecasts(target, data, issued_at)
+        logger.info(
+            f"날씨 예보 저장 완료: {_target_suffix(target)} {issued_at:%Y%m%d%H%M} ({saved}개 행)"
+        )
+        return True
+    finally:
+        cache.delete(lock_key)
+
+
+def _safe_refresh(target: WeatherTarget) -> bool:
+    try:
+        return refresh_weather(target)
+    except Exception as e:
+        logger.error(f"날씨 갱신 중 오류: {str(e)}")
+        return False
+
+
+def refresh_weather_in_background(target: WeatherTarget = DEFAULT_TARGET):
+    """요청을 기다리게 하지 않고 별도 스레드에서 격자 날씨 갱신
+
+    최근 갱신에 실패한 격자는 갱신 스레드의 재시도에 맡기고 건너뜁니다.
+    """
+    if cache.get(_refresh_failed_key(target)):
+        return
+    with _targets_lock:
+        if target in _refreshing_targets:
+            return
+        _refreshing_targets.add(target)
+
+    def run():
+        try:
+            _safe_refresh(target)
+        finally:
+            with _targets_lock:
+                _refreshing_targets.discard(target)
+            # 요청 스레드가 아니므로 DB 연결을 직접 정리
+            close_old_connections()
+
+    threading.Thread(target=run, name="weather-refresh", daemon=True).start()
+
+
+def _remember_target(target: WeatherTarget):
+    with _targets_lock:
+        if target not in _known_targets and len(_known_targets) < settings.WEATHER_MAX_TARGETS:
+            _known_targets.add(target)
+
+
+def _to_weather_item(row: dict) -> dict:
+    """WeatherForecast 행을 기존 날씨 목록 항목 형식으로 변환"""
+    item = {
+        "date": f"{row['date']:%Y%m%d}",
+        "temperature": row["temperature"],
+        "rain_probability": row["rain_probability"],
+        "icon": row["icon"],
+    }
+    if row["time"]:
+        item["time"] = row["time"]  # 단기예보 시간대
+    if row["description"]:
+        item["description"] = row["description"]  # 중기예보 날씨 설명
+    return item
+
+
+def _forecast_date_range() -> Tuple[datetime.date, datetime.date]:
+    """예보가 있는 날짜 범위 (오늘 ~ FORECAST_DAYS일 후)"""
+    today = datetime.date.today()
+    return today, today + datetime.timedelta(days=FORECAST_DAYS)
+
+
+def _load_forecasts(targets: Iterable[WeatherTarget]):
+    """격자별 저장된 예보 목록과 최신 발표 시각 (쿼리 한 번)
+
+    Returns:
+        (격자 -> 날씨 목록, 격자 -> 최신 발표 시각) 튜플 (예보가 없는 격자는 빈 목록)
+    """
+    targets = set(targets)
+    weather_by_target = {target: [] for target in targets}
+    issued_by_target = {}
+    if not targets:
+        return weather_by_target, issued_by_target
+
+    rows = (
+        WeatherForecast.objects.filter(
+            reduce(or_, (_target_filter(target) for target in targets)),
+            date__range=_forecast_date_range(),
+        )
+        .order_by("date", "time")
+        .values(
+            "nx", "ny", "reg_id", "date", "time", "temperature",
+            "rain_probability", "icon", "description", "issued_at",
+        )
+    )
+    for row in rows:
+        target = WeatherTarget(row["nx"], row["ny"], row["reg_id"])
+        weather_by_target[target].append(_to_weather_item(row))
+        issued_by_target[target] = max(
+            row["issued_at"], issued_by_target.get(target, row["issued_at"])
+        )
+    return weather_by_target, issued_by_target
+
+
+def get_cached_weather_for_locations(
+    locations: Iterable[Optional[str]],
+) -> Dict[Optional[str], List[dict]]:
+    """장소별 저장된 날씨 반환 (네트워크 호출 없음)
+
+    장소를 예보 격자로 묶어 모든 격자의 오늘부터 10일치 예보를 (격자, 날짜)
+    인덱스를 타는 쿼리 한 번으로 읽습니다. 현재 발표분이 없는 격자는 직전
+    발표분(없으면 빈 목록)을 반환하고 백그라운드에서 갱신합니다.
+
+    Returns:
+        장소 -> 날씨 목록 딕셔너리 (같은 격자의 장소는 같은 목록 객체를 공유)
+    """
+    targets = {location: get_weather_target(location) for location in set(locations)}
+    weather_by_target, issued_by_target = _load_forecasts(targets.values())
+
+    issued_at = get_issue_time()
+    for target in weather_by_target:
+        _remember_target(target)
+        latest = issued_by_target.get(target)
+        if latest is not None and latest >= issued_at:
+            cache_requests.inc(cache="weather", result="hit")
+            continue
+        refresh_weather_in_background(target)
+        cache_requests.inc(
+            cache="weather", result="stale" if latest is not None else "miss"
+        )
+
+    return {location: weather_by_target[target] for location, target in targets.items()}
+
+
+def get_cached_weather(location: Optional[str] = None) -> List[dict]:
+    """장소(없으면 서울 시청)의 저장된 날씨 반환 (네트워크 호출 없음)"""
+    return get_cached_weather_for_locations([location])[location]
+
+
+def describe_weather(weather_info: dict) -> Tuple[str, str]:
+    """날씨 항목에서 일정에 저장할 (weather_main, weather_icon) 결정
+
+    weather_main은 설명(중기예보) -> 아이콘 텍스트 순으로 정합니다.
+    """
+    weather_icon = weather_info.get("icon", "")
+    weather_main = weather_info.get("weather_main", "")
+    if not weather_main:
+        weather_main = weather_info.get("description", "")
+    if not weather_main and weather_icon in WEATHER_ICON_TO_TEXT:
+        weather_main = WEATHER_ICON_TO_TEXT[weather_icon]
+    if not weather_main:
+        weather_main = weather_info.get("sky", "")
+    return weather_main, weather_icon
+
+
+def _upcoming_schedules():
+    """예보가 있는 날짜 범위의 일정"""
+    return Schedule.objects.filter(date__range=_forecast_date_range())
+
+
+def _update_schedule_batch(
+    schedules: List[Schedule], only_targets: Optional[Set[WeatherTarget]] = None
+) -> int:
+    """일정 묶음의 날씨 필드를 다시 계산해 바뀐 일정만 bulk_update (쿼리 최대 2번)
+
+    only_targets가 있으면 그 격자에 속한 일정만 갱신합니다.
+    """
+    if only_targets is not None:
+        schedules = [
+            schedule
+            for schedule in schedules
+            if get_weather_target(schedule.location) in only_targets
+        ]
+        if not schedules:
+            return 0
+    targets = {schedule.location: get_weather_target(schedule.location) for schedule in schedules}
+    weather_by_target, _ = _load_forecasts(targets.values())
+    # 격자 -> 날짜 -> 날씨 (단기예보는 뷰와 같이 그날의 마지막 시간대 사용)
+    weather_by_date = {
+        target: {item["date"]: item for item in items}
+        for target, items in weather_by_target.items()
+    }
+
+    changed = []
+    for schedule in schedules:
+        weather_info = weather_by_date[targets[schedule.location]].get(
+            f"{schedule.date:%Y%m%d}"
+        )
+        if weather_info is None:
+            continue
+        weather_main, weather_icon = describe_weather(weather_info)
+        if (weather_main, weather_icon) != (schedule.weather_main, schedule.weather_icon):
+            schedule.weather_main = weather_main
+            schedule.weather_icon = weather_icon
+            changed.append(schedule)
+    if changed:
+        Schedule.objects.bulk_update(changed, ["weather_main", "weather_icon"])
+    return len(changed)
+
+
+def refresh_schedule_weather(only_targets: Optional[Set[WeatherTarget]] = None) -> int:
+    """다가오는 일정들의 weather_main/weather_icon을 저장된 최신 예보로 일괄 갱신
+
+    일정을 날짜순으로 SCHEDULE_WEATHER_BATCH_SIZE개씩 읽어, 묶음마다 필요한 격자의
+    예보를 한 번에 조회하고 바뀐 일정만 bulk_update 한 번으로 저장합니다.
+
+    Args:
+        only_targets: 이 격자들에 속한 일정만 갱신 (없으면 전체)
+
+    Returns:
+        갱신한 일정 수
+    """
+    batch_size = settings.SCHEDULE_WEATHER_BATCH_SIZE
+    schedules = (
+        _upcoming_schedules()
+        .order_by("date", "id")
+        .only("id", "date", "location", "weather_main", "weather_icon")
+    )
+    updated = 0
+    batch = []
+    with timed("weather", "schedule_refresh"):
+        for schedule in schedules.iterator(chunk_size=batch_size):
+            batch.append(schedule)
+            if len(batch) >= batch_size:
+                updated += _update_schedule_batch(batch, only_targets)
+                batch = []
+        if batch:
+            updated += _update_schedule_batch(batch, only_targets)
+    logger.info(f"일정 날씨 갱신 완료: {updated}개 일정")
+    return updated
+
+
+def _remember_schedule_targets():
+    """다가오는 일정 장소들의 격자를 갱신 대상에 추가"""
+    locations = _upcoming_schedules().values_list("location", flat=True).distinct()
+    for location in locations:
+        _remember_target(get_weather_target(location))
+
+
+def _refresh_schedules_once(targets: Iterable[WeatherTarget]):
+    """현재 발표분이 저장된 격자마다 한 번만 일정 날씨 갱신
+
+    격자별로 (발표 시각, 격자) 키를 먼저 잡은 워커가 그 격자의 일정을 갱신하므로,
+    일부 격자가 실패하거나 다른 워커가 갱신 중이어도 나머지 격자의 일정은 바로
+    반영되고, 남은 격자는 다음 시도에서 저장되는 대로 반영됩니다.
+    """
+    issued = f"{get_issue_time():%Y%m%d%H%M}"
+    keys = {
+        target: f"weather:schedules:{issued}:{_target_suffix(target)}" for target in targets
+    }
+    claimed = {
+        target
+        for target, key in keys.items()
+        if cache.add(key, True, timeout=settings.WEATHER_CACHE_TTL)
+    }
+    if not claimed:
+        return
+    try:
+        refresh_schedule_weather(claimed)
+    except Exception as e:
+        cache.delete_many([keys[target] for target in claimed])
+        logger.error(f"일정 날씨 갱신 중 오류: {str(e)}")
+
+
+def _refresher_loop():
+    while True:
+        try:
+            _remember_schedule_targets()
+        except Exception as e:
+            logger.error(f"일정 장소 조회 중 오류: {str(e)}")
+        with _targets_lock:
+            targets = list(_known_targets)
+        refreshed = [target for target in targets if _safe_refresh(target)]
+        if refreshed:
+            # 새 발표분이 저장된 격자의 일정 날씨 반영 (실패한 격자는 재시도 후 반영)
+            _refresh_schedules_once(refreshed)
+        close_old_connections()
+        if len(refreshed) == len(targets):
+            # 다음 발표 시각 구간 시작 직후 갱신
+            delay = seconds_until_next_issue() + settings.WEATHER_REFRESH_DELAY
+        else:
+            delay = settings.WEATHER_RETRY_INTERVAL
+        time.sleep(delay)
+
+
+def start_weather_refresher():
+    """발표 시각마다 요청된 격자들의 날씨를 갱신하는 백그라운드 스레드 시작 (프로세스당 한 번)"""
+    global _refresher_started
+    with _refresher_lock:
+        if _refresher_started:
+            return
+        _refresher_started = True
+    threading.Thread(
+        target=_refresher_loop, name="weather-refresher", daemon=True
+    ).start()
+    logger.info("날씨 갱신 스레드 시작")
@@ -1,8 +1,5 @@
 from django.apps import AppConfig
-import threading
-import os
 import logging
-from .graph_chatbot import initialize_graph
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -14,38 +11,12 @@ class ChatbotConfig(AppConfig):
     name = "chatbot"
 
     def ready(self):
-        """서버 시작 시 LangGraph 초기화"""
-        # 자동 리로드 시 중복 초기화 방지
-        if os.environ.get("RUN_MAIN") != "true":
-            logger.info("RUN_MAIN이 true가 아니므로 초기화 건너뜀")
-            return
+        """앱 로드 시 계측 설치
 
-        # 이미 초기화된 경우 중복 초기화 방지
-        from .graph_chatbot import _graph_instance, _initialization_in_progress
+        벡터스토어/LangGraph 워밍업은 ASGI 서버 프로세스에서만 한 번 실행합니다
+        (vacation/asgi.py의 chatbot.warmup.start_warmup 참고).
+        """
+        # DB 쿼리 지연 시간 계측 (모든 프로세스에서 설치)
+        from vacation.metrics import install_db_instrumentation
 
-        if _graph_instance is not None:
-            logger.info("LangGraph 인스턴스가 이미 존재하므로 초기화 건너뜀")
-            return
-
-        if _initialization_in_progress:
-            logger.info("LangGraph 초기화가 이미 진행 중이므로 건너뜀")
-            return
-
-        # 백그라운드에서 벡터스토어 초기화 시작
-        logger.info("벡터스토어 초기화 시작 (apps.py)")
-        from .graph_modules.data_loader import initialize_vectorstores
-
-        def initialize_all():
-            # 벡터스토어 초기화
-            logger.info("벡터스토어 초기화 중...")
-            initialize_vectorstores()
-
-            # LangGraph 초기화
-            logger.info("LangGraph 초기화 중...")
-            from .graph_chatbot import initialize_graph_in_background
-
-            initialize_graph_in_background()
-
-        # 백그라운드에서 초기화 시작
-        threading.Thread(target=initialize_all, daemon=True).start()
-        logger.info("벡터스토어 및 LangGraph 초기화 태스크 시작됨")
+        install_db_instrumentation()
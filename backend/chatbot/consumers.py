@@ -10,10 +10,11 @@ import jwt
 from django.conf import settings
 from urllib.parse import parse_qs
 import weakref
-from .graph_chatbot import get_graph_instance, graph_ready
-from django.apps import apps
-from django.utils import timezone
-from openai import OpenAI
+from .warmup import wait_until_ready
+from vacation.circuit import get_breaker
+from vacation.metrics import start_trace, timed
+from .graph_modules.deadline import new_deadline, remaining
+from vacation.upstreams import openai_client_kwargs, openai_timeout
 
 # 전역 변수로 연결 관리
 _active_connections = weakref.WeakSet()
@@ -222,8 +223,16 @@ class ChatConsumer(AsyncWebsocketConsumer):
         OpenAI의 gpt-4o-mini 모델을 사용하여 메시지가 장소 질문/추천 관련인지 판별
         """
         try:
-            # OpenAI 클라이언트 초기화
-            client = OpenAI(api_key=OPENAI_API_KEY)
+            # OpenAI 클라이언트 초기화 (무거운 SDK는 처음 사용할 때 임포트)
+            from openai import OpenAI
+            from vacation.http_client import get_openai_http_client
+
+            client = OpenAI(
+                api_key=OPENAI_API_KEY,
+                http_client=get_openai_http_client(),
+                timeout=openai_timeout(),
+                **openai_client_kwargs(),
+            )
 
             # 시스템 프롬프트와 사용자 메시지 설정
             system_prompt = """
@@ -234,16 +243,19 @@ class ChatConsumer(AsyncWebsocketConsumer):
             """
 
             # API 호출
-            response = await asyncio.to_thread(
-                client.chat.completions.create,
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": message},
-                ],
-                temperature=0,
-                max_tokens=100,
-            )
+            with timed("llm", "message_classifier"):
+                # OpenAI 차단기가 열려 있으면 호출 없이 예외 -> 아래에서 True 처리
+                response = await get_breaker("openai").acall(
+                    asyncio.to_thread,
+                    client.chat.completions.create,
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": message},
+                    ],
+                    temperature=0,
+                    max_tokens=100,
+                )
 
             # 응답 분석
             result = response.choices[0].message.content.strip().lower()
@@ -271,6 +283,15 @@ class ChatConsumer(AsyncWebsocketConsumer):
             message = text_data_json.get("message", "")
             session_id = text_data_json.get("sessionId")
 
+            # 메시지 단위 trace 시작 (이후 생성되는 백그라운드 태스크에도 전파됨)
+            trace_id, timings = start_trace()
+            # 메시지 수신 시점부터 지연 시간 예산 시작
+            deadline = new_deadline()
+            send_timings = settings.CHAT_SEND_TIMINGS or bool(
+                text_data_json.get("timings")
+            )
+            print(f"trace ID: {trace_id}")
+
             print(
                 f"추출된 메시지: '{message}', 세션 ID: {session_id or self.room_name}"
             )
@@ -316,7 +337,13 @@ class ChatConsumer(AsyncWebsocketConsumer):
             # 백그라운드에서 AI 응답 처리 (장소 관련 메시지인 경우에만 실행)
             print("AI 응답 처리 시작")
             task = asyncio.create_task(
-                self.process_message_in_background(message, session)
+                self.process_message_in_background(
+                    message,
+                    session,
+                    trace_id,
+                    timings if send_timings else None,
+                    deadline,
+                )
             )
             print(f"백그라운드 태스크 생성됨: {task}")
 
@@ -342,21 +369,29 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
             print(f"자세한 오류: {traceback.format_exc()}")
 
-    async def process_message_in_background(self, message, session):
-        """백그라운드에서 메시지 처리"""
+    async def process_message_in_background(
+        self, message, session, trace_id=None, timings=None, deadline=None
+    ):
+        """백그라운드에서 메시지 처리
+
+        Args:
+            trace_id: 메시지 trace ID (최종 응답에 포함)
+            timings: 단계별 소요 시간 목록 (None이 아니면 최종 응답에 포함)
+            deadline: 메시지 처리 마감 시각 (없으면 지금부터 기본 예산 적용)
+        """
+        deadline = deadline or new_deadline()
         animation_task = None
         try:
             print("\n=== AI 응답 처리 시작 ===")
-            # LangGraph 인스턴스 대기
-            print(f"=== LangGraph 준비 상태: {graph_ready.is_set()} ===")
-            wait_count = 0
-            while not graph_ready.is_set():
-                wait_count += 1
-                if wait_count % 10 == 0:  # 10번마다 로그 출력 (약 1초마다)
-                    print(f"=== LangGraph 대기 중... {wait_count/10}초 경과 ===")
-                await asyncio.sleep(0.1)
+            # 워밍업(벡터스토어/LangGraph 로드) 완료 대기
+            # 실패/시간 초과 시에도 그래프는 요청 시점에 생성되므로 계속 진행
+            if not await wait_until_ready(timeout=settings.CHAT_WARMUP_WAIT_TIMEOUT):
+                print("=== 워밍업이 완료되지 않은 상태로 처리 진행 ===")
 
             print("=== LangGraph 대기 완료, 인스턴스 가져오기 시도 ===")
+            # LangGraph/LangChain 스택은 메시지 처리 시점에 임포트 (워커 시작 비용 절감)
+            from .graph_chatbot import get_graph_instance
+
             try:
                 graph = get_graph_instance()
                 print("=== LangGraph 인스턴스 가져옴 ===")
@@ -392,177 +427,6 @@ class ChatConsumer(AsyncWebsocketConsumer):
             print("=== 애니메이션 태스크 시작 ===")
             animation_task = asyncio.create_task(animate_ellipsis())
 
-            # 일정 정보 가져오기 - Calendar 모델에서만 조회
-            schedule_place = None
-            schedule_companion = None
-
-            try:
-                # 일정 ID가 있는 경우 먼저 ID로 조회 시도
-                if hasattr(self, "schedule_id"):
-                    try:
-                        # calendar_app의 Schedule 모델 가져오기
-                        Schedule = apps.get_model("calendar_app", "Schedule")
-
-                        # ID로 일정 조회
-                        user_schedule = await database_sync_to_async(
-                            lambda: Schedule.objects.filter(
-                                user=self.user, id=self.schedule_id
-                            ).first()
-                        )()
-
-                        if user_schedule:
-                            print(
-                                f"✅ 일정 ID({self.schedule_id})로 일정 정보를 성공적으로 조회했습니다."
-                            )
-
-                            # 일정 데이터 추출
-                            if (
-                                hasattr(user_schedule, "location")
-                                and user_schedule.location
-                            ):
-                                schedule_place = user_schedule.location
-                                print(
-                                    f"✅ 일정 ID에서 장소 정보 가져옴: '{schedule_place}'"
-                                )
-
-                            if (
-                                hasattr(user_schedule, "companion")
-                                and user_schedule.companion
-                            ):
-                                schedule_companion = user_schedule.companion
-                                print(
-                                    f"✅ 일정 ID에서 동행자 정보 가져옴: '{schedule_companion}'"
-                                )
-
-                            # 세션 날짜 업데이트
-                            if hasattr(user_schedule, "date") and user_schedule.date:
-                                self.session_date = user_schedule.date
-                                print(
-                                    f"✅ 일정 ID에서 날짜 정보 업데이트: {self.session_date}"
-                                )
-                        else:
-                            print(
-                                f"⚠️ ID {self.schedule_id}에 해당하는 일정을 찾을 수 없습니다."
-                            )
-                    except Exception as e:
-                        print(f"❌ 일정 ID 기반 조회 중 오류 발생: {str(e)}")
-
-                # 일정 ID로 조회에 실패한 경우 날짜로 시도
-                if not schedule_place and not schedule_companion:
-                    # 날짜 데이터 준비
-                    session_date = None
-
-                # 1. 세션 객체에서 date 필드 가져오기 (가장 우선순위)
-                try:
-                    if hasattr(session, "date") and session.date:
-                        session_date = await database_sync_to_async(
-                            lambda: session.date
-                        )()
-                        print(f"✅ 세션 객체에서 날짜 정보 가져옴: {session_date}")
-                except Exception as e:
-                    print(f"❌ 세션 date 필드 접근 중 오류: {e}")
-
-                # 2. self.session_date에서 가져오기 (connect 메서드에서 설정된 값)
-                if (
-                    not session_date
-                    and hasattr(self, "session_date")
-                    and self.session_date
-                ):
-                    session_date = self.session_date
-                    print(f"✅ self.session_date에서 날짜 정보 가져옴: {session_date}")
-
-                # 3. URL 파라미터에서 날짜 확인
-                if not session_date:
-                    try:
-                        session_url_params = await database_sync_to_async(
-                            lambda: (
-                                session.url_params
-                                if hasattr(session, "url_params") and session.url_params
-                                else {}
-                            )
-                        )()
-
-                        if (
-                            isinstance(session_url_params, dict)
-                            and "date" in session_url_params
-                        ):
-                            from datetime import datetime
-
-                            date_str = session_url_params.get("date")
-                            try:
-                                session_date = datetime.strptime(
-                                    date_str, "%Y-%m-%d"
-                                ).date()
-                                print(
-                                    f"✅ URL 파라미터에서 날짜 정보 가져옴: {session_date}"
-                                )
-                            except Exception as e:
-                                print(f"❌ URL 날짜 변환 실패: {e}")
-                    except Exception as e:
-                        print(f"❌ URL 파라미터 추출 중 오류: {e}")
-
-                # 4. 날짜 정보가 없으면 현재 날짜 사용 (마지막 방법)
-                if not session_date:
-                    session_date = timezone.now().date()
-                    print(
-                        f"⚠️ 날짜 정보를 찾을 수 없어 현재 날짜를 사용합니다: {session_date}"
-                    )
-
-                # 세션 객체에 날짜 저장 (없는 경우에만)
-                if not hasattr(session, "date") or not session.date:
-                    try:
-                        session.date = session_date
-                        await database_sync_to_async(session.save)()
-                        print(f"✅ 세션 객체에 날짜 {session_date} 저장 완료")
-                    except Exception as e:
-                        print(f"❌ 세션에 날짜 저장 중 오류: {e}")
-
-                # 일정 정보 조회 준비
-                print(
-                    f"📅 일정 조회 - 날짜: {session_date}, 사용자: {self.user.username}"
-                )
-
-                # calendar_app의 Schedule 모델 가져오기
-                try:
-                    Schedule = apps.get_model("calendar_app", "Schedule")
-
-                    # 지정된 날짜의 일정 조회
-                    user_schedule = await database_sync_to_async(
-                        lambda: Schedule.objects.filter(
-                            user=self.user, date=session_date
-                        ).first()
-                    )()
-
-                    if user_schedule:
-                        # 일정 정보 추출
-                        if (
-                            hasattr(user_schedule, "location")
-                            and user_schedule.location
-                        ):
-                            schedule_place = user_schedule.location
-                            print(f"✅ 일정에서 장소 정보 가져옴: '{schedule_place}'")
-
-                        if (
-                            hasattr(user_schedule, "companion")
-                            and user_schedule.companion
-                        ):
-                            schedule_companion = user_schedule.companion
-                            print(
-                                f"✅ 일정에서 동행자 정보 가져옴: '{schedule_companion}'"
-                            )
-
-                        print(
-                            f"✅ 사용자 {self.user.username}의 {session_date} 일정 정보를 성공적으로 가져왔습니다."
-                        )
-                    else:
-                        print(
-                            f"⚠️ 사용자 {self.user.username}의 {session_date} 일정이 없습니다."
-                        )
-                except Exception as e:
-                    print(f"❌ Schedule 모델 조회 중 오류: {e}")
-            except Exception as e:
-                print(f"❌ 일정 정보 조회 중 오류 발생: {str(e)}")
-
             # LangGraph 실행 (비동기 호출)
             print("=== LangGraph 비동기 호출 시작 ===")
             try:
@@ -571,26 +435,26 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 print(f"=== 세션 ID: {session_id} (타입: {type(session_id)}) ===")
 
                 # 전달하는 state 객체 생성
-                state = {"question": message, "session_id": session_id}
-
-                # 일정 정보가 있으면 추가
-                if schedule_place:
-                    state["schedule_place"] = schedule_place
-                    state["place"] = (
-                        schedule_place  # 호환성을 위해 두 가지 키 모두 설정
-                    )
-                    print(f"✅ 그래프에 일정 장소 정보 전달: '{schedule_place}'")
-
-                if schedule_companion:
-                    state["companion"] = schedule_companion
-                    state["with_who"] = (
-                        schedule_companion  # 호환성을 위해 두 가지 키 모두 설정
-                    )
-                    print(f"✅ 그래프에 동행자 정보 전달: '{schedule_companion}'")
+                # (세션/일정 컨텍스트는 그래프의 context_loader 노드가 한 번에 조회)
+                state = {
+                    "question": message,
+                    "session_id": session_id,
+                    "user_id": self.user.id,
+                    "schedule_id": getattr(self, "schedule_id", None),
+                    "session_date": getattr(self, "session_date", None),
+                    "deadline": deadline,
+                }
 
                 print(f"📋 그래프에 전달하는 상태 객체: {state}")
 
-                result = await graph.ainvoke(state)
+                # 예산을 크게 넘기면 그래프 실행을 끊고 안내 메시지로 대체
+                hard_limit = (
+                    max(remaining(state), 0) + settings.CHAT_DEADLINE_GRACE
+                )
+                with timed("message", "graph"):
+                    result = await asyncio.wait_for(
+                        graph.ainvoke(state), timeout=hard_limit
+                    )
 
                 if "answer" in result:
                     content = result["answer"]
@@ -602,6 +466,9 @@ class ChatConsumer(AsyncWebsocketConsumer):
                         f"=== 응답에 'answer' 키가 없음, 가능한 키: {list(result.keys())} ==="
                     )
                     final_response = ""
+            except asyncio.TimeoutError:
+                print("❌ LangGraph 처리 시간 초과 ===")
+                final_response = "죄송합니다, 응답 생성에 시간이 너무 오래 걸리고 있습니다. 잠시 후 다시 시도해주세요."
             except Exception as graph_error:
                 print(f"❌ LangGraph 처리 중 오류: {graph_error} ===")
                 final_response = f"죄송합니다, 응답을 생성하는 중에 오류가 발생했습니다: {str(graph_error)}"
@@ -620,16 +487,17 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
             # 최종 메시지 전송
             print("=== 최종 응답 전송 시작 ===")
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    "type": "chat_message",
-                    "message": final_response,
-                    "is_bot": True,
-                    "is_streaming": False,
-                    "session_id": str(session.id),
-                },
-            )
+            final_event = {
+                "type": "chat_message",
+                "message": final_response,
+                "is_bot": True,
+                "is_streaming": False,
+                "session_id": str(session.id),
+                "trace_id": trace_id,
+            }
+            if timings is not None:
+                final_event["timings"] = list(timings)
+            await self.channel_layer.group_send(self.room_group_name, final_event)
             print("✅ 최종 응답 전송 완료 ===")
 
         except Exception as e:
@@ -867,7 +735,9 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
             # 그래프 인스턴스 가져오기
             print("\n=== AI 응답 처리 시작 ===")
-            graph = await get_graph_instance()
+            from .graph_chatbot import get_graph_instance
+
+            graph = get_graph_instance()
             print("=== LangGraph 인스턴스 가져옴 ===")
 
             print("=== LangGraph 비동기 호출 시작 ===")
@@ -1,43 +1,30 @@
 import os
 import threading
 import asyncio
-from typing import Dict, List, Annotated, TypedDict, Tuple, Optional, Any, Iterator
-from threading import Event
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain_community.vectorstores import FAISS
-from langchain_core.documents import Document
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-import pandas as pd
-import re
-import numpy as np
-from pathlib import Path
+from typing import Dict, Any
 from dotenv import load_dotenv
-import langgraph
 from langgraph.graph import END, StateGraph
-from langgraph.graph.message import add_messages, MessageGraph
-import random
-from .graph_modules import (
-    GraphState,
-    query_analyzer,
-    hybrid_retriever,
-    naver_search,
-    response_generator,
-)
+import time
+from django.conf import settings
+from vacation.metrics import record, timed
+from .graph_modules.deadline import branch_timeout
+# 노드 함수 이름이 하위 모듈 이름과 같으므로 하위 모듈에서 직접 임포트
+from .graph_modules.base import GraphState
+from .graph_modules.context_loader import context_loader
+from .graph_modules.query_analyzer import query_analyzer
+from .graph_modules.hybrid_retriever import hybrid_retriever
+from .graph_modules.naver_search import naver_search
+from .graph_modules.response_generator import response_generator
 import logging
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# LangGraph 인스턴스 준비 상태를 나타내는 이벤트
-graph_ready = asyncio.Event()
-
 # 전역 변수로 LangGraph 인스턴스 저장
 _graph_instance = None
-
-# 싱글톤 그래프 인스턴스와 초기화 상태
-_initialization_in_progress = False  # 초기화가 진행 중인지 확인하는 플래그
+# 여러 스레드에서 동시에 그래프를 만들지 않도록 보호하는 락
+_graph_lock = threading.Lock()
 
 # 환경 변수 로드
 load_dotenv()
@@ -51,42 +38,112 @@ else:
 
 
 def get_graph_instance():
-    """그래프 인스턴스를 반환하는 함수"""
+    """그래프 인스턴스를 반환하는 함수 (최초 호출 시 한 번만 생성)"""
     global _graph_instance
     if _graph_instance is None:
-        logger.info("LangGraph 인스턴스가 없음, 새로 생성 시도")
-        # 여기서 그래프를 생성하는 로직 추가
+        with _graph_lock:
+            if _graph_instance is None:
+                logger.info("LangGraph 인스턴스가 없음, 새로 생성")
+                _graph_instance = create_graph()
+                logger.info("LangGraph 인스턴스 생성 성공")
+    return _graph_instance
+
+
+def with_timeout(node, name: str, timeout: float, fallback: Dict[str, Any]):
+    """그래프 노드를 제한 시간이 있는 비동기 노드로 감싸기
+
+    동기 노드는 스레드에서 실행하며, 제한 시간을 넘기거나 오류가 나면
+    fallback 값을 반환해 다른 분기의 결과만으로 응답을 생성할 수 있게 합니다.
+    제한 시간은 메시지 마감(deadline)까지 최종 응답 생성 몫을 남기도록 줄어들 수 있으며,
+    실행 시간은 결과(ok/timeout/error)와 함께 메트릭으로 기록합니다.
+
+    Args:
+        node: 감쌀 노드 함수 (동기 또는 비동기)
+        name: 로그에 표시할 노드 이름
+        timeout: 제한 시간 (초)
+        fallback: 시간 초과/오류 시 반환할 상태 필드
+
+    Returns:
+        비동기 노드 함수
+    """
+
+    async def wrapped(state: GraphState) -> Dict[str, Any]:
+        if asyncio.iscoroutinefunction(node):
+            call = node(state)
+        else:
+            call = asyncio.to_thread(node, state)
+
+        # 마감에 맞춰 줄어든 실제 제한 시간 (로그도 이 값으로 기록)
+        effective_timeout = branch_timeout(state, timeout)
+        start = time.perf_counter()
+        outcome = "ok"
         try:
-            _graph_instance = create_graph()
-            logger.info("LangGraph 인스턴스 생성 성공")
-            # 그래프 생성 성공 시 이벤트 설정
-            if not graph_ready.is_set():
-                logger.info("graph_ready 이벤트 설정 (get_graph_instance에서)")
-                graph_ready.set()
+            return await asyncio.wait_for(call, timeout=effective_timeout)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            logger.warning(
+                f"{name} 노드가 {effective_timeout:.1f}초 안에 끝나지 않아 결과 없이 진행"
+                f" (설정 {timeout}초)"
+            )
         except Exception as e:
-            logger.error(f"LangGraph 인스턴스 생성 실패: {e}")
-            raise
-    return _graph_instance
+            outcome = "error"
+            logger.error(f"{name} 노드 실행 중 오류 발생: {e}")
+        finally:
+            record("node", name, time.perf_counter() - start, outcome)
+        return dict(fallback)
+
+    wrapped.__name__ = name
+    return wrapped
 
 
 def create_graph():
-    """LangGraph 생성 함수"""
+    """LangGraph 생성 함수
+
+    세션/일정 컨텍스트를 한 번 불러온 뒤 쿼리를 분석하고, 하이브리드 검색과
+    네이버 검색을 병렬로 실행하여 두 분기가 모두 끝나면 응답을 생성합니다.
+    """
     logger.info("create_graph 함수 호출됨")
     try:
         # 상태 그래프 생성
         workflow = StateGraph(GraphState)
 
         # 노드 추가
-        workflow.add_node("query_analyzer", query_analyzer)
-        workflow.add_node("hybrid_retriever", hybrid_retriever)
-        workflow.add_node("naver_search", naver_search)
-        workflow.add_node("response_generator", response_generator)
+        workflow.add_node(
+            "context_loader", timed("node", "context_loader")(context_loader)
+        )
+        workflow.add_node(
+            "query_analyzer", timed("node", "query_analyzer")(query_analyzer)
+        )
+        workflow.add_node(
+            "hybrid_retriever",
+            with_timeout(
+                hybrid_retriever,
+                "hybrid_retriever",
+                settings.CHAT_RETRIEVER_TIMEOUT,
+                {"retrieved_docs": []},
+            ),
+        )
+        workflow.add_node(
+            "naver_search",
+            with_timeout(
+                naver_search,
+                "naver_search",
+                settings.CHAT_NAVER_TIMEOUT,
+                {"naver_results": []},
+            ),
+        )
+        workflow.add_node(
+            "response_generator",
+            timed("node", "response_generator")(response_generator),
+        )
 
         # 엣지 연결
-        workflow.set_entry_point("query_analyzer")
+        workflow.set_entry_point("context_loader")
+        workflow.add_edge("context_loader", "query_analyzer")
+        # 검색 분기 병렬 실행 (fan-out) 후 응답 생성에서 합류 (fan-in)
         workflow.add_edge("query_analyzer", "hybrid_retriever")
-        workflow.add_edge("hybrid_retriever", "naver_search")
-        workflow.add_edge("naver_search", "response_generator")
+        workflow.add_edge("query_analyzer", "naver_search")
+        workflow.add_edge(["hybrid_retriever", "naver_search"], "response_generator")
         workflow.add_edge("response_generator", END)
 
         # 그래프 컴파일
@@ -98,60 +155,3 @@ def create_graph():
     except Exception as e:
         logger.error(f"LangGraph 생성 중 오류 발생: {e}")
         raise
-
-
-def initialize_graph():
-    """백그라운드 스레드에서 그래프 초기화"""
-    logger.info("initialize_graph 함수 호출됨")
-    try:
-        # 그래프 인스턴스 생성
-        instance = get_graph_instance()
-        logger.info("LangGraph 인스턴스 초기화 성공")
-
-        # 이벤트 설정 (get_graph_instance에서 이미 처리됨)
-        if not graph_ready.is_set():
-            logger.info("graph_ready 이벤트 설정 (initialize_graph에서)")
-            graph_ready.set()
-            logger.info(f"graph_ready 이벤트 설정 완료: {graph_ready.is_set()}")
-        else:
-            logger.info(f"graph_ready 이벤트가 이미 설정됨: {graph_ready.is_set()}")
-    except Exception as e:
-        logger.error(f"LangGraph 초기화 중 오류 발생: {e}")
-        # 초기화 실패해도 이벤트는 설정하여 무한 대기 방지
-        if not graph_ready.is_set():
-            logger.warning("오류 발생으로 인한 graph_ready 이벤트 설정")
-            graph_ready.set()
-
-
-# 백그라운드에서 그래프 초기화
-def initialize_graph_in_background():
-    """백그라운드에서 그래프 초기화"""
-    global _initialization_in_progress, _graph_instance
-
-    # 이미 초기화가 완료된 경우
-    if _graph_instance is not None:
-        print("=== LangGraph 인스턴스가 이미 초기화되어 있습니다 ===")
-        return
-
-    # 이미 초기화가 진행 중인 경우
-    if _initialization_in_progress:
-        print("=== LangGraph 초기화가 이미 진행 중입니다 ===")
-        return
-
-    # 초기화 진행 중 플래그 설정
-    _initialization_in_progress = True
-
-    try:
-        print("=== LangGraph 초기화 시작 ===")
-        initialize_graph()
-        print("=== LangGraph 초기화 완료 - 이제 응답 생성이 가능합니다 ===")
-    except Exception as e:
-        print(f"=== LangGraph 초기화 중 오류 발생: {str(e)} ===")
-        # 오류 발생 시 플래그 초기화
-        _initialization_in_progress = False
-
-
-# 서버 시작 시 자동 초기화 (나중에 apps.py로 이동할 수 있음)
-if _graph_instance is None and not _initialization_in_progress:
-    print("=== 서버 시작: LangGraph 초기화 시작 ===")
-    threading.Thread(target=initialize_graph_in_background, daemon=True).start()
@@ -1,15 +1,43 @@
-from .base import GraphState, format_documents, format_naver_results
-from .query_analyzer import query_analyzer
-from .hybrid_retriever import hybrid_retriever
-from .naver_search import naver_search
-from .response_generator import response_generator
+"""LangGraph 노드 모듈 모음
+
+노드 모듈은 LangChain/OpenAI 스택을 임포트하므로, 처음 접근할 때 임포트합니다
+(deadline, context_builder 같은 가벼운 하위 모듈만 쓰는 곳은 비용을 내지 않음).
+"""
+
+import importlib
+
+# 공개 이름 -> 정의된 하위 모듈
+_LAZY_ATTRS = {
+    'GraphState': '.base',
+    'format_documents': '.base',
+    'format_naver_results': '.base',
+    'context_loader': '.context_loader',
+    'query_analyzer': '.query_analyzer',
+    'hybrid_retriever': '.hybrid_retriever',
+    'naver_search': '.naver_search',
+    'response_generator': '.response_generator',
+}
 
 __all__ = [
     'GraphState',
+    'context_loader',
     'query_analyzer',
     'hybrid_retriever',
     'naver_search',
     'response_generator',
     'format_documents',
     'format_naver_results'
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
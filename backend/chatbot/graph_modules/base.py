@@ -1,4 +1,5 @@
 from typing import Dict, List, TypedDict, Optional, Tuple
+from datetime import date
 from langchain_core.documents import Document
 import re
 
@@ -11,6 +12,17 @@ class GraphState(TypedDict):
     is_event: bool
     answer: str
     session_id: int  # 세션 ID 필드 추가
+    recommended_places: List[str]  # 이미 추천한 장소 식별자 목록
+    context_tokens: Dict  # 응답 생성 컨텍스트의 토큰 사용량 통계
+    # 컨텍스트 로딩 입력 (consumer가 전달)
+    user_id: Optional[int]  # 일정 소유자 ID
+    schedule_id: Optional[int]  # 연결 URL로 전달된 일정 ID
+    # 컨텍스트 로딩 결과 (context_loader가 메시지당 한 번 채움)
+    url_params: Dict  # 세션에 저장된 URL 파라미터
+    session_date: Optional[date]  # 세션(일정) 날짜
+    schedule_place: Optional[str]  # 일정 장소
+    schedule_companion: Optional[str]  # 일정 동행자
+    deadline: Optional[float]  # 메시지 처리 마감 시각 (time.monotonic 기준)
 
 
 # 토큰화 함수
@@ -95,13 +107,18 @@ def format_naver_results(places: List[Dict]) -> str:
         
     result = "=== 네이버 검색 결과 ===\n"
     for i, place in enumerate(places, 1):
-        result += f"""
-{i}. {place['title']}
+        result += format_naver_place(i, place)
+    return result
+
+
+def format_naver_place(index: int, place: Dict) -> str:
+    """네이버 검색 결과 한 건을 텍스트로 포맷팅"""
+    return f"""
+{index}. {place['title']}
    📍 주소: {place['address']}
    🏷️ 분류: {place['category']}
    🔍 링크: {place.get('link', 'N/A')}
 """
-    return result
 
 
 # 문서 형식 변환기
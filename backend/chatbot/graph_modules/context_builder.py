@@ -0,0 +1,238 @@
+"""응답 생성 프롬프트의 컨텍스트를 토큰 예산에 맞춰 조립하는 모듈
+
+RAG 문서, 네이버 검색 결과, 이미 추천한 장소 목록을 섹션별 토큰 예산과
+우선순위에 따라 잘라내어 LLM 입력 크기를 일정하게 유지합니다.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 기본 토큰 예산 (settings.CHAT_CONTEXT_TOKEN_BUDGETS로 덮어쓸 수 있음)
+DEFAULT_TOKEN_BUDGETS = {
+    "total": 3000,
+    "context": 1800,
+    "naver_results": 800,
+    "recommended_places": 300,
+}
+
+# 섹션 우선순위 (앞쪽일수록 먼저 예산을 배정받음)
+SECTION_PRIORITY = ["context", "naver_results", "recommended_places"]
+
+# 항목 하나에 최소한으로 보장하는 토큰 수
+MIN_ITEM_TOKENS = 40
+
+# 잘린 문자열 뒤에 붙이는 표시
+TRUNCATION_MARK = "..."
+
+# 문서별 잘린 스니펫 캐시 크기
+SNIPPET_CACHE_SIZE = 2048
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+# (문서 키, 토큰 상한) -> (원문 해시, 잘린 스니펫, 토큰 수)
+_snippet_cache: "OrderedDict[Tuple[str, int], Tuple[str, str, int]]" = OrderedDict()
+_snippet_lock = threading.Lock()
+
+
+def get_token_budgets() -> Dict[str, int]:
+    """설정값과 기본값을 합친 섹션별 토큰 예산 반환"""
+    budgets = dict(DEFAULT_TOKEN_BUDGETS)
+    budgets.update(getattr(settings, "CHAT_CONTEXT_TOKEN_BUDGETS", {}) or {})
+    return budgets
+
+
+def _get_encoding():
+    """로컬 토크나이저(tiktoken) 로드 (싱글톤)
+
+    BPE 파일을 받을 수 없는 환경에서는 None을 반환하고 근사치 계산을 사용합니다.
+    """
+    global _encoding, _encoding_loaded
+    if _encoding_loaded:
+        return _encoding
+
+    with _encoding_lock:
+        if not _encoding_loaded:
+            try:
+                import tiktoken
+
+                _encoding = tiktoken.get_encoding(
+                    getattr(settings, "CHAT_TOKENIZER_ENCODING", "o200k_base")
+                )
+                logger.info("tiktoken 토크나이저 로드 완료")
+            except Exception as e:
+                _encoding = None
+                logger.warning(f"tiktoken 로드 실패, 근사 토큰 계산 사용: {e}")
+            _encoding_loaded = True
+    return _encoding
+
+
+def _approx_token_count(text: str) -> int:
+    """토크나이저가 없을 때 사용하는 근사 토큰 수 (한글은 글자당 약 1토큰)"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (len(text) - ascii_chars) + (ascii_chars + 3) // 4
+
+
+def count_tokens(text: str) -> int:
+    """텍스트의 토큰 수 계산"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return _approx_token_count(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> Tuple[str, int]:
+    """텍스트를 최대 토큰 수에 맞게 자르기
+
+    Returns:
+        (잘린 텍스트, 토큰 수) 튜플
+    """
+    if max_tokens <= 0 or not text:
+        return "", 0
+
+    encoding = _get_encoding()
+    if encoding is None:
+        total = _approx_token_count(text)
+        if total <= max_tokens:
+            return text, total
+        # 근사치 기준으로 비율만큼 자르기
+        cut = max(int(len(text) * max_tokens / total) - len(TRUNCATION_MARK), 0)
+        truncated = text[:cut].rstrip() + TRUNCATION_MARK
+        return truncated, _approx_token_count(truncated)
+
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text, len(tokens)
+
+    mark_tokens = len(encoding.encode(TRUNCATION_MARK))
+    keep = max(max_tokens - mark_tokens, 0)
+    truncated = encoding.decode(tokens[:keep]).rstrip() + TRUNCATION_MARK
+    return truncated, keep + mark_tokens
+
+
+def doc_cache_key(doc) -> str:
+    """문서를 식별하는 캐시 키 생성"""
+    meta = getattr(doc, "metadata", {}) or {}
+    if meta.get("line_number") is not None:
+        return f"blog:{meta['line_number']}"
+    if meta.get("title"):
+        return f"event:{meta['title']}:{meta.get('date', '')}"
+    content = getattr(doc, "page_content", "") or ""
+    return "doc:" + hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def get_truncated_snippet(key: Optional[str], text: str, max_tokens: int) -> Tuple[str, int]:
+    """문서별 캐시를 사용해 잘린 스니펫 반환
+
+    같은 문서가 같은 예산으로 다시 들어오면 토큰화 없이 캐시된 결과를 재사용합니다.
+    원문이 바뀐 경우(해시 불일치)에는 새로 계산합니다.
+    """
+    if key is None:
+        return truncate_to_tokens(text, max_tokens)
+
+    digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    cache_key = (key, max_tokens)
+
+    with _snippet_lock:
+        cached = _snippet_cache.get(cache_key)
+        if cached and cached[0] == digest:
+            _snippet_cache.move_to_end(cache_key)
+            return cached[1], cached[2]
+
+    snippet, tokens = truncate_to_tokens(text, max_tokens)
+
+    with _snippet_lock:
+        _snippet_cache[cache_key] = (digest, snippet, tokens)
+        _snippet_cache.move_to_end(cache_key)
+        while len(_snippet_cache) > SNIPPET_CACHE_SIZE:
+            _snippet_cache.popitem(last=False)
+
+    return snippet, tokens
+
+
+def _fit_section(
+    items: List[Tuple[Optional[str], str]], budget: int
+) -> Tuple[List[str], Dict[str, int]]:
+    """섹션 하나의 항목들을 예산 안에 배치
+
+    항목당 상한은 예산을 항목 수로 나눈 값이며, 앞쪽 항목이 남긴 예산은
+    뒤쪽 항목이 이어서 사용합니다. 예산이 부족하면 뒤쪽 항목부터 제외합니다.
+    """
+    stats = {"budget": budget, "tokens": 0, "items": 0, "truncated": 0, "dropped": 0}
+    if not items or budget <= 0:
+        stats["dropped"] = len(items)
+        return [], stats
+
+    selected = []
+    remaining = budget
+    for index, (key, text) in enumerate(items):
+        left_items = len(items) - index
+        per_item = max(remaining // left_items, MIN_ITEM_TOKENS)
+        per_item = min(per_item, remaining)
+        if per_item < MIN_ITEM_TOKENS:
+            stats["dropped"] += left_items
+            break
+
+        snippet, tokens = get_truncated_snippet(key, text, per_item)
+        if not snippet:
+            stats["dropped"] += 1
+            continue
+
+        if snippet != text:
+            stats["truncated"] += 1
+        selected.append(snippet)
+        stats["items"] += 1
+        stats["tokens"] += tokens
+        remaining -= tokens
+
+    return selected, stats
+
+
+def build_context(
+    sections: Dict[str, List[Tuple[Optional[str], str]]],
+    budgets: Optional[Dict[str, int]] = None,
+) -> Tuple[Dict[str, List[str]], Dict]:
+    """섹션별 항목을 우선순위와 토큰 예산에 맞춰 조립
+
+    Args:
+        sections: 섹션 이름 -> [(캐시 키 또는 None, 항목 텍스트), ...]
+        budgets: 섹션별 토큰 예산 (없으면 설정값 사용, "total"은 전체 상한)
+
+    Returns:
+        (섹션 이름 -> 선택된 스니펫 목록, 토큰 통계) 튜플
+    """
+    budgets = budgets or get_token_budgets()
+    remaining_total = budgets.get("total", sum(budgets.values()))
+
+    ordered = [name for name in SECTION_PRIORITY if name in sections]
+    ordered += [name for name in sections if name not in ordered]
+
+    result = {}
+    stats = {"sections": {}, "total_tokens": 0, "total_budget": remaining_total}
+    for name in ordered:
+        section_budget = min(budgets.get(name, remaining_total), remaining_total)
+        snippets, section_stats = _fit_section(sections[name], section_budget)
+        result[name] = snippets
+        stats["sections"][name] = section_stats
+        stats["total_tokens"] += section_stats["tokens"]
+        remaining_total -= section_stats["tokens"]
+
+    section_summary = ", ".join(
+        f"{name}={s['tokens']}/{s['budget']}" for name, s in stats["sections"].items()
+    )
+    logger.info(
+        f"컨텍스트 토큰 사용량: 총 {stats['total_tokens']}/{stats['total_budget']} "
+        f"({section_summary})"
+    )
+    return result, stats
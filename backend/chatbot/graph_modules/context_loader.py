@@ -0,0 +1,154 @@
+"""메시지 처리에 필요한 세션/일정 컨텍스트를 한 번에 불러오는 노드
+
+세션(url_params, 날짜, 이미 추천한 장소)과 일정(장소, 동행자)을 메시지당 한 번만
+조회해 GraphState에 담습니다. 이후 노드는 컨텍스트를 위해 DB를 조회하지 않습니다.
+"""
+
+import datetime
+import logging
+from typing import Any, Dict, Optional
+
+from django.apps import apps
+from django.db.models import Q
+from django.utils import timezone
+
+from .base import GraphState
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+def empty_context(state: Optional[GraphState] = None) -> Dict[str, Any]:
+    """세션이 없을 때 사용할 기본 컨텍스트"""
+    state = state or {}
+    return {
+        "url_params": {},
+        "schedule_place": None,
+        "schedule_companion": None,
+        "session_date": state.get("session_date") or timezone.localdate(),
+        "recommended_places": list(state.get("recommended_places") or []),
+    }
+
+
+def _parse_date(value) -> Optional[datetime.date]:
+    if isinstance(value, datetime.date):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.datetime.strptime(value.strip(), "%Y-%m-%d").date()
+        except ValueError:
+            return None
+    return None
+
+
+def _parse_schedule_id(value) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+async def load_message_context(
+    session_id,
+    user_id: Optional[int] = None,
+    schedule_id: Optional[int] = None,
+    fallback_date: Optional[datetime.date] = None,
+) -> Dict[str, Any]:
+    """세션과 일정 정보를 조회해 GraphState 컨텍스트 필드로 반환
+
+    세션 1회, 일정 1회(일정 ID 또는 날짜에 해당하는 일정을 한 쿼리로 조회)만
+    DB에 접근합니다.
+
+    Args:
+        session_id: 채팅 세션 ID
+        user_id: 일정 소유자 ID (없으면 세션 사용자)
+        schedule_id: 연결 시 전달된 일정 ID (없으면 세션 url_params 사용)
+        fallback_date: 세션에 날짜가 없을 때 사용할 날짜
+
+    Returns:
+        url_params, schedule_place, schedule_companion, session_date,
+        recommended_places 필드를 담은 딕셔너리
+    """
+    context = empty_context({"session_date": fallback_date})
+    if not session_id or session_id == "default_session":
+        return context
+
+    ChatSession = apps.get_model("chatbot", "ChatSession")
+    Schedule = apps.get_model("calendar_app", "Schedule")
+
+    session = (
+        await ChatSession.objects.filter(id=session_id)
+        .only("id", "user_id", "date", "url_params", "recommended_places")
+        .afirst()
+    )
+    if session is None:
+        logger.info(f"세션 {session_id}를 찾을 수 없어 기본 컨텍스트 사용")
+        return context
+
+    url_params = session.url_params if isinstance(session.url_params, dict) else {}
+    schedule_id = _parse_schedule_id(schedule_id) or _parse_schedule_id(
+        url_params.get("schedule_id")
+    )
+    session_date = (
+        session.date
+        or fallback_date
+        or _parse_date(url_params.get("date"))
+        or timezone.localdate()
+    )
+
+    context.update(
+        {
+            "url_params": url_params,
+            "session_date": session_date,
+            "recommended_places": session.get_recommended_places(),
+        }
+    )
+
+    # 일정 ID로 지정된 일정을 우선 사용하고, 없으면 세션 날짜의 일정 사용
+    owner_id = user_id or session.user_id
+    match = Q(date=session_date)
+    if schedule_id:
+        match |= Q(id=schedule_id)
+
+    schedules = [
+        schedule
+        async for schedule in Schedule.objects.filter(match, user_id=owner_id).only(
+            "id", "date", "location", "companion"
+        )
+    ]
+    schedule = next((s for s in schedules if s.id == schedule_id), None) or next(
+        (s for s in schedules if s.date == session_date), None
+    )
+
+    if schedule is not None:
+        context["schedule_place"] = schedule.location or None
+        context["schedule_companion"] = schedule.companion or None
+        logger.info(
+            f"일정 컨텍스트 로드: ID={schedule.id}, 장소={schedule.location}, "
+            f"동행자={schedule.companion}"
+        )
+    else:
+        logger.info(f"{session_date} 일정이 없어 일정 정보 없이 진행")
+
+    return context
+
+
+async def context_loader(state: GraphState) -> Dict[str, Any]:
+    """컨텍스트 로딩 노드
+
+    Args:
+        state: 현재 그래프 상태 (session_id, user_id, schedule_id, session_date 사용)
+
+    Returns:
+        세션/일정 컨텍스트 필드
+    """
+    try:
+        return await load_message_context(
+            state.get("session_id"),
+            user_id=state.get("user_id"),
+            schedule_id=state.get("schedule_id"),
+            fallback_date=_parse_date(state.get("session_date")),
+        )
+    except Exception as e:
+        logger.error(f"컨텍스트 로드 중 오류 발생: {e}")
+        return empty_context(state)
@@ -1,15 +1,23 @@
 import os
+import threading
 from typing import List, Any, Tuple
 from pathlib import Path
-import pandas as pd
 from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS
 import logging
+from vacation.circuit import get_breaker
+from vacation.metrics import timed
+from vacation.ratelimit import get_limiter
+from vacation.singleflight import SingleFlight, make_key
+from vacation.upstreams import embeddings_kwargs
 
 # 로거 설정
 logger = logging.getLogger(__name__)
 
+# 동일 텍스트에 대한 동시 임베딩 요청을 하나로 합치는 그룹
+_embedding_flight = SingleFlight("embeddings")
+
 # 싱글톤 벡터스토어 인스턴스 저장
 _event_vectorstore = None
 _general_vectorstore = None
@@ -17,6 +25,10 @@ _event_docs = None
 _general_docs = None
 _embeddings = None
 
+# 같은 데이터를 여러 스레드(워밍업, 요청 처리)가 동시에 로드하지 않도록 보호하는 락
+_embeddings_lock = threading.Lock()
+_load_locks = {"event": threading.Lock(), "general": threading.Lock()}
+
 
 # Django 설정 임포트 방식 변경
 # django.setup()를 직접 호출하지 않음 - Django 앱 내에서는 이미 설정됨
@@ -35,31 +47,43 @@ def _init_django():
         django.setup()
 
 
+class CoalescingOpenAIEmbeddings(OpenAIEmbeddings):
+    """동시에 들어온 같은 쿼리 임베딩 요청을 한 번의 API 호출로 합치는 임베딩 모델"""
+
+    def embed_query(self, text: str) -> List[float]:
+        key = make_key(self.model, text)
+        embed = timed("embedding", "query")(super().embed_query)
+        return _embedding_flight.do(key, embed, text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = make_key(self.model, text)
+        return await _embedding_flight.ado(key, self._limited_aembed_query, text)
+
+    async def _limited_aembed_query(self, text: str) -> List[float]:
+        # 비동기 임베딩은 langchain 기본 AsyncOpenAI 클라이언트(요청 훅 없음)를 쓰므로
+        # 합쳐진 요청마다 한 번 "openai" 호출 한도를 적용한 뒤 차단기를 거쳐 호출
+        await get_limiter("openai").aacquire()
+        embed = timed("embedding", "query")(super().aembed_query)
+        return await get_breaker("openai").acall(embed, text)
+
+    def embed_documents(self, texts: List[str], chunk_size=None) -> List[List[float]]:
+        with timed("embedding", "documents"):
+            return super().embed_documents(texts, chunk_size)
+
+
 # 임베딩 모델 가져오기 (싱글톤)
 def get_embeddings():
     global _embeddings
     if _embeddings is None:
-        logger.info("OpenAI 임베딩 모델 초기화")
-        _embeddings = OpenAIEmbeddings(model="text-embedding-ada-002")
+        with _embeddings_lock:
+            if _embeddings is None:
+                logger.info("OpenAI 임베딩 모델 초기화")
+                _embeddings = CoalescingOpenAIEmbeddings(
+                    model="text-embedding-ada-002", **embeddings_kwargs()
+                )
     return _embeddings
 
 
-# 벡터스토어 초기화 함수
-def initialize_vectorstores():
-    """서버 시작 시 벡터스토어를 미리 로드합니다."""
-    logger.info("벡터스토어 초기화 시작")
-    try:
-        # 이벤트 벡터스토어 로드
-        load_data("event")
-        # 일반 벡터스토어 로드
-        load_data("general")
-        logger.info("벡터스토어 초기화 완료")
-        return True
-    except Exception as e:
-        logger.error(f"벡터스토어 초기화 실패: {str(e)}")
-        return False
-
-
 def load_data(query_type: str) -> Tuple[List[Document], Any]:
     """데이터 로드 함수
 
@@ -72,6 +96,13 @@ def load_data(query_type: str) -> Tuple[List[Document], Any]:
     Returns:
         (documents, vectorstore) 튜플
     """
+    lock = _load_locks["event" if query_type == "event" else "general"]
+    with lock:
+        return _load_data(query_type)
+
+
+def _load_data(query_type: str) -> Tuple[List[Document], Any]:
+    """load_data의 실제 로드 로직 (쿼리 타입별 락을 잡은 상태에서 호출)"""
     global _event_vectorstore, _general_vectorstore, _event_docs, _general_docs
 
     # Django 모델 지연 임포트
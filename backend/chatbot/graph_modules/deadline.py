@@ -0,0 +1,83 @@
+"""메시지 단위 지연 시간 예산(deadline) 관리 모듈
+
+consumer가 메시지마다 마감 시각을 GraphState["deadline"]에 넣으면, 각 노드는
+남은 시간을 확인해 예산이 부족할 때 선택적인 비싼 작업(장소명 LLM 추출,
+네이버 재검색, LLM 구 정보 조회)을 건너뜁니다. 건너뛴 결정은 메트릭으로 남깁니다.
+"""
+
+import logging
+import math
+import time
+from typing import Dict, Optional
+
+from django.conf import settings
+
+from vacation.metrics import registry
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 기본 메시지 예산 (초, settings.CHAT_LATENCY_BUDGET으로 덮어쓸 수 있음)
+DEFAULT_LATENCY_BUDGET = 30.0
+
+# 단계별 임계값 (초): 남은 시간이 이 값보다 적으면 해당 작업을 건너뜀
+# "response_reserve"는 최종 응답 생성을 위해 검색 분기에서 남겨둘 시간
+DEFAULT_DEGRADE_THRESHOLDS = {
+    "district_lookup": 20.0,
+    "naver_retry": 15.0,
+    "place_name_extraction": 12.0,
+    "response_reserve": 8.0,
+}
+
+degradations = registry.counter(
+    "vacation_degradations_total",
+    "Optional pipeline steps skipped because the message latency budget ran low",
+)
+
+
+def get_degrade_thresholds() -> Dict[str, float]:
+    """설정값과 기본값을 합친 단계별 임계값 반환"""
+    thresholds = dict(DEFAULT_DEGRADE_THRESHOLDS)
+    thresholds.update(getattr(settings, "CHAT_DEGRADE_THRESHOLDS", {}) or {})
+    return thresholds
+
+
+def new_deadline(budget: Optional[float] = None) -> float:
+    """지금부터 budget초 뒤의 마감 시각 (time.monotonic 기준)"""
+    if budget is None:
+        budget = getattr(settings, "CHAT_LATENCY_BUDGET", DEFAULT_LATENCY_BUDGET)
+    return time.monotonic() + budget
+
+
+def remaining(state) -> float:
+    """마감까지 남은 시간 (초, 마감이 없으면 무한대)"""
+    deadline = (state or {}).get("deadline")
+    if deadline is None:
+        return math.inf
+    return deadline - time.monotonic()
+
+
+def branch_timeout(state, timeout: float) -> float:
+    """검색 분기 제한 시간을 최종 응답 생성 몫을 남기도록 조정"""
+    reserve = get_degrade_thresholds()["response_reserve"]
+    return max(min(timeout, remaining(state) - reserve), 0.0)
+
+
+def should_degrade(state, step: str) -> bool:
+    """남은 예산이 부족해 step 작업을 건너뛰어야 하는지 판단
+
+    건너뛰는 경우 로그와 vacation_degradations_total{step=...} 메트릭을 남깁니다.
+    """
+    threshold = get_degrade_thresholds().get(step)
+    if threshold is None:
+        return False
+
+    left = remaining(state)
+    if left >= threshold:
+        return False
+
+    degradations.inc(step=step)
+    logger.warning(
+        f"지연 예산 부족으로 '{step}' 건너뜀 (남은 시간 {left:.1f}초 < {threshold}초)"
+    )
+    return True
@@ -128,4 +128,33 @@ seoul_districts = {
         "상봉1동", "상봉2동", "중화1동", "중화2동",
         "묵1동", "묵2동", "신내1동", "신내2동", "망우본동"
     ]
-}
\ No newline at end of file
+}
+
+# 구청 위치 (위도, 경도) - 구 단위 날씨 예보 격자 변환 등에 사용
+seoul_district_coordinates = {
+    "강남구": (37.5172, 127.0473),
+    "강동구": (37.5301, 127.1238),
+    "강북구": (37.6396, 127.0257),
+    "강서구": (37.5509, 126.8495),
+    "관악구": (37.4784, 126.9516),
+    "광진구": (37.5385, 127.0823),
+    "구로구": (37.4954, 126.8874),
+    "금천구": (37.4569, 126.8955),
+    "노원구": (37.6542, 127.0568),
+    "도봉구": (37.6688, 127.0471),
+    "동대문구": (37.5744, 127.0400),
+    "동작구": (37.5124, 126.9393),
+    "마포구": (37.5663, 126.9019),
+    "서대문구": (37.5791, 126.9368),
+    "서초구": (37.4837, 127.0324),
+    "성동구": (37.5633, 127.0371),
+    "성북구": (37.5894, 127.0167),
+    "송파구": (37.5145, 127.1066),
+    "양천구": (37.5170, 126.8665),
+    "영등포구": (37.5264, 126.8962),
+    "용산구": (37.5324, 126.9900),
+    "은평구": (37.6027, 126.9291),
+    "종로구": (37.5735, 126.9790),
+    "중구": (37.5641, 126.9979),
+    "중랑구": (37.6066, 127.0927),
+}
@@ -1,7 +1,6 @@
 import os
 import time
 import re
-import numpy as np
 from pathlib import Path
 from langchain_openai import OpenAIEmbeddings
 from dotenv import load_dotenv
@@ -12,20 +11,36 @@ from typing import List, Dict, Any, Tuple
 import logging
 from django.apps import apps
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from channels.db import database_sync_to_async
 from datetime import datetime
+from django.conf import settings
 
 # 위치 에이전트 모듈 가져오기
-from .location_agent import get_place_info
+from .location_agent import aget_place_info
+from .deadline import should_degrade
 
 # 로거 설정
 logger = logging.getLogger(__name__)
 
+# 문서 필터링/BM25 점수 계산 같은 CPU 작업 전용 스레드 풀
+# (ORM용 sync_to_async 스레드나 이벤트 루프를 점유하지 않도록 분리)
+_scoring_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "CHAT_SCORING_WORKERS", 4),
+    thread_name_prefix="rag-scoring",
+)
+
+
+async def run_cpu_bound(func, *args):
+    """CPU 작업을 점수 계산 전용 스레드 풀에서 실행"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_scoring_executor, func, *args)
+
 # 환경 변수 로드
 load_dotenv()
 
 
-def hybrid_retriever(state: GraphState) -> GraphState:
+async def hybrid_retriever(state: GraphState) -> GraphState:
     """하이브리드 검색 노드
 
     벡터 검색과 키워드 필터링을 결합하여 검색 결과를 제공합니다.
@@ -36,7 +51,7 @@ def hybrid_retriever(state: GraphState) -> GraphState:
         state: 현재 그래프 상태
 
     Returns:
-        업데이트된 그래프 상태
+        변경된 상태 필드 (naver_search와 병렬 실행되므로 전체 상태를 반환하지 않음)
     """
     logger.info("=== 하이브리드 검색 시작 ===")
     start_time = time.time()
@@ -49,76 +64,16 @@ def hybrid_retriever(state: GraphState) -> GraphState:
     session_id = state.get("session_id", "default_session")
     logger.info(f"현재 세션 ID: {session_id}")
 
-    # 세션 객체 가져오기
     ChatSession = apps.get_model("chatbot", "ChatSession")
-    ChatMessage = apps.get_model("chatbot", "ChatMessage")
-
-    # 장소 및 동행자 정보 초기화
-    schedule_place = None
-    schedule_companion = None
-    date_from_session = None
-    recommended_places = []
-
-    # 세션에서 날짜 정보 가져오기 시도
-    try:
-        if session_id and session_id != "default_session":
-            session = ChatSession.objects.filter(id=session_id).first()
-
-            if session:
-                # 세션에서 URL 파라미터 정보 확인
-                url_params = (
-                    session.url_params if hasattr(session, "url_params") else None
-                )
-                logger.info(f"세션에서 가져온 URL 파라미터: {url_params}")
-
-                # 일정 ID를 우선적으로 사용하여 일정 정보 가져오기
-                if (
-                    url_params
-                    and isinstance(url_params, dict)
-                    and "schedule_id" in url_params
-                ):
-                    schedule_id = url_params.get("schedule_id")
-                    logger.info(f"URL 파라미터에서 가져온 일정 ID: {schedule_id}")
-
-                    # 일정 ID로 일정 조회
-                    if schedule_id:
-                        logger.info(f"일정 ID로 조회 함수 호출: ID = {schedule_id}")
-                        try:
-                            # 일정 ID로 일정 조회 함수 임포트
-                            from calendar_app.get_schedule_info import (
-                                get_schedule_by_id,
-                            )
 
-                            schedule_place, schedule_companion = get_schedule_by_id(
-                                schedule_id
-                            )
-                            logger.info(
-                                f"일정 ID에서 가져온 장소 정보: {schedule_place}"
-                            )
-                            logger.info(
-                                f"일정 ID에서 가져온 동행자 정보: {schedule_companion}"
-                            )
-                        except Exception as e:
-                            logger.error(f"일정 ID 기반 정보 조회 중 오류 발생: {e}")
-
-                # 데이터베이스에서 세션의 추천 장소 목록 가져오기
-                recommended_places = (
-                    session.get_recommended_places()
-                    if hasattr(session, "get_recommended_places")
-                    else []
-                )
-                logger.info(
-                    f"데이터베이스에서 가져온 이전에 추천한 장소 수: {len(recommended_places)}"
-                )
-            else:
-                logger.info(
-                    f"세션 {session_id}를 찾을 수 없어 빈 추천 목록을 사용합니다."
-                )
-        else:
-            # 세션 정보가 없는 경우 빈 목록 사용
-            logger.info("세션 ID가 없어 빈 추천 목록을 사용합니다.")
-    except Exception as e:
-        logger.error(f"세션 정보 로드 중 오류 발생: {e}")
+    # 세션/일정 컨텍스트는 context_loader가 미리 불러온 값 사용
+    schedule_place = state.get("schedule_place")
+    schedule_companion = state.get("schedule_companion")
+    recommended_places = list(state.get("recommended_places") or [])
+    logger.info(
+        f"일정 장소: {schedule_place}, 동행자: {schedule_companion}, "
+        f"이전에 추천한 장소 수: {len(recommended_places)}"
+    )
 
     # 가중치 설정
     vector_weight = 0.6  # RAG_minor_sep.py와 같은 값으로 변경
@@ -134,7 +89,7 @@ def hybrid_retriever(state: GraphState) -> GraphState:
     # 쿼리가 없는 경우 검색 건너뛰기
     if not question and not schedule_place:
         logger.warning("쿼리와 일정 장소 정보가 모두 비어있어 검색을 건너뜁니다.")
-        return {**state, "retrieved_docs": [], "recommended_places": recommended_places}
+        return {"retrieved_docs": [], "recommended_places": recommended_places}
 
     # 카테고리 정보 추출
     district = query_info.get("district")
@@ -146,7 +101,7 @@ def hybrid_retriever(state: GraphState) -> GraphState:
 
     # 데이터 로드 - 싱글톤 패턴 적용으로 각 요청마다 데이터를 새로 로드하지 않음
     query_type = "event" if is_event else "general"
-    docs, vectorstore = load_data(query_type)
+    docs, vectorstore = await database_sync_to_async(load_data)(query_type)
 
     # 로드된 문서 수 로깅
     logger.debug(f"로드된 문서 수: {len(docs)}")
@@ -429,7 +384,7 @@ def hybrid_retriever(state: GraphState) -> GraphState:
         return min(score, 1.0), found_keyword_types  # 최대 점수는 1.0
     
     # 벡터 점수 계산 함수 (RAG_minor_sep.py의 _calculate_vector_scores 함수와 유사하게 구현)
-    def calculate_vector_scores(query: str, filtered_docs: List) -> List[float]:
+    async def calculate_vector_scores(query: str, filtered_docs: List) -> List[float]:
         """벡터 유사도 점수 계산"""
         try:
             start_time = time.time()
@@ -437,13 +392,8 @@ def hybrid_retriever(state: GraphState) -> GraphState:
             # 모든 문서에 대해 직접 유사도 계산 (제한 없음)
             logger.info(f"직접 벡터 유사도 계산 수행 (문서 {len(filtered_docs)}개)")
             
-            # 효율적인 계산을 위한 최적화 - 별도 API 호출 최소화
-            query_embedding = np.array(
-                vectorstore.embedding_function.embed_query(query)
-            ).reshape(1, -1)
-            
-            # 모든 문서에 대해 직접 검색 수행
-            vectors = vectorstore.similarity_search_with_score(
+            # 모든 문서에 대해 직접 검색 수행 (쿼리 임베딩은 비동기 API로 한 번만 요청)
+            vectors = await vectorstore.asimilarity_search_with_score(
                 query, k=len(filtered_docs)
             )
             
@@ -502,7 +452,98 @@ def hybrid_retriever(state: GraphState) -> GraphState:
             )
 
     # 문서 관련성 계산 함수 (RAG_minor_sep.py의 get_relevant_documents 함수와 유사하게 구현)
-    def get_relevant_documents(query: str, recommended_places: List[str] = []) -> List:
+    def filter_documents(
+        extracted_district: str, extracted_category: str, recommended_places: List[str]
+    ) -> Tuple[List, List]:
+        """구 이름, 마이너 키워드, 추천 이력으로 후보 문서 필터링 (CPU 작업)
+
+        Returns:
+            (구 기반 필터링 결과, 추천 이력까지 반영한 최종 후보) 튜플
+        """
+        # 1단계: 구 이름으로 필터링
+        district_filtered_docs = []
+        for doc in docs:
+            content = doc.page_content
+            if extracted_district in content:
+                district_filtered_docs.append(doc)
+
+        logger.info(
+            f"   - 구 이름으로 필터링된 문서 수: {len(district_filtered_docs)}개"
+        )
+
+        if len(district_filtered_docs) == 0:
+            return [], []
+
+        # 2단계: 마이너 키워드로 필터링 (이벤트가 아닐 때만)
+        filtered_docs = district_filtered_docs
+        if extracted_category not in ["전시", "공연", "콘서트"]:
+            minor_filtered_docs = []
+            for doc in district_filtered_docs:
+                content = doc.page_content.lower()
+                has_minor_keyword = False
+                found_keywords = []
+                for keyword_type, keywords in minor_keyword_groups.items():
+                    if any(keyword in content for keyword in keywords):
+                        has_minor_keyword = True
+                        found_keywords.append(keyword_type)
+                if has_minor_keyword:
+                    minor_filtered_docs.append(doc)
+
+            logger.info(
+                f"   - 마이너 키워드로 필터링 후 문서 수: {len(minor_filtered_docs)}개"
+            )
+            if len(minor_filtered_docs) >= 3:  # 충분한 결과가 있을 때만 적용
+                filtered_docs = minor_filtered_docs
+            else:
+                logger.info(
+                    "   - 마이너 키워드가 포함된 문서를 충분히 찾지 못했습니다. 구 기반 필터링 결과로 계속 진행합니다."
+                )
+
+        # 3단계: 이미 추천한 장소 필터링
+        logger.info("\n추천 이력 기반 필터링 중...")
+        non_recommended_docs = []
+        excluded_count = 0
+
+        for doc in filtered_docs:
+            # 장소 식별자 생성
+            place_id = doc.metadata.get("id", "")
+            place_name = doc.metadata.get("name", "")
+            place_identifier = ""
+
+            if place_id and place_name:
+                place_identifier = f"{place_id}:{place_name}"
+            elif place_id:
+                place_identifier = place_id
+            elif place_name:
+                place_identifier = place_name
+            else:
+                # 콘텐츠 해시의 일부 사용
+                place_identifier = str(hash(doc.page_content))[:10]
+
+            # 이미 추천한 장소인지 확인
+            if place_identifier not in recommended_places:
+                non_recommended_docs.append(doc)
+            else:
+                excluded_count += 1
+
+        logger.info(
+            f"   - 이미 추천된 {excluded_count}개 장소 제외 후 {len(non_recommended_docs)}개 문서 남음"
+        )
+
+        # 필터링된 문서가 3개 미만인 경우 경고
+        if len(non_recommended_docs) < 3:
+            logger.warning("   - 경고: 추천할 새로운 장소가 3개 미만입니다.")
+
+        # 필터링된 문서가 없으면 구 기반 필터링 결과 사용
+        if len(non_recommended_docs) == 0:
+            logger.info("   - 추천할 새로운 장소가 없어 구 기반 필터링 결과 사용")
+            non_recommended_docs = district_filtered_docs
+
+        return district_filtered_docs, non_recommended_docs
+
+    async def get_relevant_documents(
+        query: str, recommended_places: List[str] = []
+    ) -> List:
         """최종적으로 검색된 문서들을 키워드 스코어까지 반영하여 정렬"""
         search_start = time.time()
         logger.info("\n=== 검색 프로세스 시작 ===")
@@ -513,7 +554,11 @@ def hybrid_retriever(state: GraphState) -> GraphState:
         extracted_category = extract_category(query)
 
         # 위치 에이전트를 사용하여 장소 기반 구 정보 추출
-        place_info = get_place_info(query)
+        # (지연 예산이 부족하면 LLM 대신 쿼리 분석 단계의 규칙 기반 구 정보 사용)
+        if should_degrade(state, "district_lookup"):
+            place_info = {"place": None, "district": district}
+        else:
+            place_info = await aget_place_info(query)
         place_name = place_info.get("place")
         agent_district = place_info.get("district")
 
@@ -526,87 +571,21 @@ def hybrid_retriever(state: GraphState) -> GraphState:
             keyword_start = time.time()
             logger.info("\n4. 키워드 기반 필터링 중...")
 
-            # 1단계: 구 이름으로 필터링
-            district_filtered_docs = []
-            for doc in docs:
-                content = doc.page_content
-                if extracted_district in content:
-                    district_filtered_docs.append(doc)
-
-            logger.info(
-                f"   - 구 이름으로 필터링된 문서 수: {len(district_filtered_docs)}개"
+            district_filtered_docs, non_recommended_docs = await run_cpu_bound(
+                filter_documents,
+                extracted_district,
+                extracted_category,
+                recommended_places,
             )
 
             if len(district_filtered_docs) == 0:
                 logger.info(
                     "   - 구 관련 문서를 찾지 못했습니다. 일반 벡터 검색을 수행합니다."
                 )
-                return vectorstore.similarity_search(query, k=3)
-
-            # 2단계: 마이너 키워드로 필터링 (이벤트가 아닐 때만)
-            filtered_docs = district_filtered_docs
-            if extracted_category not in ["전시", "공연", "콘서트"]:
-                minor_filtered_docs = []
-                for doc in district_filtered_docs:
-                    content = doc.page_content.lower()
-                    has_minor_keyword = False
-                    found_keywords = []
-                    for keyword_type, keywords in minor_keyword_groups.items():
-                        if any(keyword in content for keyword in keywords):
-                            has_minor_keyword = True
-                            found_keywords.append(keyword_type)
-                    if has_minor_keyword:
-                        minor_filtered_docs.append(doc)
-
-                logger.info(
-                    f"   - 마이너 키워드로 필터링 후 문서 수: {len(minor_filtered_docs)}개"
-                )
-                if len(minor_filtered_docs) >= 3:  # 충분한 결과가 있을 때만 적용
-                    filtered_docs = minor_filtered_docs
-                else:
-                    logger.info(
-                        "   - 마이너 키워드가 포함된 문서를 충분히 찾지 못했습니다. 구 기반 필터링 결과로 계속 진행합니다."
-                    )
-
-            # 3단계: 이미 추천한 장소 필터링
-            logger.info("\n추천 이력 기반 필터링 중...")
-            non_recommended_docs = []
-            excluded_count = 0
-
-            for doc in filtered_docs:
-                # 장소 식별자 생성
-                place_id = doc.metadata.get("id", "")
-                place_name = doc.metadata.get("name", "")
-                place_identifier = ""
-
-                if place_id and place_name:
-                    place_identifier = f"{place_id}:{place_name}"
-                elif place_id:
-                    place_identifier = place_id
-                elif place_name:
-                    place_identifier = place_name
-                else:
-                    # 콘텐츠 해시의 일부 사용
-                    place_identifier = str(hash(doc.page_content))[:10]
-
-                # 이미 추천한 장소인지 확인
-                if place_identifier not in recommended_places:
-                    non_recommended_docs.append(doc)
-                else:
-                    excluded_count += 1
-
-            logger.info(
-                f"   - 이미 추천된 {excluded_count}개 장소 제외 후 {len(non_recommended_docs)}개 문서 남음"
-            )
-
-            # 필터링된 문서가 3개 미만인 경우 경고
-            if len(non_recommended_docs) < 3:
-                logger.warning("   - 경고: 추천할 새로운 장소가 3개 미만입니다.")
-
-            # 필터링된 문서가 없으면 구 기반 필터링 결과 사용
-            if len(non_recommended_docs) == 0:
-                logger.info("   - 추천할 새로운 장소가 없어 구 기반 필터링 결과 사용")
-                non_recommended_docs = district_filtered_docs
+                basic_results = await vectorstore.asimilarity_search(query, k=3)
+                return basic_results, [
+                    str(hash(doc.page_content))[:10] for doc in basic_results
+                ]
 
             # 4. 하이브리드 점수 계산
             scoring_start = time.time()
@@ -614,11 +593,13 @@ def hybrid_retriever(state: GraphState) -> GraphState:
 
             # 벡터 유사도 점수 계산
             logger.info("   - 벡터 점수 계산 중...")
-            vector_scores = calculate_vector_scores(query, non_recommended_docs)
+            vector_scores = await calculate_vector_scores(query, non_recommended_docs)
 
-            # 키워드 매칭 점수 계산
+            # 키워드 매칭 점수 계산 (BM25는 CPU 작업이므로 전용 스레드 풀에서 실행)
             logger.info("   - 키워드 점수 계산 중...")
-            keyword_scores = calculate_keyword_scores(query, non_recommended_docs)
+            keyword_scores = await run_cpu_bound(
+                calculate_keyword_scores, query, non_recommended_docs
+            )
 
             # 최종 점수 계산 (가중 평균)
             final_scores = [
@@ -683,7 +664,7 @@ def hybrid_retriever(state: GraphState) -> GraphState:
             return top_results, new_recommended_places
 
         logger.info("   - 구 이름이 감지되지 않았습니다. 일반 벡터 검색을 수행합니다.")
-        basic_results = vectorstore.similarity_search(query, k=3)
+        basic_results = await vectorstore.asimilarity_search(query, k=3)
         new_recommended_places = [
             str(hash(doc.page_content))[:10] for doc in basic_results
         ]
@@ -702,18 +683,17 @@ def hybrid_retriever(state: GraphState) -> GraphState:
     logger.info(f"생성된 향상된 쿼리: '{enhanced_query}'")
 
     # RAG_minor_sep.py 스타일의 get_relevant_documents 함수 사용하여 검색 수행
-    retrieved_docs, new_recommended_places = get_relevant_documents(
+    retrieved_docs, new_recommended_places = await get_relevant_documents(
         enhanced_query, recommended_places
     )
 
     # 세션에 새로 추가된 장소들을 저장
     if session_id and session_id != "default_session" and new_recommended_places:
         try:
-            session = ChatSession.objects.filter(id=session_id).first()
-            if session and hasattr(session, "add_recommended_place"):
-                # 새로 추천된 장소 추가
-                for place in new_recommended_places:
-                    session.add_recommended_place(place)
+            session = await ChatSession.objects.filter(id=session_id).afirst()
+            if session and hasattr(session, "aadd_recommended_places"):
+                # 새로 추천된 장소를 한 번에 추가
+                await session.aadd_recommended_places(new_recommended_places)
                 logger.info(
                     f"세션 {session_id}에 {len(new_recommended_places)}개의 새로운 장소가 저장되었습니다."
                 )
@@ -737,7 +717,6 @@ def hybrid_retriever(state: GraphState) -> GraphState:
     logger.info(f"현재까지 추천한 장소 수: {len(all_recommended_places)}")
 
     return {
-        **state,
         "retrieved_docs": retrieved_docs,
         "recommended_places": all_recommended_places,
     }
@@ -9,10 +9,49 @@ import json
 from typing import Optional, Dict, Any, Tuple
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
+from vacation.circuit import get_breaker
+from vacation.metrics import timed
+from vacation.singleflight import SingleFlight, make_key
+from vacation.upstreams import chat_model_kwargs
 
 # 환경 변수 로드
 load_dotenv()
 
+# 위치 에이전트에서 사용하는 LLM 모델
+LOCATION_AGENT_MODEL = "o3-mini"
+
+# 같은 프롬프트로 동시에 들어온 LLM 호출을 하나로 합치는 그룹
+_llm_flight = SingleFlight("location_agent_llm")
+
+
+def _invoke_llm(prompt: str, api_key: str) -> str:
+    """프롬프트 해시 단위로 중복 호출을 합쳐 LLM을 동기 호출"""
+    llm = ChatOpenAI(
+        model=LOCATION_AGENT_MODEL, api_key=api_key, **chat_model_kwargs()
+    )
+    key = make_key(LOCATION_AGENT_MODEL, prompt)
+
+    def call():
+        with timed("llm", "location_agent"):
+            return llm.invoke(prompt).content
+
+    # OpenAI 차단기가 열려 있으면 CircuitOpenError (호출 측에서 기본값 사용)
+    return _llm_flight.do(key, get_breaker("openai").call, call)
+
+
+async def _ainvoke_llm(prompt: str, api_key: str) -> str:
+    """프롬프트 해시 단위로 중복 호출을 합쳐 LLM을 비동기 호출"""
+    llm = ChatOpenAI(
+        model=LOCATION_AGENT_MODEL, api_key=api_key, **chat_model_kwargs()
+    )
+    key = make_key(LOCATION_AGENT_MODEL, prompt)
+
+    async def call():
+        with timed("llm", "location_agent"):
+            return (await llm.ainvoke(prompt)).content
+
+    return await _llm_flight.ado(key, get_breaker("openai").acall, call)
+
 
 def extract_district_from_place(query: str) -> Optional[str]:
     """
@@ -31,9 +70,6 @@ def extract_district_from_place(query: str) -> Optional[str]:
             print("OpenAI API 키가 설정되지 않았습니다.")
             return None
 
-        # LLM 모델 초기화
-        llm = ChatOpenAI(model="o3-mini", api_key=api_key)
-
         # LLM에게 전달할 프롬프트
         prompt = f"""
         아래 텍스트에서 장소 이름을 추출하고, 그 장소가 서울의 어느 구에 속하는지 알려주세요.
@@ -57,7 +93,7 @@ def extract_district_from_place(query: str) -> Optional[str]:
         """
 
         # LLM 호출
-        response = llm.invoke(prompt).content
+        response = _invoke_llm(prompt, api_key)
         print(f"LLM 응답: {response}")
 
         # JSON 파싱
@@ -78,24 +114,9 @@ def extract_district_from_place(query: str) -> Optional[str]:
         return None
 
 
-def get_place_info(query: str) -> Dict[str, Any]:
-    """
-    텍스트에서 장소와 구 정보를 모두 추출
-
-    Args:
-        query: 사용자 쿼리
-
-    Returns:
-        장소와 구 정보를 포함하는 딕셔너리
-    """
-    try:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            return {"place": None, "district": None}
-
-        llm = ChatOpenAI(model="o3-mini", api_key=api_key)
-
-        prompt = f"""
+def _place_info_prompt(query: str) -> str:
+    """장소/구 정보 추출 프롬프트 생성"""
+    return f"""
         아래 텍스트에서 장소 이름을 추출하고, 그 장소가 서울의 어느 구에 속하는지 알려주세요.
         결과는 JSON 형식으로 반환해주세요. 장소가 없거나 구를 특정할 수 없으면 null을 반환하세요.
         
@@ -116,39 +137,55 @@ def get_place_info(query: str) -> Dict[str, Any]:
         가능한 서울시 구 목록: 종로구, 중구, 용산구, 성동구, 광진구, 동대문구, 중랑구, 성북구, 강북구, 도봉구, 노원구, 은평구, 서대문구, 마포구, 양천구, 강서구, 구로구, 금천구, 영등포구, 동작구, 관악구, 서초구, 강남구, 송파구, 강동구
         """
 
-        response = llm.invoke(prompt).content
-
-        try:
-            result = json.loads(response)
-            return {"place": result.get("place"), "district": result.get("district")}
-        except json.JSONDecodeError:
-            return {"place": None, "district": None}
 
-    except Exception:
+def _parse_place_info(response: str) -> Dict[str, Any]:
+    """장소/구 정보 추출 응답 파싱"""
+    try:
+        result = json.loads(response)
+        return {"place": result.get("place"), "district": result.get("district")}
+    except json.JSONDecodeError:
         return {"place": None, "district": None}
 
 
-def extract_location_and_category(query: str) -> Dict[str, str]:
+def get_place_info(query: str) -> Dict[str, Any]:
     """
-    쿼리에서 장소와 카테고리만 추출하여 간결한 검색어 생성
+    텍스트에서 장소와 구 정보를 모두 추출
 
     Args:
-        query: 사용자 쿼리 (예: "신촌역 데이트하기 좋은 맛집 추천해줘")
+        query: 사용자 쿼리
 
     Returns:
-        간결한 검색어 (예: "신촌역 맛집")와 추출된 정보를 포함한 딕셔너리
+        장소와 구 정보를 포함하는 딕셔너리
     """
     try:
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
-            print("OpenAI API 키가 설정되지 않았습니다.")
-            return {"simplified_query": query, "location": None, "category": None}
+            return {"place": None, "district": None}
 
-        # LLM 모델 초기화
-        llm = ChatOpenAI(model="o3-mini", api_key=api_key)
+        response = _invoke_llm(_place_info_prompt(query), api_key)
+        return _parse_place_info(response)
 
-        # LLM에게 전달할 프롬프트
-        prompt = f"""
+    except Exception:
+        return {"place": None, "district": None}
+
+
+async def aget_place_info(query: str) -> Dict[str, Any]:
+    """get_place_info의 비동기 버전"""
+    try:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            return {"place": None, "district": None}
+
+        response = await _ainvoke_llm(_place_info_prompt(query), api_key)
+        return _parse_place_info(response)
+
+    except Exception:
+        return {"place": None, "district": None}
+
+
+def _location_category_prompt(query: str) -> str:
+    """장소/카테고리 추출 프롬프트 생성"""
+    return f"""
         아래 쿼리에서 장소명과 카테고리(예: 맛집, 카페, 전시, 공연 등)만 추출해주세요.
         추출한 정보를 바탕으로 "장소명 카테고리" 형태의 간결한 검색어를 만들어주세요.
         
@@ -170,30 +207,67 @@ def extract_location_and_category(query: str) -> Dict[str, str]:
         장소명이나 카테고리가 없으면 null로 표시하고, simplified_query는 있는 정보만으로 구성하세요.
         """
 
+
+def _parse_location_category(response: str, query: str) -> Dict[str, str]:
+    """장소/카테고리 추출 응답 파싱"""
+    print(f"LLM 검색어 간소화 응답: {response}")
+
+    try:
+        result = json.loads(response)
+        simplified_query = result.get("simplified_query", query)
+        location = result.get("location")
+        category = result.get("category")
+
+        print(
+            f"간소화된 검색어: '{simplified_query}' (장소: {location}, 카테고리: {category})"
+        )
+        return {
+            "simplified_query": simplified_query,
+            "location": location,
+            "category": category,
+        }
+
+    except json.JSONDecodeError:
+        print("LLM 응답을 JSON으로 파싱할 수 없습니다.")
+        return {"simplified_query": query, "location": None, "category": None}
+
+
+def extract_location_and_category(query: str) -> Dict[str, str]:
+    """
+    쿼리에서 장소와 카테고리만 추출하여 간결한 검색어 생성
+
+    Args:
+        query: 사용자 쿼리 (예: "신촌역 데이트하기 좋은 맛집 추천해줘")
+
+    Returns:
+        간결한 검색어 (예: "신촌역 맛집")와 추출된 정보를 포함한 딕셔너리
+    """
+    try:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            print("OpenAI API 키가 설정되지 않았습니다.")
+            return {"simplified_query": query, "location": None, "category": None}
+
         # LLM 호출
-        response = llm.invoke(prompt).content
-        print(f"LLM 검색어 간소화 응답: {response}")
+        response = _invoke_llm(_location_category_prompt(query), api_key)
+        return _parse_location_category(response, query)
 
-        # JSON 파싱
-        try:
-            result = json.loads(response)
-            simplified_query = result.get("simplified_query", query)
-            location = result.get("location")
-            category = result.get("category")
-
-            print(
-                f"간소화된 검색어: '{simplified_query}' (장소: {location}, 카테고리: {category})"
-            )
-            return {
-                "simplified_query": simplified_query,
-                "location": location,
-                "category": category,
-            }
+    except Exception as e:
+        print(f"검색어 간소화 중 오류 발생: {e}")
+        return {"simplified_query": query, "location": None, "category": None}
 
-        except json.JSONDecodeError:
-            print("LLM 응답을 JSON으로 파싱할 수 없습니다.")
+
+async def aextract_location_and_category(query: str) -> Dict[str, str]:
+    """extract_location_and_category의 비동기 버전"""
+    try:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            print("OpenAI API 키가 설정되지 않았습니다.")
             return {"simplified_query": query, "location": None, "category": None}
 
+        response = await _ainvoke_llm(_location_category_prompt(query), api_key)
+        return _parse_location_category(response, query)
+
     except Exception as e:
         print(f"검색어 간소화 중 오류 발생: {e}")
         return {"simplified_query": query, "location": None, "category": None}
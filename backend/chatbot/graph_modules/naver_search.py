@@ -5,52 +5,56 @@ import urllib.request
 from .base import GraphState
 from dotenv import load_dotenv
 from pathlib import Path
-from typing import Dict, Any, List
-from .location_agent import extract_location_and_category
-from django.apps import apps
+from typing import Dict, Any, List, Optional, Tuple
+from .location_agent import aextract_location_and_category
+from .deadline import should_degrade
 import asyncio
-from channels.db import database_sync_to_async
 from functools import wraps
 import re
-import aiohttp
 import logging
 from .data_loader import load_data
 from langchain_openai import OpenAIEmbeddings
+from vacation.http_client import get_client_session
+from vacation.circuit import CircuitOpenError, get_breaker, record_fallback
+from vacation.ratelimit import get_limiter, is_retryable_status
+from vacation.metrics import timed
+from vacation.singleflight import SingleFlight, make_key
+from vacation.swr_cache import SWRCache
+from django.conf import settings
+from vacation.upstreams import naver_api_url
 
 # 로거 설정
 logger = logging.getLogger(__name__)
 
+# 네이버 지역 검색 API 주소
+NAVER_LOCAL_SEARCH_URL = naver_api_url("/v1/search/local.json")
 
-# .env 파일 로드
-load_dotenv()
+# 최종적으로 선택할 장소 수 (병합 결과가 이보다 적으면 다음 페이지 검색)
+NAVER_SEARCH_MIN_RESULTS = 3
 
-# 환경 변수 확인
-naver_client_id = os.getenv("NAVER_CLIENT_ID")
-naver_client_secret = os.getenv("NAVER_CLIENT_SECRET")
+# 이 이름이 들어간 장소는 서울 지역으로 간주 (검색어에 '서울'을 붙이지 않음)
+SEOUL_REGION_HINTS = ["서울", "강남", "종로", "마포", "홍대"]
 
+# 같은 검색어로 동시에 들어온 네이버 검색 요청을 하나로 합치는 그룹
+_naver_flight = SingleFlight("naver_local_search")
 
-# 세션에서 URL 파라미터를 가져오는 함수 (비동기 처리를 위해 별도로 분리)
-@database_sync_to_async
-def get_session_params(session_id):
-    """
-    세션 ID로부터 URL 파라미터를 비동기적으로 가져오는 함수
+# 정규화된 검색어/파라미터별 네이버 검색 결과 캐시 (성공 응답만 저장)
+_naver_cache = SWRCache(
+    "naver_local_search",
+    ttl=settings.NAVER_CACHE_TTL,
+    stale_ttl=settings.NAVER_CACHE_STALE_TTL,
+    maxsize=settings.NAVER_CACHE_MAXSIZE,
+    backend=settings.NAVER_CACHE_BACKEND,
+    should_cache=lambda result: result[0] == 200,
+)
 
-    Args:
-        session_id: 채팅 세션 ID
 
-    Returns:
-        dict: URL 파라미터 딕셔너리 또는 None
-    """
-    try:
-        ChatSession = apps.get_model("chatbot", "ChatSession")
-        session = ChatSession.objects.filter(id=session_id).first()
+# .env 파일 로드
+load_dotenv()
 
-        if session and hasattr(session, "url_params"):
-            return session.url_params
-        return None
-    except Exception as e:
-        print(f"URL 파라미터 로드 중 오류 발생: {e}")
-        return None
+# 환경 변수 확인
+naver_client_id = os.getenv("NAVER_CLIENT_ID")
+naver_client_secret = os.getenv("NAVER_CLIENT_SECRET")
 
 
 # 위치 정보를 날씨 API에 적합한 형태로 변환
@@ -125,48 +129,6 @@ def convert_location_for_weather(location):
     return location
 
 
-# get_schedule_info 함수를 비동기적으로 호출하기 위한 래퍼 함수
-@database_sync_to_async
-def get_schedule_info_async(date_str):
-    """
-    일정 정보를 비동기적으로 가져오는 함수
-
-    Args:
-        date_str: 날짜 문자열
-
-    Returns:
-        (장소, 동행자) 튜플
-    """
-    try:
-        from calendar_app.get_schedule_info import get_schedule_info
-
-        return get_schedule_info(date_str)
-    except Exception as e:
-        print(f"일정 정보 비동기 로드 중 오류 발생: {e}")
-        return None, None
-
-
-# ID로 일정 정보를 비동기적으로 가져오는 래퍼 함수 추가
-@database_sync_to_async
-def get_schedule_by_id_async(schedule_id):
-    """
-    ID로 일정 정보를 비동기적으로 가져오는 함수
-
-    Args:
-        schedule_id: 일정 ID
-
-    Returns:
-        (장소, 동행자) 튜플
-    """
-    try:
-        from calendar_app.get_schedule_info import get_schedule_by_id
-
-        return get_schedule_by_id(schedule_id)
-    except Exception as e:
-        print(f"ID로 일정 정보 비동기 로드 중 오류 발생: {e}")
-        return None, None
-
-
 # 일정 정보와 채팅 내용을 통합한 향상된 쿼리 생성 함수 (hybrid_retriever와 동일한 방식)
 def generateQuery(question, place, companion):
     """
@@ -227,6 +189,181 @@ def generateQuery(question, place, companion):
     return enhanced_query
 
 
+@timed("http", "naver_local_search")
+async def _request_local_search(params: Dict[str, str]):
+    """네이버 지역 검색 API 호출
+
+    Returns:
+        (상태 코드, 응답 JSON 또는 None) 튜플
+    """
+    headers = {
+        "X-Naver-Client-Id": naver_client_id,
+        "X-Naver-Client-Secret": naver_client_secret,
+    }
+    # 연결 풀을 공유하는 공용 세션 사용 (keep-alive, DNS 캐시)
+    session = get_client_session()
+    async with session.get(
+        NAVER_LOCAL_SEARCH_URL, headers=headers, params=params
+    ) as response:
+        if response.status != 200:
+            return response.status, None
+        return response.status, await response.json()
+
+
+async def _limited_local_search(params: Dict[str, str]):
+    """호출 한도/일일 할당량을 지키며 차단기를 거쳐 검색 (429/5xx는 백오프 후 재시도)
+
+    차단기는 실제 요청만 감싸므로 토큰 대기와 한도 초과, 백오프 대기는
+    네이버 API 실패나 느린 호출로 세지 않습니다.
+    """
+    return await get_limiter("naver").acall(
+        get_breaker("naver").acall,
+        _request_local_search,
+        params,
+        status_of=lambda result: result[0],
+        is_failure=lambda result: is_retryable_status(result[0]),
+    )
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 검색어 정규화 (공백 정리, 소문자)"""
+    return " ".join((query or "").split()).lower()
+
+
+async def fetch_local_search(params: Dict[str, str]):
+    """네이버 지역 검색 수행
+
+    정규화된 검색어와 파라미터를 키로 결과를 캐시하고, 캐시에 없는 동일한
+    검색의 동시 요청은 하나로 합칩니다. 네이버 API 차단기가 열려 있으면
+    캐시에 남은 마지막 결과를 반환합니다.
+    """
+    params = {**params, "query": normalize_query(params.get("query"))}
+    key = make_key(sorted(params.items()))
+
+    async def fetch():
+        # 동시 요청을 합친 뒤 호출 한도 -> 차단기 -> 요청 순으로 실행
+        # (연속 실패/지연 시 차단기가 열려 호출 없이 CircuitOpenError 발생)
+        return await _naver_flight.ado(key, _limited_local_search, params)
+
+    try:
+        return await _naver_cache.aget_or_fetch(key, fetch)
+    except CircuitOpenError:
+        # 차단기가 열려 있으면 만료됐더라도 마지막으로 성공한 검색 결과 사용
+        cached = await _naver_cache.aget(key, allow_expired=True)
+        if cached is None:
+            raise
+        record_fallback("naver", "cached_search")
+        return cached
+
+
+def _with_seoul(term: str) -> str:
+    """서울 지역이 명시되지 않은 장소 앞에 '서울' 추가 (지역 제한)"""
+    if any(region in term.lower() for region in SEOUL_REGION_HINTS):
+        return term
+    return f"서울 {term}"
+
+
+def build_query_variants(
+    location: Optional[str],
+    schedule_place: Optional[str],
+    district: Optional[str],
+    category: Optional[str],
+) -> List[str]:
+    """동시에 검색할 네이버 검색어 변형 목록 생성 (우선순위 순, 중복 제외)
+
+    Args:
+        location: 에이전트가 추출한 장소
+        schedule_place: 일정 장소
+        district: 쿼리 분석에서 찾은 구 이름
+        category: 카테고리
+
+    Returns:
+        검색어 목록 (최대 settings.NAVER_SEARCH_MAX_VARIANTS개)
+    """
+    suffix = f" {category}" if category else ""
+    variants = []
+
+    # 1. 장소+카테고리 (장소 우선순위: 추출된 장소 > 일정 장소 > 구 > 서울)
+    primary_place = location or schedule_place
+    if primary_place:
+        variants.append(_with_seoul(primary_place) + suffix)
+    elif district:
+        variants.append(district + suffix)
+    else:
+        # 구 정보가 없으면 서울 추가 (기본값)
+        variants.append("서울" + suffix)
+
+    # 2. 구+카테고리
+    if district:
+        variants.append(district + suffix)
+
+    # 3. 랜드마크 변형 (일정 장소, 장소 주변)
+    if schedule_place and schedule_place != location:
+        variants.append(_with_seoul(schedule_place) + suffix)
+    if primary_place:
+        variants.append(f"{primary_place} 근처{suffix}")
+
+    unique = []
+    for variant in variants:
+        variant = " ".join(variant.split())
+        if variant and variant not in unique:
+            unique.append(variant)
+    return unique[: settings.NAVER_SEARCH_MAX_VARIANTS]
+
+
+async def fetch_search_page(query: str, page: int, display: int) -> List[Dict]:
+    """검색어 하나의 결과 페이지 조회 (실패 시 빈 목록)"""
+    params = {
+        "query": query,
+        "display": str(display),
+        "start": str((page - 1) * display + 1),
+        "sort": "random",
+    }
+    try:
+        status_code, data = await fetch_local_search(params)
+    except Exception as e:
+        print(f"네이버 API 요청 실패 ('{query}' {page}페이지): {e}")
+        return []
+    if status_code != 200:
+        print(f"네이버 API 오류 ('{query}' {page}페이지): 상태 코드 {status_code}")
+        return []
+    return data.get("items", [])
+
+
+def _place_key(item: Dict) -> Tuple[str, str]:
+    """중복 제거용 장소 키 (태그/공백을 뺀 제목과 주소)"""
+    title = re.sub(r"<[^>]+>", "", item.get("title", ""))
+    address = item.get("roadAddress") or item.get("address") or ""
+    return (
+        re.sub(r"\s+", "", title).lower(),
+        re.sub(r"\s+", "", address).lower(),
+    )
+
+
+def merge_search_results(result_lists: List[List[Dict]]) -> List[Dict]:
+    """여러 검색 결과를 순서대로 합치고 제목/주소가 같은 장소는 하나만 남김"""
+    merged = []
+    seen = set()
+    for items in result_lists:
+        for item in items:
+            key = _place_key(item)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(item)
+    return merged
+
+
+def filter_seoul_results(results: List[Dict]) -> List[Dict]:
+    """서울 지역 결과만 남김 (주소가 없는 결과는 포함)"""
+    filtered = []
+    for item in results:
+        address = item.get("address", "").lower()
+        if not address or any(region in address for region in SEOUL_REGION_HINTS):
+            filtered.append(item)
+    return filtered
+
+
 async def naver_search(state: GraphState) -> GraphState:
     """네이버 검색 노드
 
@@ -236,49 +373,17 @@ async def naver_search(state: GraphState) -> GraphState:
         state: 현재 그래프 상태
 
     Returns:
-        검색 결과가 추가된 그래프 상태
+        검색 결과 필드 (hybrid_retriever와 병렬 실행되므로 전체 상태를 반환하지 않음)
     """
 
     question = state["question"]
     print(f"=== 네이버 검색 시작: '{question}' ===")
 
     try:
-        import aiohttp
-
-        # 일정 정보 가져오기 (hybrid_retriever와 동일한 방식)
-        schedule_place = None
-        schedule_companion = None
-
-        # 세션 ID 확인 및 URL 파라미터 비동기 로드
-        session_id = state.get("session_id", "default_session")
-        print(f"현재 세션 ID: {session_id}")
-
-        if session_id and session_id != "default_session":
-            # 비동기 방식으로 URL 파라미터 로드
-            url_params = await get_session_params(session_id)
-            print(f"세션에서 가져온 URL 파라미터: {url_params}")
-
-            # 일정 ID를 우선적으로 사용하여 일정 정보 가져오기
-            if (
-                url_params
-                and isinstance(url_params, dict)
-                and "schedule_id" in url_params
-            ):
-                schedule_id = url_params.get("schedule_id")
-                print(f"URL 파라미터에서 가져온 일정 ID: {schedule_id}")
-
-                # 일정 ID로 일정 조회 (비동기 처리)
-                if schedule_id:
-                    print(f"일정 조회 함수 호출 (비동기): 일정 ID = {schedule_id}")
-                    try:
-                        # 비동기 래퍼를 통해 함수 호출
-                        schedule_place, schedule_companion = (
-                            await get_schedule_by_id_async(schedule_id)
-                        )
-                        print(f"일정 ID에서 가져온 장소 정보: {schedule_place}")
-                        print(f"일정 ID에서 가져온 동행자 정보: {schedule_companion}")
-                    except Exception as e:
-                        print(f"일정 ID 기반 정보 조회 중 오류 발생: {e}")
+        # 세션/일정 컨텍스트는 context_loader가 미리 불러온 값 사용
+        schedule_place = state.get("schedule_place")
+        schedule_companion = state.get("schedule_companion")
+        print(f"일정 장소: {schedule_place}, 동행자: {schedule_companion}")
 
         # hybrid_retriever와 동일한 방식으로 향상된 쿼리 생성
         enhanced_query = generateQuery(question, schedule_place, schedule_companion)
@@ -286,7 +391,7 @@ async def naver_search(state: GraphState) -> GraphState:
 
         # 에이전트를 통해 장소와 카테고리 추출
         print("\n에이전트를 통해 장소와 카테고리 추출 중...")
-        query_result = extract_location_and_category(enhanced_query)
+        query_result = await aextract_location_and_category(enhanced_query)
         simplified_query = query_result.get("simplified_query")
         extracted_location = query_result.get("location")
         extracted_category = query_result.get("category")
@@ -294,146 +399,102 @@ async def naver_search(state: GraphState) -> GraphState:
         print(f"추출된 장소: {extracted_location}")
         print(f"추출된 카테고리: {extracted_category}")
 
-        # 추출된 정보를 기반으로 최종 검색어 구성
-        search_terms = []
-
-        # 장소 정보 우선순위: 추출된 장소 > 일정 장소 > 구 정보
-        if extracted_location:
-            # 서울 지역 명시적 추가 (지역 제한)
-            if not any(
-                region in extracted_location.lower()
-                for region in ["서울", "강남", "종로", "마포", "홍대"]
-            ):
-                search_terms.append("서울")
-            search_terms.append(extracted_location)
-        elif schedule_place:
-            if not any(
-                region in schedule_place.lower()
-                for region in ["서울", "강남", "종로", "마포", "홍대"]
-            ):
-                search_terms.append("서울")
-            search_terms.append(schedule_place)
-        else:
-            # 구 정보가 없으면 서울 추가 (기본값)
-            query_info = state.get("query_info", {})
-            district = query_info.get("district")
-
-            if district:
-                district_name = district.replace("서울시 ", "").replace("서울 ", "")
-                search_terms.append(district_name)
-            else:
-                search_terms.append("서울")
+        query_info = state.get("query_info", {})
+        district = query_info.get("district")
+        district_name = (
+            district.replace("서울시 ", "").replace("서울 ", "") if district else None
+        )
 
         # 카테고리 정보 우선순위: 추출된 카테고리 > state의 카테고리
-        if extracted_category:
-            search_terms.append(extracted_category)
-        else:
-            query_info = state.get("query_info", {})
-            category = query_info.get("category")
-            if category:
-                search_terms.append(category)
-            elif (
-                "맛집" in enhanced_query
-                or "음식" in enhanced_query
-                or "식당" in enhanced_query
-            ):
-                search_terms.append("맛집")
-
-        final_query = (
-            " ".join(search_terms) if search_terms else (question or "서울 맛집")
+        category = extracted_category or query_info.get("category")
+        if not category and (
+            "맛집" in enhanced_query
+            or "음식" in enhanced_query
+            or "식당" in enhanced_query
+        ):
+            category = "맛집"
+
+        # 장소+카테고리, 구+카테고리, 일정 장소/랜드마크 변형 검색어를 동시에 검색
+        variants = build_query_variants(
+            extracted_location, schedule_place, district_name, category
+        )
+        print(f"네이버 검색어 변형: {variants}")
+
+        display = settings.NAVER_SEARCH_DISPLAY
+        pages = await asyncio.gather(
+            *[fetch_search_page(variant, 1, display) for variant in variants]
         )
-        print(f"최종 네이버 검색어: '{final_query}'")
-
-        headers = {
-            "X-Naver-Client-Id": naver_client_id,
-            "X-Naver-Client-Secret": naver_client_secret,
-        }
-
-        async with aiohttp.ClientSession() as session:
-            url = "https://openapi.naver.com/v1/search/local.json"
-            params = {
-                "query": final_query,
-                "display": "10",  # 결과 수 증가
-                "start": "1",
-                "sort": "random",
-            }
-
-            async with session.get(url, headers=headers, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    results = data.get("items", [])
-                    print(f"네이버 검색 결과: {len(results)}개")
-
-                    # 결과 필터링: 서울 지역 결과만 포함 (지역 정보가 없는 경우 포함)
-                    filtered_results = []
-                    for item in results:
-                        address = item.get("address", "").lower()
-                        if (
-                            not address
-                            or "서울" in address
-                            or any(
-                                region in address
-                                for region in ["종로", "강남", "마포", "홍대"]
-                            )
-                        ):
-                            filtered_results.append(item)
-
-                    print(f"필터링 후 결과: {len(filtered_results)}개")
-
-                    # 결과가 없으면 원본 결과 사용
-                    if not filtered_results:
-                        filtered_results = results
-                        print("서울 지역 결과가 없어 원본 결과 사용")
-
-                    # 결과가 없으면 기본 검색어로 다시 시도
-                    if not filtered_results:
-                        print("결과가 없어 기본 검색어 '서울 맛집'으로 재시도")
-                        params["query"] = "서울 맛집"
-                        async with session.get(
-                            url, headers=headers, params=params
-                        ) as retry_response:
-                            if retry_response.status == 200:
-                                retry_data = await retry_response.json()
-                                filtered_results = retry_data.get("items", [])
-
-                    # 결과 중 최대 3개를 선택 (결과가 3개 미만이면 모두 선택)
-                    selected_places = filtered_results[:3] if filtered_results else []
-
-                    # 선택된 장소 정보 가공
-                    places = []
-                    for item in selected_places:
-                        title = (
-                            item.get("title", "").replace("<b>", "").replace("</b>", "")
-                        )
-                        address = item.get("address", "")
-                        road_address = item.get("roadAddress", "")
-
-                        places.append(
-                            {
-                                "title": title,
-                                "address": address,
-                                "roadAddress": road_address,
-                                "category": item.get("category", ""),
-                                "description": item.get("description", ""),
-                                "link": item.get("link", ""),
-                                "mapx": item.get("mapx", ""),
-                                "mapy": item.get("mapy", ""),
-                                "telephone": item.get("telephone", ""),
-                            }
-                        )
-
-                    print(f"최종 선택된 장소: {len(places)}개")
-                    for i, place in enumerate(places, 1):
-                        print(f"{i}. {place['title']} - {place['address']}")
-                    print("=== 네이버 검색 완료 ===\n")
-
-                    return {**state, "naver_results": places}
-                else:
-                    print(f"네이버 API 오류: 상태 코드 {response.status}")
-                    return {**state, "naver_results": []}
+        results = merge_search_results(pages)
+        print(f"네이버 검색 결과 (병합/중복 제거): {len(results)}개")
+
+        # 결과가 부족하면 결과가 꽉 찼던 검색어의 다음 페이지를 동시에 검색
+        # (지연 예산이 남아 있을 때만)
+        page = 1
+        while (
+            len(filter_seoul_results(results)) < NAVER_SEARCH_MIN_RESULTS
+            and page < settings.NAVER_SEARCH_MAX_PAGES
+            and not should_degrade(state, "naver_retry")
+        ):
+            full_variants = [
+                variant
+                for variant, items in zip(variants, pages)
+                if len(items) >= display
+            ]
+            if not full_variants:
+                break
+            page += 1
+            print(f"결과가 부족해 {page}페이지 검색: {full_variants}")
+            pages = await asyncio.gather(
+                *[
+                    fetch_search_page(variant, page, display)
+                    for variant in full_variants
+                ]
+            )
+            variants = full_variants
+            results = merge_search_results([results] + pages)
+
+        # 결과 필터링: 서울 지역 결과만 포함 (지역 정보가 없는 경우 포함)
+        filtered_results = filter_seoul_results(results)
+        print(f"필터링 후 결과: {len(filtered_results)}개")
+
+        # 결과가 없으면 원본 결과 사용
+        if not filtered_results:
+            filtered_results = results
+            print("서울 지역 결과가 없어 원본 결과 사용")
+
+        # 결과 중 최대 3개를 선택 (결과가 3개 미만이면 모두 선택)
+        selected_places = filtered_results[:NAVER_SEARCH_MIN_RESULTS]
+
+        # 선택된 장소 정보 가공
+        places = []
+        for item in selected_places:
+            title = item.get("title", "").replace("<b>", "").replace("</b>", "")
+            address = item.get("address", "")
+            road_address = item.get("roadAddress", "")
+
+            places.append(
+                {
+                    "title": title,
+                    "address": address,
+                    "roadAddress": road_address,
+                    "category": item.get("category", ""),
+                    "description": item.get("description", ""),
+                    "link": item.get("link", ""),
+                    "mapx": item.get("mapx", ""),
+                    "mapy": item.get("mapy", ""),
+                    "telephone": item.get("telephone", ""),
+                }
+            )
+
+        print(f"최종 선택된 장소: {len(places)}개")
+        for i, place in enumerate(places, 1):
+            print(f"{i}. {place['title']} - {place['address']}")
+        print("=== 네이버 검색 완료 ===\n")
+
+        return {"naver_results": places}
     except Exception as e:
         print(f"네이버 API 요청 중 오류 발생: {e}")
         import traceback
 
         traceback.print_exc()
-        return {**state, "naver_results": []}
+        return {"naver_results": []}
@@ -1,40 +1,29 @@
 import os
+import asyncio
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
-from .base import GraphState, format_documents, format_naver_results
+from .base import GraphState, format_documents, format_naver_place
+from .context_builder import build_context, doc_cache_key
+from .deadline import should_degrade
+from vacation.circuit import CircuitOpenError, get_breaker, record_fallback
+from vacation.metrics import timed
+from vacation.upstreams import chat_model_kwargs
 
 
-def extract_place_name_with_model(content, meta_title=""):
-    """
-    LLM을 활용하여 텍스트에서 장소명을 추출하는 함수
+def _fallback_place_name(meta_title):
+    """장소명을 추출하지 못했을 때 사용할 기본값"""
+    # 기본값으로 사용하는 meta_title이 "장소 N" 형식인지 확인
+    if meta_title and (meta_title.startswith("장소 ") and meta_title[3:].isdigit()):
+        return "알 수 없는 장소"
+    return meta_title
 
-    Args:
-        content: 추출할 텍스트 내용
-        meta_title: 메타데이터에서 얻은 제목 (대체용)
 
-    Returns:
-        추출한 장소명 또는 기본값
-    """
-    try:
-        # OpenAI API 키 가져오기
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            print("OpenAI API 키가 설정되지 않았습니다.")
-            # 기본값으로 사용하는 meta_title이 "장소 N" 형식인지 확인
-            if meta_title and (
-                meta_title.startswith("장소 ") and meta_title[3:].isdigit()
-            ):
-                return "알 수 없는 장소"
-            return meta_title
-
-        # 콘텐츠 길이 제한 (API 요청 크기 최적화)
-        text_to_analyze = content[:1500] if len(content) > 1500 else content
-
-        # LLM 모델 초기화 - 가벼운 모델 사용
-        llm = ChatOpenAI(model="o3-mini", api_key=api_key)
+def _place_name_prompt(content):
+    """장소명 추출 프롬프트 생성"""
+    # 콘텐츠 길이 제한 (API 요청 크기 최적화)
+    text_to_analyze = content[:1500] if len(content) > 1500 else content
 
-        # LLM에게 전달할 프롬프트
-        prompt = f"""
+    return f"""
         아래 텍스트는 식당, 카페, 관광지 등에 대한 설명입니다. 이 텍스트에서 정확한 장소/가게 이름만 추출해주세요.
         
         지침:
@@ -57,37 +46,122 @@ def extract_place_name_with_model(content, meta_title=""):
         답변에는 설명이나 부가 정보 없이 장소명만 작성해주세요.
         """
 
+
+def _parse_place_name(response, meta_title):
+    """LLM 응답에서 장소명 정리"""
+    print(f"LLM이 추출한 장소명: {response}")
+
+    # 응답 처리
+    place_name = response.strip()
+
+    # "알 수 없음" 또는 비어있는 응답이면 메타데이터 제목 사용
+    if place_name == "알 수 없음" or not place_name:
+        return _fallback_place_name(meta_title)
+
+    # "장소 N" 형식으로 반환된 경우 대체
+    if place_name.startswith("장소 ") and place_name[3:].isdigit():
+        return "알 수 없는 장소"
+
+    return place_name
+
+
+def extract_place_name_with_model(content, meta_title=""):
+    """
+    LLM을 활용하여 텍스트에서 장소명을 추출하는 함수
+
+    Args:
+        content: 추출할 텍스트 내용
+        meta_title: 메타데이터에서 얻은 제목 (대체용)
+
+    Returns:
+        추출한 장소명 또는 기본값
+    """
+    try:
+        # OpenAI API 키 가져오기
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            print("OpenAI API 키가 설정되지 않았습니다.")
+            return _fallback_place_name(meta_title)
+
+        # LLM 모델 초기화 - 가벼운 모델 사용
+        llm = ChatOpenAI(model="o3-mini", api_key=api_key, **chat_model_kwargs())
+
         # LLM 호출
-        response = llm.invoke(prompt).content
-        print(f"LLM이 추출한 장소명: {response}")
+        with timed("llm", "place_name_extraction"):
+            response = get_breaker("openai").call(
+                llm.invoke, _place_name_prompt(content)
+            ).content
+        return _parse_place_name(response, meta_title)
 
-        # 응답 처리
-        place_name = response.strip()
+    except Exception as e:
+        print(f"장소명 추출 중 오류 발생: {e}")
+        return _fallback_place_name(meta_title)
 
-        # "알 수 없음" 또는 비어있는 응답이면 메타데이터 제목 사용
-        if place_name == "알 수 없음" or not place_name:
-            # 기본값으로 사용하는 meta_title이 "장소 N" 형식인지 확인
-            if meta_title and (
-                meta_title.startswith("장소 ") and meta_title[3:].isdigit()
-            ):
-                return "알 수 없는 장소"
-            return meta_title
 
-        # "장소 N" 형식으로 반환된 경우 대체
-        if place_name.startswith("장소 ") and place_name[3:].isdigit():
-            return "알 수 없는 장소"
+async def aextract_place_name_with_model(content, meta_title=""):
+    """extract_place_name_with_model의 비동기 버전"""
+    try:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            print("OpenAI API 키가 설정되지 않았습니다.")
+            return _fallback_place_name(meta_title)
 
-        return place_name
+        llm = ChatOpenAI(model="o3-mini", api_key=api_key, **chat_model_kwargs())
+        with timed("llm", "place_name_extraction"):
+            response = (
+                await get_breaker("openai").acall(
+                    llm.ainvoke, _place_name_prompt(content)
+                )
+            ).content
+        return _parse_place_name(response, meta_title)
 
     except Exception as e:
         print(f"장소명 추출 중 오류 발생: {e}")
-        # 기본값으로 사용하는 meta_title이 "장소 N" 형식인지 확인
-        if meta_title and (meta_title.startswith("장소 ") and meta_title[3:].isdigit()):
-            return "알 수 없는 장소"
-        return meta_title
+        return _fallback_place_name(meta_title)
+
+
+def _retrieval_only_answer(sections, is_event):
+    """LLM을 사용할 수 없을 때 검색 결과를 그대로 보여주는 답변
+
+    Args:
+        sections: build_context가 예산에 맞춰 고른 섹션별 포맷팅된 항목
+        is_event: 이벤트 검색 여부
+
+    Returns:
+        답변 문자열
+    """
+    parts = [
+        "지금은 추천 답변을 생성할 수 없어 검색된 정보를 그대로 보여드립니다. "
+        "잠시 후 다시 질문해주세요."
+    ]
+    if sections.get("naver_results"):
+        parts.append("=== 네이버 검색 결과 ===\n" + "".join(sections["naver_results"]))
+    if sections.get("context"):
+        title = "=== 관련 이벤트 ===" if is_event else "=== 관련 장소 ==="
+        parts.append(title + "\n" + "\n".join(sections["context"]))
+    return "\n\n".join(parts)
+
+
+async def _aload_blog_entries(line_numbers):
+    """라인 번호 목록에 해당하는 NaverBlog를 한 번의 쿼리로 조회
+
+    Returns:
+        라인 번호 -> NaverBlog 딕셔너리
+    """
+    if not line_numbers:
+        return {}
+    try:
+        from chatbot.models import NaverBlog
+
+        return await NaverBlog.objects.only("line_number", "url").ain_bulk(
+            line_numbers
+        )
+    except Exception as e:
+        print(f"NaverBlog URL 조회 중 오류: {e}")
+        return {}
 
 
-def response_generator(state: GraphState) -> GraphState:
+async def response_generator(state: GraphState) -> GraphState:
     """응답 생성 노드
 
     검색 결과를 기반으로 사용자 질문에 대한 응답을 생성합니다.
@@ -107,36 +181,10 @@ def response_generator(state: GraphState) -> GraphState:
         is_event = state.get("is_event", False)
         session_id = state.get("session_id", "default_session")
 
-        # 추천된 장소 목록 가져오기
-        recommended_places = state.get("recommended_places", [])
-
-        # 세션 ID가 있고 정수형인 경우만 처리
-        if isinstance(session_id, int):
-            # 세션에서 이미 추천된 장소 목록 가져오기
-            try:
-                from chatbot.models import ChatSession
-
-                # ChatSession 모델에서 세션 ID로 세션 조회
-                session = ChatSession.objects.get(id=session_id)
-
-                # 이미 추천된 장소 목록 가져오기
-                previously_recommended = session.get_recommended_places()
-
-                # 중복 제거 (이미 리스트에 있는 이름은 제외)
-                if previously_recommended:
-                    recommended_places.extend(previously_recommended)
-                    # 중복 제거
-                    recommended_places = list(set(recommended_places))
-                    print(f"이미 추천된 장소 목록: {previously_recommended}")
-            except Exception as e:
-                print(f"세션에서 추천된 장소 목록을 가져오는 중 오류 발생: {e}")
-
-        # 중복 추천 방지를 위한 문자열 생성
-        recommended_places_str = (
-            ", ".join(recommended_places) if recommended_places else "없음"
-        )
+        # 이미 추천된 장소 목록 (context_loader가 불러오고 hybrid_retriever가 갱신한 값)
+        recommended_places = list(state.get("recommended_places") or [])
 
-        print(f"세션 {session_id}에 대해 이미 추천된 장소: {recommended_places_str}")
+        print(f"세션 {session_id}에 대해 이미 추천된 장소: {len(recommended_places)}개")
 
         # 결과가 없는 경우
         if not retrieved_docs and not naver_results:
@@ -149,6 +197,7 @@ def response_generator(state: GraphState) -> GraphState:
         # OpenAI API를 사용하여 응답 생성
         llm = ChatOpenAI(
             model="o3-mini",
+            **chat_model_kwargs(),
         )
 
         # 간소화된 프롬프트 템플릿
@@ -265,11 +314,42 @@ def response_generator(state: GraphState) -> GraphState:
         chain = prompt | llm
 
         # 메타데이터가 풍부한 문서 포맷팅
-        def format_with_detailed_metadata(docs):
-            """문서를 메타데이터와 함께 상세히 포맷팅"""
+        async def format_with_detailed_metadata(docs):
+            """문서를 메타데이터와 함께 상세히 포맷팅
+
+            문서별 장소명 추출(LLM)과 블로그 URL 조회는 문서마다 기다리지 않고
+            동시에 실행합니다.
+
+            Returns:
+                (문서 캐시 키, 포맷팅된 문서) 튜플 목록
+            """
             # 상위 5개의 문서만 사용 (컨텍스트 길이 제한 문제 해결)
             docs = docs[:5] if len(docs) > 5 else docs
 
+            line_numbers = [
+                doc.metadata["line_number"]
+                for doc in docs
+                if doc.metadata.get("line_number") is not None
+            ]
+            titles = [doc.metadata.get("title", f"장소 {i}") for i, doc in enumerate(docs, 1)]
+
+            # 지연 예산이 부족하거나 OpenAI 차단기가 열려 있으면 장소명 LLM 추출을 건너뛰고 제목 사용
+            if should_degrade(state, "place_name_extraction") or get_breaker(
+                "openai"
+            ).is_open():
+                place_names = [_fallback_place_name(title) for title in titles]
+                blog_entries = await _aload_blog_entries(line_numbers)
+            else:
+                place_names, blog_entries = await asyncio.gather(
+                    asyncio.gather(
+                        *[
+                            aextract_place_name_with_model(doc.page_content, title)
+                            for doc, title in zip(docs, titles)
+                        ]
+                    ),
+                    _aload_blog_entries(line_numbers),
+                )
+
             formatted_docs = []
 
             for i, doc in enumerate(docs, 1):
@@ -288,20 +368,17 @@ def response_generator(state: GraphState) -> GraphState:
                 # 원본 콘텐츠 저장 (디버깅용)
                 original_content = content
 
-                # LLM으로 장소명 추출
-                place_name = extract_place_name_with_model(content, title)
+                # LLM으로 추출한 장소명
+                place_name = place_names[i - 1]
                 print(
                     f"[장소 {i}] 추출된 장소명: '{place_name}' (원본 제목: '{title}')"
                 )
 
                 # 2. URL 추출 전략 개선
                 blog_url = ""
-                if "line_number" in meta:
+                blog_entry = blog_entries.get(meta.get("line_number"))
+                if blog_entry is not None:
                     try:
-                        from chatbot.models import NaverBlog
-
-                        line_number = meta.get("line_number")
-                        blog_entry = NaverBlog.objects.get(line_number=line_number)
                         if blog_entry.url:
                             # 블로그 URL에서 불필요한 문자 제거
                             blog_url = (
@@ -467,17 +544,17 @@ def response_generator(state: GraphState) -> GraphState:
 URL: {final_url}
 원본주소: {original_content[:100] if '서울' in original_content[:100] else ''}
 """
-                formatted_docs.append(formatted_doc)
+                formatted_docs.append((doc_cache_key(doc), formatted_doc))
 
-            # 모든 문서 정보 합치기
-            if formatted_docs:
-                return "\n".join(formatted_docs)
-            else:
-                return "관련 문서를 찾지 못했습니다."
+            return formatted_docs
 
         # 이벤트 데이터 처리를 위한 특별 포맷팅 함수
         def format_event_data(docs):
-            """이벤트 문서를 메타데이터와 함께 상세히 포맷팅"""
+            """이벤트 문서를 메타데이터와 함께 상세히 포맷팅
+
+            Returns:
+                (문서 캐시 키, 포맷팅된 문서) 튜플 목록
+            """
             # 상위 5개의 문서만 사용 (컨텍스트 길이 제한 문제 해결)
             docs = docs[:5] if len(docs) > 5 else docs
 
@@ -597,25 +674,56 @@ URL: {final_url}
 설명: {content[:250]}{'...' if len(content) > 250 else ''}
 URL: {final_url}
 """
-                formatted_docs.append(formatted_doc)
-
-            # 모든 문서 정보 합치기
-            if formatted_docs:
-                return "\n".join(formatted_docs)
-            else:
-                return "관련 이벤트를 찾지 못했습니다."
+                formatted_docs.append((doc_cache_key(doc), formatted_doc))
 
-        # 네이버 검색 결과와 문서 포맷팅
-        naver_text = format_naver_results(naver_results)
+            return formatted_docs
 
         # 일반 장소 또는 이벤트에 따라 다른 포맷팅 함수 사용
         if is_event:
-            docs_text = format_event_data(retrieved_docs)  # 이벤트 전용 포맷팅 사용
+            doc_items = format_event_data(retrieved_docs)  # 이벤트 전용 포맷팅 사용
         else:
-            docs_text = format_with_detailed_metadata(
+            doc_items = await format_with_detailed_metadata(
                 retrieved_docs
             )  # 일반 장소 포맷팅 사용
 
+        # 네이버 검색 결과는 장소 단위로 나누어 예산 배정 (이벤트 프롬프트에서는 사용하지 않음)
+        naver_items = [
+            (f"naver:{place.get('link') or place['title']}", format_naver_place(i, place))
+            for i, place in enumerate(naver_results if not is_event else [], 1)
+        ]
+
+        # 이미 추천한 장소는 최근 항목부터 예산 안에서 유지
+        recommended_items = [(None, place) for place in reversed(recommended_places)]
+
+        # 토큰 예산에 맞춰 컨텍스트 조립
+        sections, context_tokens = build_context(
+            {
+                "context": doc_items,
+                "naver_results": naver_items,
+                "recommended_places": recommended_items,
+            }
+        )
+
+        if sections["context"]:
+            docs_text = "\n".join(sections["context"])
+        else:
+            docs_text = (
+                "관련 이벤트를 찾지 못했습니다."
+                if is_event
+                else "관련 문서를 찾지 못했습니다."
+            )
+
+        if sections["naver_results"]:
+            naver_text = "=== 네이버 검색 결과 ===\n" + "".join(sections["naver_results"])
+        else:
+            naver_text = "네이버 검색 결과가 없습니다."
+
+        recommended_places_str = (
+            ", ".join(reversed(sections["recommended_places"]))
+            if sections["recommended_places"]
+            else "없음"
+        )
+
         context = {
             "question": question,
             "context": docs_text,
@@ -625,7 +733,8 @@ URL: {final_url}
 
         try:
             print("\n응답 생성 중...")
-            result = chain.invoke(context)
+            with timed("llm", "response_generator"):
+                result = await get_breaker("openai").acall(chain.ainvoke, context)
 
             # AIMessage 객체에서 content 추출 (langchain 업데이트로 인한 변경 사항)
             if hasattr(result, "content"):
@@ -652,21 +761,25 @@ URL: {final_url}
 
                         # 세션 모델에서 장소 추가
                         try:
-                            from django.db import transaction
-
-                            with transaction.atomic():
-                                session = ChatSession.objects.get(id=session_id)
-                                for place in new_places:
-                                    session.add_recommended_place(place)
-                                print(
-                                    f"세션 {session_id}에 {len(new_places)}개 장소 저장 완료"
-                                )
+                            from chatbot.models import ChatSession
+
+                            session = await ChatSession.objects.aget(id=session_id)
+                            await session.aadd_recommended_places(new_places)
+                            print(
+                                f"세션 {session_id}에 {len(new_places)}개 장소 저장 완료"
+                            )
                         except Exception as e:
                             print(f"장소를 세션에 저장하는 중 오류 발생: {e}")
                 except Exception as e:
                     print(f"추천 장소 추출 및 저장 중 오류: {e}")
 
-            return {**state, "answer": answer}
+            return {**state, "answer": answer, "context_tokens": context_tokens}
+        except CircuitOpenError as e:
+            # OpenAI 장애 중에는 LLM 없이 검색 결과만으로 답변
+            print(f"응답 생성 LLM 차단됨, 검색 결과로 답변: {e}")
+            record_fallback("openai", "retrieval_only_answer")
+            answer = _retrieval_only_answer(sections, is_event)
+            return {**state, "answer": answer, "context_tokens": context_tokens}
         except Exception as e:
             error_message = f"응답 생성 중 오류가 발생했습니다: {str(e)}"
             print(error_message)
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def parse_importtime(output):
+    """python -X importtime 출력을 (모듈, 자체 us, 누적 us, 깊이) 목록으로 변환"""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            # 헤더 줄 (self [us] | cumulative | imported package)
+            continue
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((name.strip(), self_us, cumulative_us, depth))
+    return rows
+
+
+class Command(BaseCommand):
+    help = "새 프로세스에서 모듈(기본 vacation.asgi)의 임포트 시간을 재고 예산을 넘으면 실패합니다"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--module", default="vacation.asgi", help="측정할 모듈")
+        parser.add_argument(
+            "--budget-ms",
+            type=float,
+            default=None,
+            help="임포트 시간 예산 (ms, 기본값 settings.IMPORT_TIME_BUDGET_MS)",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="측정 횟수 (가장 짧은 값 사용)"
+        )
+        parser.add_argument(
+            "--top", type=int, default=10, help="출력할 가장 무거운 하위 임포트 수"
+        )
+
+    def measure(self, module):
+        """새 인터프리터에서 module을 임포트하고 importtime 결과 반환"""
+        env = dict(os.environ)
+        env.setdefault("DJANGO_SETTINGS_MODULE", "vacation.settings")
+        # 워밍업/날씨 갱신 스레드가 측정에 섞이지 않도록 끔
+        env["CHAT_WARMUP_ON_START"] = "False"
+        env["WEATHER_REFRESH_ON_START"] = "False"
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=str(settings.BASE_DIR),
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"{module} 임포트 실패:\n{result.stderr[-2000:]}")
+        return parse_importtime(result.stderr)
+
+    def handle(self, *args, **options):
+        module = options["module"]
+        budget_ms = options["budget_ms"]
+        if budget_ms is None:
+            budget_ms = settings.IMPORT_TIME_BUDGET_MS
+
+        best_ms, best_rows = None, None
+        for _ in range(max(options["repeat"], 1)):
+            rows = self.measure(module)
+            target = next((row for row in rows if row[0] == module), None)
+            if target is None:
+                raise CommandError(f"importtime 출력에서 {module}을 찾지 못했습니다")
+            elapsed_ms = target[2] / 1000
+            if best_ms is None or elapsed_ms < best_ms:
+                best_ms, best_rows = elapsed_ms, rows
+
+        # 측정 대상 바로 아래 단계의 하위 임포트 중 가장 무거운 것
+        target_depth = next(row[3] for row in best_rows if row[0] == module)
+        children = sorted(
+            (row for row in best_rows if row[3] == target_depth + 1),
+            key=lambda row: row[2],
+            reverse=True,
+        )
+        for name, _, cumulative_us, _ in children[: options["top"]]:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+        summary = f"{module} 임포트 시간: {best_ms:.1f} ms (예산 {budget_ms:.0f} ms)"
+        if best_ms > budget_ms:
+            raise CommandError(summary + " - 예산 초과")
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from vacation.fake_upstreams import SERVICES, FakeUpstreamConfig, run
+
+
+class Command(BaseCommand):
+    help = "OpenAI/네이버/기상청 API를 흉내 내는 로컬 대역 서버를 실행합니다 (부하 테스트용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--latency-ms", type=float, default=0, help="모든 응답에 추가할 지연 (ms)"
+        )
+        parser.add_argument(
+            "--jitter-ms", type=float, default=0, help="지연에 더할 최대 편차 (ms)"
+        )
+        parser.add_argument(
+            "--error-rate", type=float, default=0.0, help="오류 응답 비율 (0~1)"
+        )
+        parser.add_argument("--seed", type=int, default=0, help="지연/오류 주입 시드")
+        parser.add_argument(
+            "--service-latency-ms",
+            default="{}",
+            help='서비스별 지연 JSON (예: \'{"openai": 800}\')',
+        )
+        parser.add_argument(
+            "--service-error-rate",
+            default="{}",
+            help='서비스별 오류 비율 JSON (예: \'{"naver": 0.1}\')',
+        )
+
+    def handle(self, *args, **options):
+        service_latency = json.loads(options["service_latency_ms"])
+        service_error_rate = json.loads(options["service_error_rate"])
+        for name in list(service_latency) + list(service_error_rate):
+            if name not in SERVICES:
+                self.stderr.write(f"알 수 없는 서비스: {name} (가능한 값: {SERVICES})")
+                return
+
+        config = FakeUpstreamConfig(
+            latency_ms=options["latency_ms"],
+            jitter_ms=options["jitter_ms"],
+            error_rate=options["error_rate"],
+            seed=options["seed"],
+            service_latency_ms=service_latency,
+            service_error_rate=service_error_rate,
+        )
+        self.stdout.write(
+            f"대역 서버 시작: http://{options['host']}:{options['port']} "
+            f"(FAKE_UPSTREAM_URL로 지정하세요)"
+        )
+        run(host=options["host"], port=options["port"], config=config)
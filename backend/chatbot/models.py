@@ -27,6 +27,12 @@ class ChatSession(models.Model):
     date = models.DateField(default=timezone.now)
     # URL 파라미터를 저장할 필드 추가
     url_params = models.JSONField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # 사용자별 최근 세션 목록 (ChatSessionViewSet)
+            models.Index(fields=["user", "updated_at"], name="chatsession_user_upd_idx"),
+        ]
     
     def add_recommended_place(self, place_identifier):
         """추천한 장소 식별자를 저장하는 메서드"""
@@ -37,6 +43,16 @@ class ChatSession(models.Model):
             self.save()
             return True
         return False
+
+    async def aadd_recommended_places(self, place_identifiers):
+        """추천한 장소 식별자 여러 개를 한 번의 저장으로 추가하는 비동기 메서드"""
+        places = self.get_recommended_places()
+        added = [p for p in dict.fromkeys(place_identifiers) if p not in places]
+        if added:
+            places.extend(added)
+            self.recommended_places = json.dumps(places)
+            await self.asave(update_fields=["recommended_places", "updated_at"])
+        return added
     
     def get_recommended_places(self):
         """추천한 장소 식별자 목록을 가져오는 메서드"""
@@ -59,6 +75,16 @@ class ChatMessage(models.Model):
     is_bot = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # 세션 대화 기록 (시간순)
+            models.Index(fields=["session", "created_at"], name="chatmsg_session_created_idx"),
+            # 세션의 봇 메시지만 시간순 조회 (추천 장소 추출)
+            models.Index(
+                fields=["session", "is_bot", "created_at"], name="chatmsg_session_bot_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"{'Bot' if self.is_bot else 'User'}: {self.content[:50]}..."
     
@@ -1,3 +1,153 @@
+import datetime
+
+from asgiref.sync import async_to_sync
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from calendar_app.models import Schedule
+from calendar_app.tests import QueryPlanAssertionsMixin
+from .consumers import ChatConsumer
+from .graph_modules.context_loader import load_message_context
+from .models import ChatMessage, ChatSession
+
+
+def consumer_method(name):
+    """database_sync_to_async로 감싼 ChatConsumer 메서드의 원래 동기 함수"""
+    return ChatConsumer.__dict__[name].func
+
+
+class ChatQueryCountTests(QueryPlanAssertionsMixin, TestCase):
+    """채팅 세션/메시지 조회의 쿼리 수와 실행 계획 회귀 테스트"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="chatter", nickname="chatter", email="chatter@example.com"
+        )
+        other = User.objects.create_user(
+            username="lurker", nickname="lurker", email="lurker@example.com"
+        )
+        cls.schedule = Schedule.objects.create(
+            user=cls.user,
+            date=datetime.date(2025, 5, 1),
+            location="마포구",
+            companion="가족",
+        )
+        for owner in (cls.user, other):
+            sessions = ChatSession.objects.bulk_create(
+                ChatSession(user=owner, title=f"채팅 {i}", date=cls.schedule.date)
+                for i in range(5)
+            )
+            ChatMessage.objects.bulk_create(
+                ChatMessage(
+                    session=session,
+                    content=f"<b>1. 장소 {i}</b>" if i % 2 else f"질문 {i}",
+                    is_bot=bool(i % 2),
+                )
+                for session in sessions
+                for i in range(20)
+            )
+        cls.session = ChatSession.objects.filter(user=cls.user).first()
+        cls.session.url_params = {"schedule_id": str(cls.schedule.id)}
+        cls.session.save(update_fields=["url_params"])
+
+    def make_consumer(self):
+        consumer = ChatConsumer()
+        consumer.room_name = str(self.session.id)
+        consumer.user = self.user
+        return consumer
+
+    def test_session_list(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/chat/api/sessions/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(response.data), 5)
+        self.assertUsesIndex(queries, "chatbot_chatsession", "chatsession_user_upd_idx")
+
+    def test_session_create_retrieve_destroy(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        # INSERT 1
+        with self.assertNumQueries(1):
+            response = client.post("/chat/api/sessions/", {"title": "새 채팅"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        session_id = response.data["id"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(f"/chat/api/sessions/{self.session.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+        self.assertNoSeqScan(
+            self.find_query(queries, "chatbot_chatsession"), "chatbot_chatsession"
+        )
+
+        # 세션 조회 1 + 메시지 CASCADE 삭제 1 + 세션 삭제 1
+        with CaptureQueriesContext(connection) as queries:
+            response = client.delete(f"/chat/api/sessions/{self.session.id}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(len(queries), 3)
+        # 메시지 CASCADE 삭제도 (session, ...) 인덱스로 대상 행을 찾음
+        delete_sql = next(
+            q["sql"] for q in queries if q["sql"].startswith('DELETE FROM "chatbot_chatmessage"')
+        )
+        self.assertNoSeqScan(
+            delete_sql.replace("DELETE", "SELECT 1", 1), "chatbot_chatmessage"
+        )
+        self.assertFalse(ChatMessage.objects.filter(session_id=self.session.id).exists())
+        self.assertTrue(ChatSession.objects.filter(pk=session_id).exists())
+
+    def test_chat_messages_view(self):
+        self.client.force_login(self.user)
+        # 인증 세션 + 사용자 + 채팅 세션 + 메시지
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/chat/api/messages/{self.session.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 4)
+        self.assertEqual(len(response.json()), 20)
+        self.assertUsesIndex(queries, "chatbot_chatmessage", "chatmsg_session_created_idx")
+
+    def test_load_chat_history(self):
+        # 채팅 세션 1 + 메시지 1
+        with CaptureQueriesContext(connection) as queries:
+            history = consumer_method("load_chat_history")(self.make_consumer())
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(len(history), 20)
+        self.assertUsesIndex(queries, "chatbot_chatmessage", "chatmsg_session_created_idx")
+
+    def test_save_messages(self):
+        consumer = self.make_consumer()
+        # 채팅 세션 조회 1 + 메시지 INSERT 1
+        with self.assertNumQueries(2):
+            session, created = consumer_method("save_message_and_get_response")(
+                consumer, "안녕", self.session.id
+            )
+        self.assertFalse(created)
+        with self.assertNumQueries(1):
+            consumer_method("save_bot_response")(consumer, session, "반가워요")
+        self.assertEqual(session.messages.count(), 22)
+
+    def test_recommended_places_for_session(self):
+        with CaptureQueriesContext(connection) as queries:
+            places = ChatMessage.get_recommended_places_for_session(self.session.id)
+        self.assertEqual(len(queries), 1)
+        self.assertIn("장소 1", places)
+        sql = self.find_query(queries, "chatbot_chatmessage")
+        plan = self.assertNoSeqScan(sql, "chatbot_chatmessage")
+        # SQLite는 WHERE "is_bot" 형태의 불리언 조건을 인덱스 키로 쓰지 못해
+        # (session, created_at) 인덱스로 읽고, PostgreSQL은 (session, is_bot, created_at) 사용
+        if connection.vendor == "postgresql":
+            self.assertIn("chatmsg_session_bot_idx", plan)
 
-# Create your tests here.
+    def test_load_message_context(self):
+        # 채팅 세션 1 + 일정 1
+        with CaptureQueriesContext(connection) as queries:
+            context = async_to_sync(load_message_context)(self.session.id, self.user.pk)
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(context["schedule_place"], "마포구")
+        self.assertEqual(context["schedule_companion"], "가족")
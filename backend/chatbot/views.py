@@ -68,9 +68,11 @@ class ChatSessionViewSet(viewsets.ModelViewSet):
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        if instance.user != request.user:
+        # user_id로 비교해 사용자를 다시 조회하지 않고, 조회한 세션을 그대로 삭제
+        if instance.user_id != request.user.pk:
             return Response(status=status.HTTP_403_FORBIDDEN)
-        return super().destroy(request, *args, **kwargs)
+        self.perform_destroy(instance)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 @api_view(["GET"])
@@ -0,0 +1,183 @@
+"""챗봇 시작 워밍업(벡터스토어/그래프 로드)과 준비 상태 관리 모듈
+
+서버 프로세스마다 한 번만 워밍업을 실행합니다(start_warmup은 여러 번 호출해도
+안전). 이벤트/일반 코퍼스는 동시에 로드하고, 끝나면 그래프를 생성합니다.
+준비 완료는 스레드 안전하게 기록되며, 대기 중인 이벤트 루프에는
+call_soon_threadsafe로 알립니다. 단계별 소요 시간은 메트릭과 /readyz에 노출됩니다.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from django.db import close_old_connections
+from django.http import JsonResponse
+
+from vacation.metrics import record
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 워밍업 상태: idle -> running -> ready / failed
+IDLE, RUNNING, READY, FAILED = "idle", "running", "ready", "failed"
+
+_lock = threading.Lock()
+_state = IDLE
+_error: Optional[str] = None
+_ready = threading.Event()
+# 단계별 소요 시간 (초)
+_phase_timings: Dict[str, float] = {}
+# 준비 완료를 기다리는 (이벤트 루프, asyncio.Event) 목록
+_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+
+
+def _timed_phase(phase: str, func, *args):
+    """워밍업 단계 하나를 실행하고 소요 시간 기록"""
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        return func(*args)
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        _phase_timings[phase] = round(elapsed, 3)
+        record("startup", phase, elapsed, outcome)
+        logger.info(f"워밍업 단계 '{phase}' {elapsed:.2f}초 ({outcome})")
+
+
+def _load_corpus(query_type: str):
+    """코퍼스 하나 로드 (워커 스레드에서 실행, 끝나면 DB 연결 정리)"""
+    from .graph_modules.data_loader import load_data
+
+    try:
+        return load_data(query_type)
+    finally:
+        close_old_connections()
+
+
+def _run_warmup():
+    """워밍업 본체: 코퍼스 병렬 로드 후 그래프 생성"""
+    global _state, _error
+    from .graph_chatbot import get_graph_instance
+    from .graph_modules.data_loader import get_embeddings
+
+    total_start = time.perf_counter()
+    error = None
+    try:
+        _timed_phase("embeddings", get_embeddings)
+
+        # 이벤트/일반 코퍼스 동시 로드
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="warmup") as pool:
+            futures = {
+                query_type: pool.submit(
+                    _timed_phase, f"{query_type}_corpus", _load_corpus, query_type
+                )
+                for query_type in ("event", "general")
+            }
+            for query_type, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"{query_type} 코퍼스 로드 실패: {e}")
+                    error = error or f"{query_type}_corpus: {e}"
+
+        _timed_phase("graph", get_graph_instance)
+    except Exception as e:
+        logger.error(f"워밍업 중 오류 발생: {e}")
+        error = error or str(e)
+
+    elapsed = time.perf_counter() - total_start
+    _phase_timings["total"] = round(elapsed, 3)
+    record("startup", "total", elapsed, "error" if error else "ok")
+
+    with _lock:
+        _state = FAILED if error else READY
+        _error = error
+        waiters = list(_waiters)
+        _waiters.clear()
+        _ready.set()
+
+    # 대기 중인 이벤트 루프에 완료 알림 (asyncio.Event는 스레드 안전하지 않음)
+    for loop, event in waiters:
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(event.set)
+
+    if error:
+        logger.error(f"워밍업 실패 ({elapsed:.2f}초): {error}")
+    else:
+        logger.info(f"워밍업 완료 ({elapsed:.2f}초) - 이제 응답 생성이 가능합니다")
+
+
+def start_warmup() -> bool:
+    """워밍업을 백그라운드 스레드에서 시작 (이미 실행 중이거나 완료됐으면 무시)
+
+    실패한 워밍업은 다시 호출하면 재시도합니다.
+
+    Returns:
+        이번 호출로 워밍업을 새로 시작했는지 여부
+    """
+    global _state, _error
+    with _lock:
+        if _state in (RUNNING, READY):
+            return False
+        _state = RUNNING
+        _error = None
+        _phase_timings.clear()
+        _ready.clear()
+
+    logger.info("챗봇 워밍업 시작")
+    threading.Thread(target=_run_warmup, name="chatbot-warmup", daemon=True).start()
+    return True
+
+
+def is_ready() -> bool:
+    """워밍업이 성공적으로 끝났는지 여부"""
+    return _state == READY
+
+
+def warmup_status() -> Dict:
+    """현재 워밍업 상태와 단계별 소요 시간"""
+    with _lock:
+        return {"status": _state, "error": _error, "phases": dict(_phase_timings)}
+
+
+async def wait_until_ready(timeout: Optional[float] = None) -> bool:
+    """워밍업이 끝날 때까지 대기 (아직 시작 전이면 시작)
+
+    Args:
+        timeout: 최대 대기 시간 (초, None이면 무제한)
+
+    Returns:
+        워밍업이 성공적으로 끝났으면 True, 실패/시간 초과면 False
+    """
+    start_warmup()
+    with _lock:
+        if _ready.is_set():
+            return _state == READY
+        event = asyncio.Event()
+        _waiters.append((asyncio.get_running_loop(), event))
+
+    try:
+        await asyncio.wait_for(event.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"워밍업이 {timeout}초 안에 끝나지 않음")
+        with _lock:
+            if (asyncio.get_running_loop(), event) in _waiters:
+                _waiters.remove((asyncio.get_running_loop(), event))
+    return is_ready()
+
+
+def healthz_view(request):
+    """로드밸런서 liveness 확인용 /healthz 엔드포인트 (프로세스가 살아 있으면 200)"""
+    return JsonResponse({"status": "ok"})
+
+
+def readyz_view(request):
+    """로드밸런서 readiness 확인용 /readyz 엔드포인트 (워밍업 완료 전에는 503)"""
+    status = warmup_status()
+    return JsonResponse(status, status=200 if status["status"] == READY else 503)
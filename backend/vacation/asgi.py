@@ -12,11 +12,39 @@ django_asgi_app = get_asgi_application()
 # 그 다음에 다른 모듈을 임포트합니다
 from channels.routing import ProtocolTypeRouter, URLRouter
 from chatbot.routing import websocket_urlpatterns, TokenAuthMiddlewareStack
+from django.conf import settings
+from chatbot.warmup import start_warmup
+
+# 서버 프로세스당 한 번 벡터스토어/LangGraph 워밍업 시작 (/readyz로 완료 확인)
+if settings.CHAT_WARMUP_ON_START:
+    start_warmup()
+
+# 예보 발표 시각마다 날씨 캐시 갱신 (일정 API는 캐시만 읽음)
+if settings.WEATHER_REFRESH_ON_START:
+    from calendar_app.weather import start_weather_refresher
+
+    start_weather_refresher()
+
+
+async def lifespan_app(scope, receive, send):
+    """ASGI lifespan 처리 (lifespan을 지원하는 서버에서 종료 시 공용 리소스 정리)"""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            from vacation.http_client import close_client_sessions
+
+            await close_client_sessions()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
 
 application = ProtocolTypeRouter(
     {
         "http": django_asgi_app,
         "websocket": TokenAuthMiddlewareStack(URLRouter(websocket_urlpatterns)),
+        "lifespan": lifespan_app,
     }
 )
 
@@ -0,0 +1,259 @@
+"""외부 API(OpenAI, 네이버, 기상청) 서킷 브레이커 모듈
+
+upstream이 연속으로 실패하거나(예외, 429/5xx) 너무 느리게 응답하면 차단기를 열고,
+열려 있는 동안은 호출하지 않고 즉시 CircuitOpenError를 발생시켜 호출 측이 캐시된
+마지막 정상 값(날씨, 네이버 검색 결과)이나 검색 결과만으로 만든 답변을 쓰게 합니다.
+reset_timeout이 지나면 half-open 상태로 바뀌어 소수의 시험 호출만 보내고, 성공하면
+닫고 실패하면 다시 엽니다. 상태는 프로세스(워커) 단위입니다.
+
+호출 한도(vacation.ratelimit)는 차단기 바깥에서 적용합니다 (single-flight -> 호출
+한도 -> 차단기 -> 요청). 요청 안에서 한도를 적용하는 OpenAI httpx 훅처럼 안쪽에서
+RateLimitExceeded가 발생해도 upstream 장애가 아니므로 실패로 세지 않습니다.
+
+사용 예:
+    try:
+        result = await get_breaker("naver").acall(fetch, params)
+    except CircuitOpenError:
+        result = cached_result
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+
+from vacation.metrics import METRIC_PREFIX, registry
+from vacation.ratelimit import RateLimitExceeded
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# 게이지로 내보낼 상태 값
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+# 상태 전환 시 기록할 이벤트 이름
+_STATE_EVENTS = {CLOSED: "closed", HALF_OPEN: "half_opened", OPEN: "opened"}
+
+circuit_state = registry.gauge(
+    f"{METRIC_PREFIX}_circuit_state",
+    "Circuit breaker state by upstream (0 closed, 1 half-open, 2 open)",
+)
+circuit_events = registry.counter(
+    f"{METRIC_PREFIX}_circuit_events_total",
+    "Circuit breaker events (failure, slow, opened, half_opened, closed, short_circuited)",
+)
+circuit_fallbacks = registry.counter(
+    f"{METRIC_PREFIX}_circuit_fallbacks_total",
+    "Fallback responses served instead of calling an upstream",
+)
+
+
+class CircuitOpenError(Exception):
+    """차단기가 열려 있어 호출하지 않음"""
+
+
+def _is_throttled(error: BaseException) -> bool:
+    """자체 호출 한도 때문에 실패한 호출인지 (SDK가 감싼 예외의 원인까지 확인)"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, RateLimitExceeded):
+            return True
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def record_fallback(upstream: str, fallback: str):
+    """upstream 대신 대체 응답을 사용한 횟수 기록
+
+    Args:
+        upstream: 차단기 이름
+        fallback: 대체 응답 종류 (예: "last_good_weather", "cached_search")
+    """
+    circuit_fallbacks.inc(upstream=upstream, fallback=fallback)
+
+
+class CircuitBreaker:
+    """연속 실패/지연 횟수 기반 서킷 브레이커
+
+    Args:
+        name: upstream 이름 (메트릭 레이블)
+        failure_threshold: 차단기를 여는 연속 실패(느린 호출 포함) 횟수
+        slow_call_threshold: 이 시간(초)보다 오래 걸린 호출은 실패로 취급 (0이면 사용 안 함)
+        reset_timeout: 열린 뒤 half-open으로 바뀌기까지의 시간 (초)
+        half_open_max_calls: half-open 상태에서 동시에 허용하는 시험 호출 수
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        slow_call_threshold: float = 0,
+        reset_timeout: float = 30,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = max(int(failure_threshold), 1)
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = max(int(half_open_max_calls), 1)
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+        circuit_state.set(0, upstream=name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        # 열린 지 reset_timeout이 지났으면 half-open으로 전환 (락 안에서 호출)
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: str):
+        self._state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        if state != HALF_OPEN:
+            self._half_open_calls = 0
+        if state == CLOSED:
+            self._failures = 0
+        circuit_state.set(_STATE_VALUES[state], upstream=self.name)
+        circuit_events.inc(upstream=self.name, event=_STATE_EVENTS[state])
+        logger.warning(f"[{self.name}] 서킷 브레이커 상태 변경: {state}")
+
+    def is_open(self) -> bool:
+        """호출하지 않고 바로 대체 응답을 써야 하는지 여부 (half-open은 False)"""
+        return self.state == OPEN
+
+    def before_call(self):
+        """호출 허용 여부 확인 (허용하지 않으면 CircuitOpenError)"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return
+        circuit_events.inc(upstream=self.name, event="short_circuited")
+        raise CircuitOpenError(f"{self.name} 서킷 브레이커 열림")
+
+    def on_success(self, elapsed: float):
+        """호출 성공 기록 (느린 호출은 실패로 취급)"""
+        if self.slow_call_threshold and elapsed > self.slow_call_threshold:
+            circuit_events.inc(upstream=self.name, event="slow")
+            self.on_failure()
+            return
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED)
+            self._failures = 0
+
+    def on_failure(self):
+        """호출 실패 기록"""
+        circuit_events.inc(upstream=self.name, event="failure")
+        with self._lock:
+            if self._state == HALF_OPEN:
+                # 시험 호출 실패: 다시 열기
+                self._transition(OPEN)
+                return
+            self._failures += 1
+            if self._state == CLOSED and self._failures >= self.failure_threshold:
+                self._transition(OPEN)
+
+    def _release(self):
+        # 결과를 기록하지 못하고 끝난 시험 호출(취소 등)의 자리 반환
+        with self._lock:
+            if self._state == HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def _record(self, result: Any, elapsed: float, is_failure):
+        if is_failure is not None and is_failure(result):
+            self.on_failure()
+        else:
+            self.on_success(elapsed)
+
+    def call(
+        self,
+        func: Callable[..., Any],
+        *args,
+        is_failure: Optional[Callable[[Any], bool]] = None,
+        **kwargs,
+    ) -> Any:
+        """차단기를 거쳐 func 호출 (동기)
+
+        Args:
+            func: 호출할 함수
+            is_failure: 예외 없이 반환된 결과를 실패로 볼지 판단하는 함수 (예: 5xx 응답)
+
+        Raises:
+            CircuitOpenError: 차단기가 열려 있음
+        """
+        self.before_call()
+        start = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if _is_throttled(e):
+                self._release()
+            else:
+                self.on_failure()
+            raise
+        except BaseException:
+            self._release()
+            raise
+        self._record(result, time.monotonic() - start, is_failure)
+        return result
+
+    async def acall(
+        self,
+        func: Callable[..., Any],
+        *args,
+        is_failure: Optional[Callable[[Any], bool]] = None,
+        **kwargs,
+    ) -> Any:
+        """call의 비동기 버전 (func는 코루틴 함수)"""
+        self.before_call()
+        start = time.monotonic()
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            if _is_throttled(e):
+                self._release()
+            else:
+                self.on_failure()
+            raise
+        except BaseException:
+            # 작업 취소(지연 예산 초과 등)는 upstream 실패로 보지 않음
+            self._release()
+            raise
+        self._record(result, time.monotonic() - start, is_failure)
+        return result
+
+
+# upstream 이름 -> 차단기
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """settings.CIRCUIT_BREAKERS 설정으로 만든 upstream 차단기 (싱글톤)"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                config = settings.CIRCUIT_BREAKERS.get(name, {})
+                breaker = CircuitBreaker(name, **config)
+                _breakers[name] = breaker
+    return breaker
@@ -0,0 +1,450 @@
+"""부하 테스트/벤치마크용 외부 API 대역 서버
+
+OpenAI(chat completions, embeddings), 네이버 지역 검색, 기상청 단기/중기예보
+엔드포인트를 흉내 내는 aiohttp 서버입니다. 응답은 요청 내용에 대해 결정적이며,
+지연 시간과 오류 비율을 설정해 장애 상황도 재현할 수 있습니다.
+
+실행:
+    python manage.py run_fake_upstreams --port 8765 --latency-ms 200 --error-rate 0.01
+    FAKE_UPSTREAM_URL=http://127.0.0.1:8765 daphne vacation.asgi:application
+"""
+
+import asyncio
+import base64
+import datetime
+import hashlib
+import json
+import logging
+import random
+import re
+import struct
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 대역 서버가 흉내 내는 서비스 목록
+SERVICES = ["openai", "naver", "kma"]
+
+# text-embedding-ada-002와 같은 차원 (FAISS 인덱스와 맞춰야 함)
+EMBEDDING_DIMENSIONS = 1536
+
+# 응답 생성에 사용하는 서울 랜드마크 -> 구 매핑
+FAKE_LANDMARKS = {
+    "강남역": "서울 강남구",
+    "홍대": "서울 마포구",
+    "성수동": "서울 성동구",
+    "여의도": "서울 영등포구",
+    "신촌": "서울 서대문구",
+    "잠실": "서울 송파구",
+    "이태원": "서울 용산구",
+    "종로": "서울 종로구",
+}
+
+FAKE_CATEGORIES = ["카페", "맛집", "전시", "공연"]
+
+# 응답의 created 값 (결정적 응답을 위해 고정)
+FIXED_CREATED = 1735689600
+
+
+class FakeUpstreamConfig:
+    """지연/오류 주입 설정
+
+    Args:
+        latency_ms: 모든 응답에 추가할 기본 지연 (밀리초)
+        jitter_ms: 지연에 더할 최대 무작위 편차 (밀리초, seed 기반으로 재현 가능)
+        error_rate: 오류 응답을 돌려줄 비율 (0~1)
+        seed: 지연 편차와 오류 주입에 사용할 난수 시드
+        service_latency_ms: 서비스별 기본 지연 덮어쓰기 ({"openai": 800})
+        service_error_rate: 서비스별 오류 비율 덮어쓰기 ({"naver": 0.1})
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        service_latency_ms: Optional[Dict[str, float]] = None,
+        service_error_rate: Optional[Dict[str, float]] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.service_latency_ms = service_latency_ms or {}
+        self.service_error_rate = service_error_rate or {}
+        self._random = random.Random(seed)
+
+    def latency_for(self, service: str) -> float:
+        """이번 요청에 적용할 지연 (초)"""
+        base = self.service_latency_ms.get(service, self.latency_ms)
+        jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0
+        return (base + jitter) / 1000
+
+    def should_fail(self, service: str) -> bool:
+        """이번 요청을 오류로 응답할지 여부"""
+        rate = self.service_error_rate.get(service, self.error_rate)
+        return rate > 0 and self._random.random() < rate
+
+
+def _seeded_random(*parts) -> random.Random:
+    """요청 내용으로부터 결정적인 난수 생성기 생성"""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    seed = int(hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16], 16)
+    return random.Random(seed)
+
+
+def _find_landmark(text: str) -> Optional[str]:
+    for landmark in FAKE_LANDMARKS:
+        if landmark in text:
+            return landmark
+    return None
+
+
+def _find_category(text: str) -> Optional[str]:
+    for category in FAKE_CATEGORIES:
+        if category in text:
+            return category
+    return None
+
+
+# ---------------------------------------------------------------------------
+# OpenAI
+# ---------------------------------------------------------------------------
+
+
+def _extract_user_text(prompt: str) -> str:
+    """프롬프트에서 예시를 제외한 사용자 입력 부분("텍스트:"/"쿼리:" 줄) 추출"""
+    match = re.search(r"^\s*(?:텍스트|쿼리):\s*(.+)$", prompt, re.MULTILINE)
+    return match.group(1) if match else prompt
+
+
+def fake_chat_reply(prompt: str) -> str:
+    """프롬프트 종류에 맞는 결정적 응답 생성"""
+    rng = _seeded_random("chat", prompt)
+    user_text = _extract_user_text(prompt)
+    landmark = _find_landmark(user_text)
+    category = _find_category(user_text)
+
+    # 메시지 분류기 (consumers.is_place_related_message)
+    if "'yes' 또는 'no'" in prompt:
+        return "yes"
+
+    # 검색어 간소화 (location_agent.extract_location_and_category)
+    if '"simplified_query"' in prompt:
+        simplified = " ".join(part for part in [landmark, category] if part)
+        return json.dumps(
+            {
+                "simplified_query": simplified or "서울 맛집",
+                "location": landmark,
+                "category": category,
+            },
+            ensure_ascii=False,
+        )
+
+    # 장소/구 추출 (location_agent.get_place_info)
+    if '"district"' in prompt:
+        return json.dumps(
+            {
+                "place": landmark,
+                "district": FAKE_LANDMARKS.get(landmark) if landmark else None,
+            },
+            ensure_ascii=False,
+        )
+
+    # 장소명 추출 (response_generator.extract_place_name_with_model)
+    if "장소명만 간결하게" in prompt:
+        return f"대역 장소 {rng.randint(1, 999)}"
+
+    # 추천 응답 생성 (response_generator)
+    lines = ["===== 추천 장소 =====", ""]
+    for i in range(1, 7):
+        number = rng.randint(1, 999)
+        lines += [
+            f"{i}️⃣ <b>대역 추천 장소 {number}</b>",
+            f"📍 위치: {FAKE_LANDMARKS.get(landmark, '서울 중구')} 대역로 {number}",
+            f"🏷️ 분류: {category or '맛집'}",
+            "💫 추천 이유: 부하 테스트용 결정적 응답입니다.",
+            "🔍 참고: 정보 없음",
+            "",
+        ]
+    lines.append("✨ 추가 팁: 대역 서버 응답입니다.")
+    return "\n".join(lines)
+
+
+def _messages_to_prompt(messages: List[Dict]) -> str:
+    parts = []
+    for message in messages or []:
+        content = message.get("content", "")
+        if isinstance(content, list):
+            content = " ".join(
+                block.get("text", "") for block in content if isinstance(block, dict)
+            )
+        parts.append(str(content))
+    return "\n".join(parts)
+
+
+def fake_embedding(value) -> List[float]:
+    """입력 텍스트(또는 토큰 배열)에 대해 결정적인 단위 벡터 생성"""
+    raw = value if isinstance(value, str) else json.dumps(value)
+    digest = hashlib.sha256(raw.encode("utf-8")).digest()
+    values = []
+    counter = 0
+    while len(values) < EMBEDDING_DIMENSIONS:
+        block = hashlib.sha256(digest + counter.to_bytes(4, "little")).digest()
+        values.extend((byte - 127.5) / 127.5 for byte in block)
+        counter += 1
+    values = values[:EMBEDDING_DIMENSIONS]
+    norm = sum(v * v for v in values) ** 0.5 or 1.0
+    return [v / norm for v in values]
+
+
+async def chat_completions(request: web.Request) -> web.Response:
+    body = await request.json()
+    prompt = _messages_to_prompt(body.get("messages"))
+    reply = fake_chat_reply(prompt)
+    prompt_tokens = max(len(prompt) // 2, 1)
+    completion_tokens = max(len(reply) // 2, 1)
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:24]
+    return web.json_response(
+        {
+            "id": f"chatcmpl-fake-{digest}",
+            "object": "chat.completion",
+            "created": FIXED_CREATED,
+            "model": body.get("model", "fake-model"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": reply},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+    )
+
+
+async def embeddings(request: web.Request) -> web.Response:
+    body = await request.json()
+    inputs = body.get("input", [])
+    # 단일 문자열 또는 단일 토큰 배열도 목록으로 통일
+    if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+        inputs = [inputs]
+
+    use_base64 = body.get("encoding_format") == "base64"
+    data = []
+    for index, value in enumerate(inputs):
+        vector = fake_embedding(value)
+        if use_base64:
+            encoded = base64.b64encode(struct.pack(f"<{len(vector)}f", *vector))
+            embedding = encoded.decode("ascii")
+        else:
+            embedding = vector
+        data.append({"object": "embedding", "index": index, "embedding": embedding})
+
+    tokens = sum(len(v) if isinstance(v, list) else max(len(v) // 2, 1) for v in inputs)
+    return web.json_response(
+        {
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "text-embedding-ada-002"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+    )
+
+
+# ---------------------------------------------------------------------------
+# 네이버 지역 검색
+# ---------------------------------------------------------------------------
+
+
+async def naver_local_search(request: web.Request) -> web.Response:
+    query = request.query.get("query", "")
+    display = min(int(request.query.get("display", "5")), 10)
+    start = max(int(request.query.get("start", "1")), 1)
+    total = 30
+
+    rng = _seeded_random("naver", query)
+    landmark = _find_landmark(query)
+    district = FAKE_LANDMARKS.get(landmark, "서울 중구").replace("서울 ", "")
+    category = _find_category(query) or "음식점"
+
+    items = []
+    for position in range(start, min(start + display, total + 1)):
+        number = rng.randint(1, 999) + position
+        items.append(
+            {
+                "title": f"<b>{query}</b> 대역 {position}호점",
+                "link": f"https://example.com/fake/{number}",
+                "category": f"{category}>대역",
+                "description": "",
+                "telephone": "",
+                "address": f"서울특별시 {district} 대역동 {number}",
+                "roadAddress": f"서울특별시 {district} 대역로 {number}",
+                "mapx": str(1269780000 + number * 100),
+                "mapy": str(375665000 + number * 100),
+            }
+        )
+
+    return web.json_response(
+        {
+            "lastBuildDate": "Wed, 01 Jan 2025 00:00:00 +0900",
+            "total": total,
+            "start": start,
+            "display": len(items),
+            "items": items,
+        }
+    )
+
+
+# ---------------------------------------------------------------------------
+# 기상청 단기/중기예보
+# ---------------------------------------------------------------------------
+
+
+def _kma_response(items: List[Dict], page_no: int, num_of_rows: int) -> Dict:
+    return {
+        "response": {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+            "body": {
+                "dataType": "JSON",
+                "items": {"item": items},
+                "pageNo": page_no,
+                "numOfRows": num_of_rows,
+                "totalCount": len(items),
+            },
+        }
+    }
+
+
+async def kma_short_term(request: web.Request) -> web.Response:
+    base_date = request.query.get("base_date", "20250101")
+    base_time = request.query.get("base_time", "0500")
+    nx = request.query.get("nx", "60")
+    ny = request.query.get("ny", "127")
+    num_of_rows = int(request.query.get("numOfRows", "1000"))
+    page_no = int(request.query.get("pageNo", "1"))
+
+    start = datetime.datetime.strptime(base_date, "%Y%m%d")
+    items = []
+    for day in range(4):
+        fcst_date = (start + datetime.timedelta(days=day)).strftime("%Y%m%d")
+        for hour in range(24):
+            fcst_time = f"{hour:02d}00"
+            rng = _seeded_random("kma-short", fcst_date, fcst_time, nx, ny)
+            values = {
+                "TMP": str(rng.randint(-5, 30)),
+                "POP": str(rng.choice([0, 10, 20, 30, 60, 80])),
+                "SKY": str(rng.choice([1, 3, 4])),
+                "PTY": str(rng.choice([0, 0, 0, 1, 3])),
+            }
+            for category, value in values.items():
+                items.append(
+                    {
+                        "baseDate": base_date,
+                        "baseTime": base_time,
+                        "category": category,
+                        "fcstDate": fcst_date,
+                        "fcstTime": fcst_time,
+                        "fcstValue": value,
+                        "nx": int(nx),
+                        "ny": int(ny),
+                    }
+                )
+
+    offset = (page_no - 1) * num_of_rows
+    return web.json_response(
+        _kma_response(items[offset : offset + num_of_rows], page_no, num_of_rows)
+    )
+
+
+async def kma_mid_term(request: web.Request) -> web.Response:
+    reg_id = request.query.get("regId", "11B00000")
+    tm_fc = request.query.get("tmFc", "202501010600")
+
+    rng = _seeded_random("kma-mid", reg_id, tm_fc)
+    skies = ["맑음", "구름많음", "흐림", "흐리고 비", "구름많고 눈"]
+    item = {"regId": reg_id}
+    for day in range(4, 11):
+        if day <= 7:
+            for half in ["Am", "Pm"]:
+                item[f"wf{day}{half}"] = rng.choice(skies)
+                item[f"rnSt{day}{half}"] = rng.choice([0, 10, 20, 30, 60, 80])
+        else:
+            item[f"wf{day}"] = rng.choice(skies)
+            item[f"rnSt{day}"] = rng.choice([0, 10, 20, 30, 60, 80])
+
+    return web.json_response(_kma_response([item], 1, 10))
+
+
+# ---------------------------------------------------------------------------
+# 서버 구성
+# ---------------------------------------------------------------------------
+
+
+ROUTES = [
+    ("POST", "/v1/chat/completions", "openai", chat_completions),
+    ("POST", "/v1/embeddings", "openai", embeddings),
+    ("GET", "/v1/search/local.json", "naver", naver_local_search),
+    (
+        "GET",
+        "/1360000/VilageFcstInfoService_2.0/getVilageFcst",
+        "kma",
+        kma_short_term,
+    ),
+    ("GET", "/1360000/MidFcstInfoService/getMidLandFcst", "kma", kma_mid_term),
+]
+
+
+def _error_response(service: str) -> web.Response:
+    """서비스별 실제 오류 응답 형식을 흉내 낸 응답"""
+    if service == "openai":
+        return web.json_response(
+            {
+                "error": {
+                    "message": "Rate limit reached (fake upstream)",
+                    "type": "rate_limit_error",
+                    "code": "rate_limit_exceeded",
+                }
+            },
+            status=429,
+        )
+    if service == "naver":
+        return web.json_response(
+            {"errorMessage": "Rate limit exceeded. (fake upstream)", "errorCode": "012"},
+            status=429,
+        )
+    return web.Response(text="SERVICE UNAVAILABLE (fake upstream)", status=503)
+
+
+def _wrap(service: str, handler, config: FakeUpstreamConfig):
+    async def wrapped(request: web.Request) -> web.Response:
+        delay = config.latency_for(service)
+        if delay:
+            await asyncio.sleep(delay)
+        if config.should_fail(service):
+            logger.info(f"[fake:{service}] 오류 주입: {request.path}")
+            return _error_response(service)
+        return await handler(request)
+
+    return wrapped
+
+
+def create_app(config: Optional[FakeUpstreamConfig] = None) -> web.Application:
+    """대역 서버 aiohttp 애플리케이션 생성"""
+    config = config or FakeUpstreamConfig()
+    app = web.Application()
+    for method, path, service, handler in ROUTES:
+        app.router.add_route(method, path, _wrap(service, handler, config))
+    return app
+
+
+def run(host: str = "127.0.0.1", port: int = 8765, config: Optional[FakeUpstreamConfig] = None):
+    """대역 서버 실행 (블로킹)"""
+    web.run_app(create_app(config), host=host, port=port, print=logger.info)
@@ -0,0 +1,201 @@
+"""프로세스 공용 HTTP 클라이언트(aiohttp 세션, OpenAI용 httpx 클라이언트) 모듈
+
+외부 API 호출마다 새 ClientSession(새 커넥터, DNS 조회, TLS 핸드셰이크)을 만들지 않고
+이벤트 루프별로 하나의 세션을 재사용합니다. 커넥터는 keep-alive 연결 풀과 DNS 캐시를
+사용하며, 연결 생성/재사용/대기와 DNS 캐시 적중 여부를 메트릭으로 기록합니다.
+세션은 ASGI lifespan 종료 시 close_client_sessions()로 정리합니다.
+
+OpenAI(ChatOpenAI) 호출용 httpx 클라이언트도 같은 방식으로 공유합니다. 호출마다
+클라이언트를 만들면 닫히지 않은 연결이 GC 시점에 정리되면서 같은 fd 번호를
+재사용한 새 연결의 이벤트 루프 등록을 지워 요청이 멈출 수 있습니다.
+ChatOpenAI 요청과 동기 임베딩 요청은 이 클라이언트를 거치므로 요청 훅에서 "openai"
+호출 한도를 적용합니다 (429/5xx 재시도 백오프는 openai SDK의 max_retries가 처리).
+프로세스 싱글톤인 임베딩 모델의 비동기 요청은 루프별 클라이언트를 쓸 수 없어
+chatbot.graph_modules.data_loader에서 직접 호출 한도를 적용합니다.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+import aiohttp
+import httpx
+import openai
+from django.conf import settings
+
+from vacation.metrics import METRIC_PREFIX, record, registry
+from vacation.ratelimit import get_limiter
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+pool_events = registry.counter(
+    f"{METRIC_PREFIX}_http_pool_events_total",
+    "aiohttp connection pool events (connection create/reuse, queueing, DNS cache)",
+)
+
+# 이벤트 루프별 공용 세션
+_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+# OpenAI용 httpx 클라이언트 (동기: 프로세스 공용, 비동기: 이벤트 루프별)
+_openai_http_client: Optional[httpx.Client] = None
+_openai_http_client_lock = threading.Lock()
+_openai_async_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+
+async def _on_request_start(session, context, params):
+    context.start = time.perf_counter()
+
+
+async def _on_connection_queued_end(session, context, params):
+    # 풀의 연결이 모두 사용 중이어서 기다린 시간
+    pool_events.inc(event="queued")
+    record("http_pool", "queue_wait", time.perf_counter() - context.start)
+
+
+async def _on_connection_create_start(session, context, params):
+    context.connect_start = time.perf_counter()
+
+
+async def _on_connection_create_end(session, context, params):
+    pool_events.inc(event="connection_create")
+    record("http_pool", "connection_create", time.perf_counter() - context.connect_start)
+
+
+async def _on_connection_reuseconn(session, context, params):
+    pool_events.inc(event="connection_reuse")
+
+
+async def _on_dns_cache_hit(session, context, params):
+    pool_events.inc(event="dns_cache_hit")
+
+
+async def _on_dns_cache_miss(session, context, params):
+    pool_events.inc(event="dns_cache_miss")
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    """연결 풀 메트릭을 기록하는 TraceConfig"""
+    trace_config = aiohttp.TraceConfig(trace_config_ctx_factory=SimpleNamespace)
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_connection_queued_end.append(_on_connection_queued_end)
+    trace_config.on_connection_create_start.append(_on_connection_create_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(_on_connection_reuseconn)
+    trace_config.on_dns_cache_hit.append(_on_dns_cache_hit)
+    trace_config.on_dns_cache_miss.append(_on_dns_cache_miss)
+    return trace_config
+
+
+def _create_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=settings.HTTP_POOL_LIMIT,
+        limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+        ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=settings.HTTP_TOTAL_TIMEOUT,
+        connect=settings.HTTP_CONNECT_TIMEOUT,
+        sock_read=settings.HTTP_READ_TIMEOUT,
+    )
+    return aiohttp.ClientSession(
+        connector=connector, timeout=timeout, trace_configs=[_trace_config()]
+    )
+
+
+def get_client_session() -> aiohttp.ClientSession:
+    """현재 이벤트 루프의 공용 ClientSession 반환 (없거나 닫혔으면 생성)
+
+    반환된 세션은 호출 측에서 닫지 않습니다.
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        # 닫힌 루프에 남아 있는 세션 정리
+        for stale_loop in [l for l in _sessions if l.is_closed()]:
+            del _sessions[stale_loop]
+        session = _create_session()
+        _sessions[loop] = session
+        logger.info("공용 aiohttp 세션 생성")
+    return session
+
+
+def _limit_openai_request(request: httpx.Request):
+    get_limiter("openai").acquire()
+
+
+def _record_openai_response(response: httpx.Response):
+    get_limiter("openai").record_status(response.status_code)
+
+
+async def _alimit_openai_request(request: httpx.Request):
+    await get_limiter("openai").aacquire()
+
+
+async def _arecord_openai_response(response: httpx.Response):
+    get_limiter("openai").record_status(response.status_code)
+
+
+def _openai_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.HTTP_POOL_LIMIT,
+        max_keepalive_connections=settings.HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_TIMEOUT,
+    )
+
+
+def get_openai_http_client() -> httpx.Client:
+    """OpenAI 동기 호출용 공용 httpx 클라이언트 (스레드 간 공유)"""
+    global _openai_http_client
+    if _openai_http_client is None:
+        with _openai_http_client_lock:
+            if _openai_http_client is None:
+                _openai_http_client = openai.DefaultHttpxClient(
+                    limits=_openai_limits(),
+                    event_hooks={
+                        "request": [_limit_openai_request],
+                        "response": [_record_openai_response],
+                    },
+                )
+    return _openai_http_client
+
+
+def get_openai_async_http_client() -> Optional[httpx.AsyncClient]:
+    """현재 이벤트 루프의 OpenAI 비동기 호출용 공용 httpx 클라이언트
+
+    실행 중인 이벤트 루프가 없으면(스레드에서 동기 호출) None을 반환합니다.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    client = _openai_async_clients.get(loop)
+    if client is None or client.is_closed:
+        for stale_loop in [l for l in _openai_async_clients if l.is_closed()]:
+            del _openai_async_clients[stale_loop]
+        client = openai.DefaultAsyncHttpxClient(
+            limits=_openai_limits(),
+            event_hooks={
+                "request": [_alimit_openai_request],
+                "response": [_arecord_openai_response],
+            },
+        )
+        _openai_async_clients[loop] = client
+    return client
+
+
+async def close_client_sessions():
+    """현재 이벤트 루프의 공용 세션/클라이언트를 닫음 (ASGI lifespan 종료 시 호출)"""
+    loop = asyncio.get_running_loop()
+    session = _sessions.pop(loop, None)
+    if session is not None and not session.closed:
+        await session.close()
+        logger.info("공용 aiohttp 세션 종료")
+
+    client = _openai_async_clients.pop(loop, None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
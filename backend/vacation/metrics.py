@@ -0,0 +1,349 @@
+"""지연 시간/호출 수 계측 모듈
+
+그래프 노드, LLM/임베딩 호출, 네이버/기상청 HTTP 호출, DB 쿼리의 지연 시간을
+히스토그램과 카운터로 기록하고 Prometheus 텍스트 형식으로 노출합니다.
+
+메시지마다 trace ID를 부여하며(contextvar), 같은 메시지 처리 중 기록된 단계별
+시간은 start_trace()가 돌려준 목록에 함께 쌓여 클라이언트로 보낼 수 있습니다.
+
+사용 예:
+    with timed("llm", "response_generator"):
+        ...
+
+    @timed("node", "query_analyzer")
+    def query_analyzer(state): ...
+"""
+
+import asyncio
+import contextvars
+import functools
+import hmac
+import ipaddress
+import logging
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 히스토그램 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+METRIC_PREFIX = "vacation"
+
+# 현재 처리 중인 메시지의 trace ID와 단계별 시간 목록
+trace_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "trace_id", default=None
+)
+_stage_timings_var: contextvars.ContextVar[Optional[List[Dict]]] = (
+    contextvars.ContextVar("stage_timings", default=None)
+)
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels)
+    return "{" + body + "}"
+
+
+class Counter:
+    """레이블별 누적 카운터"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[Tuple[Tuple[str, str], ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(labels)} {value}")
+        return lines
+
+
+class Gauge:
+    """레이블별 현재 값 게이지"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[Tuple[Tuple[str, str], ...], float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """레이블별 누적 버킷 히스토그램"""
+
+    def __init__(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        # 레이블 -> [버킷별 개수..., 합계, 개수]
+        self._values: Dict[Tuple[Tuple[str, str], ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = [0] * (len(self.buckets) + 2)
+                self._values[key] = data
+            if index < len(self.buckets):
+                data[index] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def count(self, **labels) -> int:
+        data = self._values.get(tuple(sorted(labels.items())))
+        return int(data[-1]) if data else 0
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            items = sorted((key, list(data)) for key, data in self._values.items())
+        for labels, data in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, data):
+                cumulative += bucket_count
+                bucket_labels = labels + (("le", f"{bound}"),)
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}"
+                )
+            inf_labels = labels + (("le", "+Inf"),)
+            lines.append(f"{self.name}_bucket{_format_labels(inf_labels)} {int(data[-1])}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {data[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {int(data[-1])}")
+        return lines
+
+
+class Registry:
+    """메트릭 등록/조회 저장소"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._get_or_create(name, lambda: Counter(name, help_text))
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._get_or_create(name, lambda: Gauge(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(name, lambda: Histogram(name, help_text, buckets))
+
+    def _get_or_create(self, name, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = factory()
+                self._metrics[name] = metric
+            return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 전역 레지스트리
+registry = Registry()
+
+stage_latency = registry.histogram(
+    f"{METRIC_PREFIX}_stage_latency_seconds",
+    "Latency of chat pipeline stages (graph nodes, LLM, embeddings, HTTP, DB)",
+)
+stage_calls = registry.counter(
+    f"{METRIC_PREFIX}_stage_calls_total", "Number of calls per stage and outcome"
+)
+
+
+def start_trace(trace_id: Optional[str] = None) -> Tuple[str, List[Dict]]:
+    """현재 컨텍스트에 새 trace를 시작
+
+    이후 같은 컨텍스트(이 컨텍스트에서 생성된 태스크/스레드 포함)에서 기록된
+    단계별 시간은 반환된 목록에 쌓입니다.
+
+    Returns:
+        (trace ID, 단계별 시간 목록) 튜플
+    """
+    trace_id = trace_id or uuid.uuid4().hex[:16]
+    timings: List[Dict] = []
+    trace_id_var.set(trace_id)
+    _stage_timings_var.set(timings)
+    return trace_id, timings
+
+
+def get_trace_id() -> Optional[str]:
+    """현재 컨텍스트의 trace ID"""
+    return trace_id_var.get()
+
+
+def record(kind: str, stage: str, seconds: float, outcome: str = "ok"):
+    """단계 하나의 소요 시간 기록"""
+    stage_latency.observe(seconds, kind=kind, stage=stage)
+    stage_calls.inc(kind=kind, stage=stage, outcome=outcome)
+
+    timings = _stage_timings_var.get()
+    if timings is not None:
+        timings.append(
+            {
+                "kind": kind,
+                "stage": stage,
+                "ms": round(seconds * 1000, 1),
+                "outcome": outcome,
+            }
+        )
+
+
+class timed:
+    """구간 지연 시간을 기록하는 컨텍스트 매니저 겸 데코레이터
+
+    Args:
+        kind: 단계 종류 (node, llm, embedding, http, db, message)
+        stage: 단계 이름
+    """
+
+    def __init__(self, kind: str, stage: str):
+        self.kind = kind
+        self.stage = stage
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        outcome = "ok" if exc_type is None else "error"
+        if exc_type is not None and issubclass(exc_type, asyncio.CancelledError):
+            outcome = "cancelled"
+        record(self.kind, self.stage, time.perf_counter() - self._start, outcome)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+    def __call__(self, func):
+        kind, stage = self.kind, self.stage
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with timed(kind, stage):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(kind, stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+def _db_execute_wrapper(execute, sql, params, many, context):
+    """DB 쿼리 지연 시간 기록 (connection.execute_wrapper 형식)"""
+    operation = (sql or "").lstrip().split(" ", 1)[0].upper() or "UNKNOWN"
+    with timed("db", operation):
+        return execute(sql, params, many, context)
+
+
+def _install_db_wrapper(sender, connection, **kwargs):
+    if _db_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_db_execute_wrapper)
+
+
+def install_db_instrumentation():
+    """새로 만들어지는 모든 DB 연결에 쿼리 계측 래퍼 설치"""
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(_install_db_wrapper, dispatch_uid="vacation_metrics_db")
+
+
+def render_prometheus() -> str:
+    """Prometheus 텍스트 형식의 메트릭 문자열"""
+    return registry.render()
+
+
+def _metrics_allowed(request) -> bool:
+    """METRICS_ALLOWED_NETWORKS 대역에서 온 요청이고, METRICS_TOKEN이 있으면 토큰이 맞는지
+
+    X-Forwarded-For는 조작할 수 있으므로 실제 연결 주소(REMOTE_ADDR)만 확인합니다.
+    로컬(loopback)이 아닌 주소는 허용 대역이어도 METRICS_TOKEN이 설정돼 있어야 합니다
+    (호스트에 공개된 포트로 docker-proxy/사설망을 거쳐 들어온 요청 차단).
+    """
+    from django.conf import settings
+
+    try:
+        client = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+    if not any(
+        client in ipaddress.ip_network(network, strict=False)
+        for network in settings.METRICS_ALLOWED_NETWORKS
+    ):
+        return False
+    if not settings.METRICS_TOKEN:
+        return client.is_loopback
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    given = request.META.get("HTTP_AUTHORIZATION", "")
+    return hmac.compare_digest(given.encode(), expected.encode())
+
+
+def metrics_view(request):
+    """Prometheus 스크레이프용 /metrics 엔드포인트 (허용 대역/토큰이 아니면 403)"""
+    from django.http import HttpResponse, HttpResponseForbidden
+
+    if not _metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
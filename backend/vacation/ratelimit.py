@@ -0,0 +1,271 @@
+"""외부 API(네이버, OpenAI, 기상청) 호출 속도 제한/일일 할당량 모듈
+
+upstream마다 토큰 버킷(초당 rate개 충전, 최대 burst개)을 두고, 토큰은 Django
+캐시의 원자적 incr로 차감하므로 같은 캐시(Redis)를 쓰는 모든 워커가 한도를
+공유합니다(캐시가 locmem이면 프로세스 단위). 토큰이 없으면 다음 충전 시점까지
+최대 UPSTREAM_RATE_LIMIT_MAX_WAIT초 대기(큐잉)하고, 429/5xx 응답은 지수 백오프로
+재시도합니다. 호출 수는 날짜별로 세어 일일 할당량을 넘으면 호출하지 않습니다.
+
+사용 예:
+    status, data = await get_limiter("naver").acall(
+        request_func, params, status_of=lambda result: result[0]
+    )
+"""
+
+import asyncio
+import datetime
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from vacation.metrics import METRIC_PREFIX, record, registry
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+upstream_requests = registry.counter(
+    f"{METRIC_PREFIX}_upstream_requests_total",
+    "Rate limiter decisions and upstream responses (allowed, throttled, rejected, "
+    "quota_exceeded, retry, http_429, http_5xx)",
+)
+quota_used = registry.gauge(
+    f"{METRIC_PREFIX}_upstream_quota_used",
+    "Upstream calls counted against today's quota",
+)
+quota_limit = registry.gauge(
+    f"{METRIC_PREFIX}_upstream_quota_limit", "Configured daily upstream quota"
+)
+
+
+class RateLimitExceeded(Exception):
+    """대기 시간 안에 토큰을 얻지 못함"""
+
+
+class QuotaExceeded(RateLimitExceeded):
+    """일일 할당량 초과"""
+
+
+def is_retryable_status(status: Optional[int]) -> bool:
+    """백오프 후 재시도할 응답 상태 (429, 5xx)"""
+    return status is not None and (status == 429 or 500 <= status < 600)
+
+
+class UpstreamLimiter:
+    """upstream 하나의 토큰 버킷 + 일일 할당량 + 재시도 백오프
+
+    버킷은 burst / rate초 길이의 구간마다 burst개로 다시 채워지며, 구간별 사용량을
+    캐시 키 하나로 세어 여러 워커가 같은 버킷을 공유합니다.
+
+    Args:
+        name: upstream 이름 (메트릭 레이블, 캐시 키 접두어)
+        rate: 초당 허용 호출 수
+        burst: 한 번에 허용하는 최대 호출 수
+        daily_quota: 일일 최대 호출 수 (0이면 제한 없음)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int,
+        daily_quota: int = 0,
+        max_wait: float = 5.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        cache_alias: str = "default",
+    ):
+        self.name = name
+        self.rate = rate
+        self.burst = max(int(burst), 1)
+        self.daily_quota = daily_quota
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache_alias = cache_alias
+        # 버킷이 다시 채워지는 구간 길이 (초)
+        self.window = self.burst / rate if rate > 0 else 0
+        quota_limit.set(daily_quota, upstream=name)
+
+    def _cache(self):
+        from django.core.cache import caches
+
+        return caches[self.cache_alias]
+
+    def _bucket_key(self, now: float) -> str:
+        return f"ratelimit:{self.name}:{int(now // self.window)}"
+
+    def _quota_key(self) -> str:
+        return f"quota:{self.name}:{datetime.date.today():%Y%m%d}"
+
+    def _wait_time(self, now: float) -> float:
+        """다음 버킷 구간 시작까지 남은 시간 (+ 동시 대기자 분산용 지터)"""
+        next_window = (int(now // self.window) + 1) * self.window
+        return next_window - now + random.uniform(0, min(self.window, 0.05))
+
+    def _take_token(self, now: float) -> bool:
+        """현재 버킷 구간의 토큰 하나 차감 (캐시 incr은 원자적)"""
+        cache = self._cache()
+        key = self._bucket_key(now)
+        cache.add(key, 0, timeout=int(self.window) + 2)
+        return cache.incr(key) <= self.burst
+
+    def _count_quota(self) -> Optional[int]:
+        """오늘 호출 수 1 증가 후 반환 (할당량 초과면 QuotaExceeded)"""
+        if not self.daily_quota:
+            return None
+        cache = self._cache()
+        key = self._quota_key()
+        cache.add(key, 0, timeout=2 * 24 * 3600)
+        used = cache.incr(key)
+        quota_used.set(min(used, self.daily_quota), upstream=self.name)
+        if used > self.daily_quota:
+            upstream_requests.inc(upstream=self.name, outcome="quota_exceeded")
+            raise QuotaExceeded(f"{self.name} 일일 할당량 초과 ({self.daily_quota}회)")
+        return used
+
+    def _reject(self, waited: float):
+        upstream_requests.inc(upstream=self.name, outcome="rejected")
+        record("ratelimit", self.name, waited, "rejected")
+        raise RateLimitExceeded(f"{self.name} 호출 한도 대기 시간 초과 ({waited:.1f}초)")
+
+    def _acquired(self, start: float, throttled: bool):
+        upstream_requests.inc(
+            upstream=self.name, outcome="throttled" if throttled else "allowed"
+        )
+        record("ratelimit", self.name, time.monotonic() - start)
+
+    # --- 토큰 획득 ---
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기 (동기, 스레드에서 호출)"""
+        if self.rate <= 0 and not self.daily_quota:
+            return
+        start = time.monotonic()
+        throttled = False
+        while self.rate > 0:
+            now = time.time()
+            if self._take_token(now):
+                break
+            delay = self._wait_time(now)
+            waited = time.monotonic() - start
+            if waited + delay > self.max_wait:
+                self._reject(waited)
+            throttled = True
+            time.sleep(delay)
+        self._count_quota()
+        self._acquired(start, throttled)
+
+    async def aacquire(self):
+        """토큰 하나를 얻을 때까지 대기 (비동기)
+
+        Django 캐시의 aincr은 get + set이라 원자적이지 않으므로 동기 incr을
+        스레드에서 실행합니다.
+        """
+        if self.rate <= 0 and not self.daily_quota:
+            return
+        start = time.monotonic()
+        throttled = False
+        while self.rate > 0:
+            now = time.time()
+            if await sync_to_async(self._take_token, thread_sensitive=False)(now):
+                break
+            delay = self._wait_time(now)
+            waited = time.monotonic() - start
+            if waited + delay > self.max_wait:
+                self._reject(waited)
+            throttled = True
+            await asyncio.sleep(delay)
+        await sync_to_async(self._count_quota, thread_sensitive=False)()
+        self._acquired(start, throttled)
+
+    # --- 응답 기록 / 백오프 ---
+
+    def record_status(self, status: Optional[int]):
+        """429/5xx 응답 수 기록"""
+        if status == 429:
+            upstream_requests.inc(upstream=self.name, outcome="http_429")
+        elif status is not None and 500 <= status < 600:
+            upstream_requests.inc(upstream=self.name, outcome="http_5xx")
+
+    def _backoff(self, attempt: int, status: int) -> float:
+        delay = min(self.backoff_base * (2**attempt), self.backoff_max)
+        delay *= random.uniform(0.5, 1.0)
+        upstream_requests.inc(upstream=self.name, outcome="retry")
+        logger.warning(
+            f"{self.name} 응답 {status}, {delay:.2f}초 후 재시도 ({attempt + 1}/{self.max_retries})"
+        )
+        return delay
+
+    def call(
+        self,
+        func: Callable[..., Any],
+        *args,
+        status_of: Optional[Callable[[Any], Optional[int]]] = None,
+        **kwargs,
+    ) -> Any:
+        """토큰을 얻은 뒤 func를 호출하고, 429/5xx면 백오프 후 재시도 (동기)
+
+        Args:
+            func: 호출할 함수
+            status_of: 결과에서 HTTP 상태 코드를 꺼내는 함수 (없으면 재시도 안 함)
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire()
+            result = func(*args, **kwargs)
+            status = status_of(result) if status_of else None
+            self.record_status(status)
+            if not is_retryable_status(status) or attempt == self.max_retries:
+                return result
+            time.sleep(self._backoff(attempt, status))
+
+    async def acall(
+        self,
+        func: Callable[..., Any],
+        *args,
+        status_of: Optional[Callable[[Any], Optional[int]]] = None,
+        **kwargs,
+    ) -> Any:
+        """call의 비동기 버전 (func는 코루틴 함수)"""
+        for attempt in range(self.max_retries + 1):
+            await self.aacquire()
+            result = await func(*args, **kwargs)
+            status = status_of(result) if status_of else None
+            self.record_status(status)
+            if not is_retryable_status(status) or attempt == self.max_retries:
+                return result
+            await asyncio.sleep(self._backoff(attempt, status))
+
+
+# upstream 이름 -> 리미터
+_limiters: Dict[str, UpstreamLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name: str) -> UpstreamLimiter:
+    """settings.UPSTREAM_RATE_LIMITS 설정으로 만든 upstream 리미터 (싱글톤)"""
+    limiter = _limiters.get(name)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(name)
+            if limiter is None:
+                config = settings.UPSTREAM_RATE_LIMITS.get(name, {})
+                limiter = UpstreamLimiter(
+                    name,
+                    rate=config.get("rate", 0),
+                    burst=config.get("burst", 1),
+                    daily_quota=config.get("daily_quota", 0),
+                    max_wait=settings.UPSTREAM_RATE_LIMIT_MAX_WAIT,
+                    max_retries=settings.UPSTREAM_RETRY_MAX,
+                    backoff_base=settings.UPSTREAM_BACKOFF_BASE,
+                    backoff_max=settings.UPSTREAM_BACKOFF_MAX,
+                    cache_alias=settings.UPSTREAM_RATE_LIMIT_CACHE,
+                )
+                _limiters[name] = limiter
+    return limiter
@@ -139,6 +139,22 @@ DATABASES = {
     }
 }
 
+# 캐시 설정 (REDIS_URL이 있으면 Redis를 사용해 프로세스 간 공유, 없으면 프로세스 메모리)
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -224,6 +240,166 @@ CORS_ALLOW_HEADERS = [
 # OpenAI API 설정
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# 외부 API 주소 설정 (부하 테스트 시 FAKE_UPSTREAM_URL로 로컬 대역 서버를 일괄 지정)
+# 대역 서버 실행: python manage.py run_fake_upstreams
+FAKE_UPSTREAM_URL = os.getenv("FAKE_UPSTREAM_URL", "").rstrip("/")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or (
+    f"{FAKE_UPSTREAM_URL}/v1" if FAKE_UPSTREAM_URL else None
+)
+NAVER_API_BASE_URL = (
+    os.getenv("NAVER_API_BASE_URL") or FAKE_UPSTREAM_URL or "https://openapi.naver.com"
+)
+KMA_API_BASE_URL = (
+    os.getenv("KMA_API_BASE_URL") or FAKE_UPSTREAM_URL or "http://apis.data.go.kr"
+)
+
+# 응답 생성 프롬프트 컨텍스트 토큰 예산 (섹션별, "total"은 전체 상한)
+CHAT_CONTEXT_TOKEN_BUDGETS = {
+    "total": int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", "3000")),
+    "context": int(os.getenv("CHAT_CONTEXT_DOCS_TOKEN_BUDGET", "1800")),
+    "naver_results": int(os.getenv("CHAT_CONTEXT_NAVER_TOKEN_BUDGET", "800")),
+    "recommended_places": int(os.getenv("CHAT_CONTEXT_RECOMMENDED_TOKEN_BUDGET", "300")),
+}
+# 토큰 계산에 사용할 tiktoken 인코딩
+CHAT_TOKENIZER_ENCODING = os.getenv("CHAT_TOKENIZER_ENCODING", "o200k_base")
+
+# 병렬 검색 분기별 제한 시간 (초) - 초과 시 해당 분기 결과 없이 응답 생성
+CHAT_RETRIEVER_TIMEOUT = float(os.getenv("CHAT_RETRIEVER_TIMEOUT", "20"))
+CHAT_NAVER_TIMEOUT = float(os.getenv("CHAT_NAVER_TIMEOUT", "10"))
+# 네이버 지역 검색: 동시에 검색할 검색어 변형 수, 페이지당 결과 수, 결과 부족 시 최대 페이지
+NAVER_SEARCH_MAX_VARIANTS = int(os.getenv("NAVER_SEARCH_MAX_VARIANTS", "3"))
+NAVER_SEARCH_DISPLAY = int(os.getenv("NAVER_SEARCH_DISPLAY", "5"))
+# 실제 네이버 지역 검색 API는 start가 1까지만 허용하므로 기본 1페이지
+# (다음 페이지를 지원하는 호환 upstream에서만 2 이상으로 설정)
+NAVER_SEARCH_MAX_PAGES = int(os.getenv("NAVER_SEARCH_MAX_PAGES", "1"))
+# 네이버 지역 검색 결과 캐시 (TTL 이후 stale 구간 동안은 즉시 반환 + 백그라운드 갱신)
+NAVER_CACHE_TTL = float(os.getenv("NAVER_CACHE_TTL", "3600"))
+NAVER_CACHE_STALE_TTL = float(os.getenv("NAVER_CACHE_STALE_TTL", "21600"))
+NAVER_CACHE_MAXSIZE = int(os.getenv("NAVER_CACHE_MAXSIZE", "1000"))
+# 영구 저장에 사용할 CACHES 별칭 (빈 값이면 프로세스 메모리만 사용)
+NAVER_CACHE_BACKEND = os.getenv("NAVER_CACHE_BACKEND", "default" if REDIS_URL else "")
+
+# 외부 API 호출용 공용 aiohttp 세션 설정 (vacation/http_client.py)
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_TOTAL_TIMEOUT = float(os.getenv("HTTP_TOTAL_TIMEOUT", "15"))
+
+# 외부 API별 호출 한도 (초당 rate, 최대 burst, 일일 할당량 - 0이면 제한 없음)
+# 토큰은 UPSTREAM_RATE_LIMIT_CACHE 캐시에서 차감하므로 Redis를 쓰면 워커 간 공유
+UPSTREAM_RATE_LIMITS = {
+    "naver": {
+        "rate": float(os.getenv("NAVER_RATE_LIMIT", "10")),
+        "burst": int(os.getenv("NAVER_RATE_BURST", "10")),
+        "daily_quota": int(os.getenv("NAVER_DAILY_QUOTA", "25000")),
+    },
+    "openai": {
+        "rate": float(os.getenv("OPENAI_RATE_LIMIT", "50")),
+        "burst": int(os.getenv("OPENAI_RATE_BURST", "50")),
+        "daily_quota": int(os.getenv("OPENAI_DAILY_QUOTA", "0")),
+    },
+    "kma": {
+        "rate": float(os.getenv("KMA_RATE_LIMIT", "10")),
+        "burst": int(os.getenv("KMA_RATE_BURST", "10")),
+        "daily_quota": int(os.getenv("KMA_DAILY_QUOTA", "10000")),
+    },
+}
+UPSTREAM_RATE_LIMIT_CACHE = os.getenv("UPSTREAM_RATE_LIMIT_CACHE", "default")
+# 토큰을 기다리는 최대 시간 (초, 넘으면 RateLimitExceeded)
+UPSTREAM_RATE_LIMIT_MAX_WAIT = float(os.getenv("UPSTREAM_RATE_LIMIT_MAX_WAIT", "5"))
+# 429/5xx 응답 재시도 횟수와 지수 백오프 (초)
+UPSTREAM_RETRY_MAX = int(os.getenv("UPSTREAM_RETRY_MAX", "2"))
+UPSTREAM_BACKOFF_BASE = float(os.getenv("UPSTREAM_BACKOFF_BASE", "0.5"))
+UPSTREAM_BACKOFF_MAX = float(os.getenv("UPSTREAM_BACKOFF_MAX", "8"))
+
+# 외부 API별 서킷 브레이커 (연속 실패/느린 호출 failure_threshold회면 reset_timeout초 동안 차단)
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+CIRCUIT_BREAKERS = {
+    "naver": {
+        "failure_threshold": CIRCUIT_FAILURE_THRESHOLD,
+        "slow_call_threshold": float(os.getenv("CIRCUIT_NAVER_SLOW_CALL", "5")),
+        "reset_timeout": CIRCUIT_RESET_TIMEOUT,
+    },
+    "openai": {
+        "failure_threshold": CIRCUIT_FAILURE_THRESHOLD,
+        "slow_call_threshold": float(os.getenv("CIRCUIT_OPENAI_SLOW_CALL", "40")),
+        "reset_timeout": CIRCUIT_RESET_TIMEOUT,
+    },
+    "kma": {
+        "failure_threshold": int(os.getenv("CIRCUIT_KMA_FAILURE_THRESHOLD", "3")),
+        "slow_call_threshold": float(os.getenv("CIRCUIT_KMA_SLOW_CALL", "8")),
+        "reset_timeout": float(os.getenv("CIRCUIT_KMA_RESET_TIMEOUT", "60")),
+    },
+}
+# OpenAI 요청 타임아웃 (초, 연결은 HTTP_CONNECT_TIMEOUT)
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "45"))
+# 기상청 API 연결/읽기 타임아웃 (초)
+# 단기/중기예보는 동시에 요청하며, 종류별 타임아웃이 지나면 마지막 정상 데이터 사용
+KMA_CONNECT_TIMEOUT = float(os.getenv("KMA_CONNECT_TIMEOUT", "3"))
+KMA_SHORT_TERM_TIMEOUT = float(os.getenv("KMA_SHORT_TERM_TIMEOUT", "10"))
+KMA_MID_TERM_TIMEOUT = float(os.getenv("KMA_MID_TERM_TIMEOUT", "8"))
+KMA_FETCH_WORKERS = int(os.getenv("KMA_FETCH_WORKERS", "4"))
+# 기상청 API 장애 시 대신 사용할 마지막 정상 날씨 보관 시간 (초)
+WEATHER_LAST_GOOD_TTL = int(os.getenv("WEATHER_LAST_GOOD_TTL", "86400"))
+
+# 발표 시각별 날씨 예보 저장/갱신 (calendar_app/weather.py, WeatherForecast 테이블)
+# 하루 한 번 발표되는 중기예보 구역별 캐시 보관 시간 (초)
+WEATHER_CACHE_TTL = int(os.getenv("WEATHER_CACHE_TTL", "43200"))
+# 발표 시각 구간이 바뀐 뒤 갱신까지 기다리는 시간 / 갱신 실패 시 재시도 간격 (초)
+WEATHER_REFRESH_DELAY = float(os.getenv("WEATHER_REFRESH_DELAY", "60"))
+WEATHER_RETRY_INTERVAL = float(os.getenv("WEATHER_RETRY_INTERVAL", "300"))
+WEATHER_REFRESH_LOCK_TIMEOUT = int(os.getenv("WEATHER_REFRESH_LOCK_TIMEOUT", "120"))
+# 프로세스당 발표 시각마다 갱신할 최대 예보 격자 수 (일정 장소별 격자)
+WEATHER_MAX_TARGETS = int(os.getenv("WEATHER_MAX_TARGETS", "64"))
+# 새 발표분 저장 후 일정 날씨(weather_main/weather_icon)를 한 번에 갱신할 일정 수
+SCHEDULE_WEATHER_BATCH_SIZE = int(os.getenv("SCHEDULE_WEATHER_BATCH_SIZE", "500"))
+# 일정 목록 API 페이지 크기 (기본 / 최대)
+SCHEDULE_PAGE_SIZE = int(os.getenv("SCHEDULE_PAGE_SIZE", "200"))
+SCHEDULE_MAX_PAGE_SIZE = int(os.getenv("SCHEDULE_MAX_PAGE_SIZE", "500"))
+# 추천 장소 일괄 추가 API 한 번에 받을 최대 장소 수
+RECOMMENDED_PLACES_BULK_MAX = int(os.getenv("RECOMMENDED_PLACES_BULK_MAX", "50"))
+# ASGI 서버 시작 시 날씨 갱신 스레드 실행 여부
+WEATHER_REFRESH_ON_START = os.getenv("WEATHER_REFRESH_ON_START", "True") == "True"
+
+# 메시지당 지연 시간 예산 (초) - 남은 시간이 단계별 임계값보다 적으면 선택 작업 생략
+CHAT_LATENCY_BUDGET = float(os.getenv("CHAT_LATENCY_BUDGET", "30"))
+CHAT_DEGRADE_THRESHOLDS = {
+    "district_lookup": float(os.getenv("CHAT_DEGRADE_DISTRICT_LOOKUP", "20")),
+    "naver_retry": float(os.getenv("CHAT_DEGRADE_NAVER_RETRY", "15")),
+    "place_name_extraction": float(os.getenv("CHAT_DEGRADE_PLACE_NAME", "12")),
+    "response_reserve": float(os.getenv("CHAT_RESPONSE_RESERVE", "8")),
+}
+# 예산을 넘긴 뒤 그래프 실행을 강제로 끊기까지의 추가 유예 시간 (초)
+CHAT_DEADLINE_GRACE = float(os.getenv("CHAT_DEADLINE_GRACE", "15"))
+
+# ASGI 서버 시작 시 워밍업 실행 여부 (임포트 시간 측정 등에서는 끌 수 있음)
+CHAT_WARMUP_ON_START = os.getenv("CHAT_WARMUP_ON_START", "True") == "True"
+# vacation.asgi 콜드 임포트 시간 예산 (밀리초, check_import_time 명령에서 사용)
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1000"))
+
+# 메시지 처리 전 워밍업 완료를 기다리는 최대 시간 (초)
+CHAT_WARMUP_WAIT_TIMEOUT = float(os.getenv("CHAT_WARMUP_WAIT_TIMEOUT", "120"))
+
+# 최종 응답에 단계별 소요 시간(timings)을 포함할지 여부
+# (False여도 클라이언트가 메시지에 "timings": true를 보내면 포함)
+CHAT_SEND_TIMINGS = os.getenv("CHAT_SEND_TIMINGS", "False") == "True"
+# RAG 문서 필터링/BM25 점수 계산 전용 스레드 수
+CHAT_SCORING_WORKERS = int(os.getenv("CHAT_SCORING_WORKERS", "4"))
+
+# /metrics 접근 허용 대역 (쉼표 구분 CIDR, 기본: 로컬만)
+# docker-compose가 8000 포트를 호스트에 직접 열어 nginx 차단을 거치지 않으므로,
+# 로컬이 아닌 주소(스크레이퍼 네트워크 등)는 이 대역에 넣고 METRICS_TOKEN(Bearer)도 설정해야 허용
+METRICS_ALLOWED_NETWORKS = [
+    network.strip()
+    for network in os.getenv("METRICS_ALLOWED_NETWORKS", "127.0.0.0/8,::1/128").split(",")
+    if network.strip()
+]
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 # 로그인 관련 설정 추가
 LOGIN_URL = "/login/"
 LOGIN_REDIRECT_URL = "/chat/"
@@ -0,0 +1,96 @@
+"""동일한 외부 호출을 하나로 합치는 single-flight 모듈
+
+같은 키(임베딩 텍스트, 프롬프트 해시, 네이버 검색어 등)로 동시에 들어온 호출은
+먼저 시작된 호출 하나의 결과를 함께 기다리고, 중복 요청을 보내지 않습니다.
+결과는 저장하지 않으므로 진행 중인 호출이 끝나면 다음 호출은 새로 실행됩니다.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+def make_key(*parts: Any) -> str:
+    """호출 인자로부터 single-flight 키(해시) 생성"""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """키 단위로 진행 중인 호출을 공유하는 그룹
+
+    - do(): 스레드에서 호출되는 동기 함수용 (스레드 간 공유)
+    - ado(): 이벤트 루프에서 호출되는 코루틴용 (같은 루프 안에서 공유)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._tasks: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+        # 합쳐진(중복 제거된) 호출 수 - 모니터링용
+        self.shared_count = 0
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """동기 함수를 키 단위로 한 번만 실행하고 결과를 공유"""
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.shared_count += 1
+
+        if not is_leader:
+            logger.debug(f"[{self.name}] 진행 중인 호출 결과 공유: {key}")
+            return future.result()
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def ado(
+        self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs
+    ) -> Any:
+        """코루틴 함수를 키 단위로 한 번만 실행하고 결과를 공유
+
+        대기 중인 호출 하나가 취소되어도 공유 중인 호출은 취소되지 않습니다.
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = loop.create_task(func(*args, **kwargs))
+                self._tasks[task_key] = task
+                task.add_done_callback(lambda done: self._on_task_done(task_key, done))
+            else:
+                self.shared_count += 1
+                logger.debug(f"[{self.name}] 진행 중인 비동기 호출 결과 공유: {key}")
+
+        return await asyncio.shield(task)
+
+    def _on_task_done(self, task_key: Tuple[int, Hashable], task: asyncio.Task):
+        with self._lock:
+            self._tasks.pop(task_key, None)
+        # 대기자가 모두 취소돼 아무도 결과를 받지 않아도 예외를 회수해
+        # "Task exception was never retrieved" 경고가 남지 않게 함
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"[{self.name}] 공유 호출 실패: {task.exception()!r}")
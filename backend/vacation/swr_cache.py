@@ -0,0 +1,203 @@
+"""TTL + LRU 캐시 (stale-while-revalidate 지원) 모듈
+
+외부 API 결과처럼 자주 바뀌지 않는 값을 프로세스 메모리(LRU)에 보관하고,
+설정하면 Django 캐시(Redis 등)에도 저장해 프로세스 간에 공유합니다.
+
+- fresh: TTL 이내 값은 그대로 반환
+- stale: TTL이 지났지만 stale 구간 이내인 값은 즉시 반환하고 백그라운드에서 갱신
+- miss: 값이 없거나 stale 구간도 지났으면 직접 가져와서 저장
+
+사용 예:
+    cache = SWRCache("naver_local", ttl=3600, stale_ttl=86400, maxsize=1000)
+    value = await cache.aget_or_fetch(key, fetch_coroutine_function)
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Set, Tuple
+
+from vacation.metrics import METRIC_PREFIX, registry
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+cache_requests = registry.counter(
+    f"{METRIC_PREFIX}_cache_requests_total",
+    "Cache lookups by cache name and result (hit, stale, miss, refresh, refresh_error)",
+)
+
+# 캐시 항목: (값, 저장 시각 time.time())
+Entry = Tuple[Any, float]
+
+
+class SWRCache:
+    """메모리 LRU + 선택적 Django 캐시 저장소를 쓰는 stale-while-revalidate 캐시
+
+    Args:
+        name: 캐시 이름 (메트릭 레이블, 저장소 키 접두어)
+        ttl: 값을 새것으로 취급하는 시간 (초)
+        stale_ttl: TTL이 지난 뒤에도 반환하면서 백그라운드 갱신하는 추가 시간 (초)
+        maxsize: 메모리에 보관할 최대 항목 수
+        backend: 영구 저장에 사용할 Django 캐시 별칭 (None이면 메모리만 사용)
+        should_cache: 가져온 값을 저장할지 판단하는 함수 (기본: None이 아니면 저장)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        stale_ttl: float = 0,
+        maxsize: int = 1000,
+        backend: Optional[str] = None,
+        should_cache: Optional[Callable[[Any], bool]] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self.backend = backend or None
+        self.should_cache = should_cache or (lambda value: value is not None)
+        self._entries: "OrderedDict[str, Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing: Set[str] = set()
+        # 백그라운드 갱신 태스크가 GC되지 않도록 참조 보관
+        self._tasks: Set[asyncio.Task] = set()
+
+    # --- 저장소 ---
+
+    def _storage_key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    def _get_backend(self):
+        if not self.backend:
+            return None
+        from django.core.cache import caches
+
+        return caches[self.backend]
+
+    def _get_local(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _set_local(self, key: str, entry: Entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    async def _aget_entry(self, key: str) -> Optional[Entry]:
+        entry = self._get_local(key)
+        if entry is not None:
+            return entry
+
+        backend = self._get_backend()
+        if backend is None:
+            return None
+        try:
+            stored = await backend.aget(self._storage_key(key))
+        except Exception as e:
+            logger.warning(f"[{self.name}] 캐시 저장소 조회 실패: {e}")
+            return None
+        if not stored:
+            return None
+        entry = (stored[0], stored[1])
+        self._set_local(key, entry)
+        return entry
+
+    async def aset(self, key: str, value: Any):
+        """값 저장 (메모리와 영구 저장소)"""
+        entry = (value, time.time())
+        self._set_local(key, entry)
+
+        backend = self._get_backend()
+        if backend is None:
+            return
+        try:
+            await backend.aset(
+                self._storage_key(key), entry, timeout=self.ttl + self.stale_ttl
+            )
+        except Exception as e:
+            logger.warning(f"[{self.name}] 캐시 저장소 저장 실패: {e}")
+
+    async def aget(
+        self, key: str, allow_stale: bool = True, allow_expired: bool = False
+    ) -> Optional[Any]:
+        """저장된 값 조회 (가져오기 없이, 없거나 만료됐으면 None)
+
+        Args:
+            allow_stale: TTL이 지났지만 stale 구간 이내인 값도 반환
+            allow_expired: stale 구간도 지났지만 아직 메모리에 남은 마지막 값도 반환
+                (upstream 장애 시 대체 응답용)
+        """
+        entry = await self._aget_entry(key)
+        if entry is None:
+            return None
+        if allow_expired:
+            return entry[0]
+        age = time.time() - entry[1]
+        limit = self.ttl + (self.stale_ttl if allow_stale else 0)
+        return entry[0] if age <= limit else None
+
+    def clear(self):
+        """메모리 캐시 비우기"""
+        with self._lock:
+            self._entries.clear()
+
+    # --- 조회 + 가져오기 ---
+
+    async def _fetch_and_store(self, key: str, fetch: Callable[[], Awaitable[Any]]):
+        value = await fetch()
+        if self.should_cache(value):
+            await self.aset(key, value)
+        return value
+
+    async def _refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]):
+        try:
+            await self._fetch_and_store(key, fetch)
+            cache_requests.inc(cache=self.name, result="refresh")
+        except Exception as e:
+            cache_requests.inc(cache=self.name, result="refresh_error")
+            logger.warning(f"[{self.name}] 백그라운드 갱신 실패: {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    def _schedule_refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]):
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.get_running_loop().create_task(self._refresh(key, fetch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def aget_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """캐시 값을 반환하고, 없거나 오래됐으면 fetch()로 가져옴
+
+        Args:
+            key: 캐시 키
+            fetch: 인자 없는 코루틴 함수 (값을 새로 가져옴)
+
+        Returns:
+            캐시된 값 또는 새로 가져온 값
+        """
+        entry = await self._aget_entry(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.time() - stored_at
+            if age <= self.ttl:
+                cache_requests.inc(cache=self.name, result="hit")
+                return value
+            if age <= self.ttl + self.stale_ttl:
+                # 오래된 값을 즉시 반환하고 백그라운드에서 갱신
+                cache_requests.inc(cache=self.name, result="stale")
+                self._schedule_refresh(key, fetch)
+                return value
+
+        cache_requests.inc(cache=self.name, result="miss")
+        return await self._fetch_and_store(key, fetch)
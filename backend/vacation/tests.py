@@ -0,0 +1,449 @@
+import asyncio
+import gc
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from .circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from .metrics import metrics_view
+from .ratelimit import QuotaExceeded, RateLimitExceeded, UpstreamLimiter
+from .singleflight import SingleFlight
+from .swr_cache import SWRCache
+
+
+class FakeClock:
+    """모듈의 time 대신 쓰는 수동 시계 (sleep은 기다리지 않고 시각만 이동)"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    monotonic = time
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.advance(seconds)
+
+    async def async_sleep(self, seconds):
+        self.sleep(seconds)
+
+
+class SWRCacheTests(SimpleTestCase):
+    """TTL 만료, stale-while-revalidate 갱신, LRU 제거"""
+
+    def setUp(self):
+        cache.clear()
+        self.clock = FakeClock()
+        patcher = mock.patch("vacation.swr_cache.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.calls = 0
+
+    async def fetch(self):
+        self.calls += 1
+        return f"value {self.calls}"
+
+    async def drain(self, swr):
+        """백그라운드 갱신 태스크가 끝날 때까지 대기"""
+        while swr._tasks:
+            await asyncio.gather(*swr._tasks)
+
+    async def test_fresh_hit_and_expiry(self):
+        swr = SWRCache("test_ttl", ttl=10)
+        self.assertEqual(await swr.aget_or_fetch("k", self.fetch), "value 1")
+        self.clock.advance(10)
+        self.assertEqual(await swr.aget_or_fetch("k", self.fetch), "value 1")
+        # TTL이 지나고 stale 구간이 없으면 직접 다시 가져옴
+        self.clock.advance(1)
+        self.assertEqual(await swr.aget_or_fetch("k", self.fetch), "value 2")
+        self.assertEqual(self.calls, 2)
+
+    async def test_stale_value_returned_while_refreshing(self):
+        swr = SWRCache("test_swr", ttl=10, stale_ttl=50)
+        await swr.aget_or_fetch("k", self.fetch)
+        self.clock.advance(30)
+        # 오래된 값을 바로 반환하고, 동시에 여러 번 조회해도 갱신은 한 번
+        results = [await swr.aget_or_fetch("k", self.fetch) for _ in range(3)]
+        self.assertEqual(results, ["value 1"] * 3)
+        await self.drain(swr)
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(await swr.aget_or_fetch("k", self.fetch), "value 2")
+        # stale 구간까지 지나면 기다려서 새로 가져옴
+        self.clock.advance(61)
+        self.assertEqual(await swr.aget_or_fetch("k", self.fetch), "value 3")
+        self.assertIsNone(await swr.aget("missing"))
+
+    async def test_failed_refresh_keeps_stale_value(self):
+        swr = SWRCache("test_swr_error", ttl=10, stale_ttl=50)
+        await swr.aset("k", "old")
+        self.clock.advance(20)
+
+        async def broken():
+            raise RuntimeError("upstream down")
+
+        self.assertEqual(await swr.aget_or_fetch("k", broken), "old")
+        await asyncio.gather(*swr._tasks)
+        self.assertEqual(await swr.aget("k"), "old")
+        self.assertFalse(swr._refreshing)
+
+    async def test_should_cache_skips_failures(self):
+        swr = SWRCache("test_should_cache", ttl=10, should_cache=lambda v: v != "value 1")
+        await swr.aget_or_fetch("k", self.fetch)
+        self.assertEqual(await swr.aget_or_fetch("k", self.fetch), "value 2")
+        self.assertEqual(await swr.aget_or_fetch("k", self.fetch), "value 2")
+
+    async def test_lru_eviction(self):
+        swr = SWRCache("test_lru", ttl=10, maxsize=2)
+        await swr.aset("a", 1)
+        await swr.aset("b", 2)
+        # a를 최근 사용으로 만든 뒤 c를 넣으면 b가 제거됨
+        self.assertEqual(await swr.aget("a"), 1)
+        await swr.aset("c", 3)
+        self.assertEqual(list(swr._entries), ["a", "c"])
+        self.assertIsNone(await swr.aget("b"))
+
+    async def test_backend_shares_entries(self):
+        swr = SWRCache("test_backend", ttl=10, backend="default")
+        await swr.aset("k", "shared")
+        swr.clear()
+        # 메모리에 없으면 Django 캐시에서 읽어 다시 메모리에 보관
+        self.assertEqual(await swr.aget_or_fetch("k", self.fetch), "shared")
+        self.assertEqual(self.calls, 0)
+        self.assertIn("k", swr._entries)
+
+
+class MetricsAccessTests(SimpleTestCase):
+    """/metrics는 로컬, 또는 허용 대역 + 토큰으로만 접근 가능"""
+
+    def get(self, addr, token=None):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"} if token else {}
+        request = RequestFactory().get("/metrics", REMOTE_ADDR=addr, **headers)
+        return metrics_view(request).status_code
+
+    def test_default_allows_only_loopback(self):
+        self.assertEqual(self.get("127.0.0.1"), 200)
+        self.assertEqual(self.get("::1"), 200)
+        # 호스트에 공개된 8000 포트로 docker-proxy/사설망을 거쳐 온 요청
+        self.assertEqual(self.get("172.17.0.1"), 403)
+        self.assertEqual(self.get("10.0.0.5"), 403)
+
+    @override_settings(METRICS_ALLOWED_NETWORKS=["127.0.0.0/8", "172.18.0.0/16"])
+    def test_scraper_network_requires_token(self):
+        self.assertEqual(self.get("172.18.0.3"), 403)
+        with override_settings(METRICS_TOKEN="secret"):
+            self.assertEqual(self.get("172.18.0.3", "secret"), 200)
+            self.assertEqual(self.get("172.18.0.3", "wrong"), 403)
+            self.assertEqual(self.get("172.19.0.3", "secret"), 403)
+            self.assertEqual(self.get("127.0.0.1"), 403)
+
+
+class UpstreamLimiterTests(SimpleTestCase):
+    """토큰 버킷 구간, 대기 한도, 일일 할당량, 429/5xx 재시도"""
+
+    def setUp(self):
+        cache.clear()
+        self.clock = FakeClock()
+        for target, fake in [
+            ("vacation.ratelimit.time", self.clock),
+            ("vacation.ratelimit.asyncio", SimpleNamespace(sleep=self.clock.async_sleep)),
+        ]:
+            patcher = mock.patch(target, fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def limiter(self, name, **kwargs):
+        options = {"rate": 2, "burst": 2, "max_wait": 5, "backoff_base": 0.5}
+        return UpstreamLimiter(name, **{**options, **kwargs})
+
+    def test_take_token_window_rollover(self):
+        limiter = self.limiter("test_window")
+        self.assertEqual(limiter.window, 1)
+        now = self.clock.time()
+        self.assertTrue(limiter._take_token(now))
+        self.assertTrue(limiter._take_token(now + 0.5))
+        self.assertFalse(limiter._take_token(now + 0.9))
+        # 다음 구간에서는 burst개가 다시 채워짐
+        self.assertTrue(limiter._take_token(now + 1))
+
+    def test_acquire_waits_for_next_window(self):
+        limiter = self.limiter("test_wait", rate=1, burst=1)
+        limiter.acquire()
+        limiter.acquire()
+        self.assertEqual(len(self.clock.sleeps), 1)
+        self.assertGreaterEqual(self.clock.sleeps[0], 1)
+
+    def test_max_wait_rejection(self):
+        limiter = self.limiter("test_reject", rate=1, burst=1, max_wait=0.5)
+        limiter.acquire()
+        with self.assertRaises(RateLimitExceeded):
+            limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_daily_quota(self):
+        limiter = self.limiter("test_quota", rate=0, daily_quota=2)
+        limiter.acquire()
+        limiter.acquire()
+        with self.assertRaises(QuotaExceeded):
+            limiter.acquire()
+        # 할당량 초과도 호출 한도 초과로 처리됨 (차단기 실패로 세지 않음)
+        self.assertTrue(issubclass(QuotaExceeded, RateLimitExceeded))
+
+    def test_call_retries_retryable_status(self):
+        limiter = self.limiter("test_retry", rate=0, max_retries=2)
+        for statuses, calls in [([429, 429, 429], 3), ([503, 200], 2), ([404], 1)]:
+            with self.subTest(statuses=statuses):
+                func = mock.Mock(side_effect=statuses)
+                self.clock.sleeps.clear()
+                result = limiter.call(func, status_of=lambda status: status)
+                self.assertEqual(func.call_count, calls)
+                self.assertEqual(result, statuses[-1])
+                self.assertEqual(len(self.clock.sleeps), calls - 1)
+
+    async def test_acall_retries_retryable_status(self):
+        limiter = self.limiter("test_aretry", rate=0, max_retries=2)
+        func = mock.AsyncMock(side_effect=[500, 429, 500])
+        result = await limiter.acall(func, status_of=lambda status: status)
+        self.assertEqual(func.await_count, 3)
+        self.assertEqual(result, 500)
+        # 지수 백오프 (지터 0.5~1배)
+        self.assertEqual(len(self.clock.sleeps), 2)
+        self.assertLessEqual(self.clock.sleeps[0], 0.5)
+        self.assertGreaterEqual(self.clock.sleeps[1], 0.5)
+
+    async def test_aacquire_rejects_after_max_wait(self):
+        limiter = self.limiter("test_areject", rate=1, burst=1, max_wait=0.5)
+        await limiter.aacquire()
+        with self.assertRaises(RateLimitExceeded):
+            await limiter.aacquire()
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    """차단기 상태 전환, 느린 호출, half-open 시험 호출, 호출 한도 예외 처리"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("vacation.circuit.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def breaker(self, **kwargs):
+        options = {"failure_threshold": 3, "slow_call_threshold": 2, "reset_timeout": 30}
+        return CircuitBreaker("test", **{**options, **kwargs})
+
+    def call_failing(self, breaker, error=None):
+        def broken():
+            raise error or ConnectionError("down")
+
+        with self.assertRaises(Exception):
+            breaker.call(broken)
+
+    def open_breaker(self, breaker):
+        for _ in range(breaker.failure_threshold):
+            self.call_failing(breaker)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_opens_after_failure_threshold(self):
+        breaker = self.breaker()
+        self.call_failing(breaker)
+        self.call_failing(breaker)
+        # 성공하면 연속 실패 수가 초기화됨
+        breaker.call(lambda: "ok")
+        self.call_failing(breaker)
+        self.call_failing(breaker)
+        self.assertEqual(breaker.state, CLOSED)
+        self.call_failing(breaker)
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.call(lambda: "ok")
+        # 5xx처럼 예외 없이 반환된 실패 결과도 실패로 셈
+        breaker = self.breaker(failure_threshold=1)
+        breaker.call(lambda: 503, is_failure=lambda status: status >= 500)
+        self.assertTrue(breaker.is_open())
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = self.breaker()
+
+        def slow():
+            self.clock.advance(3)
+            return "late"
+
+        for _ in range(2):
+            self.assertEqual(breaker.call(slow), "late")
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.call(slow)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_half_open_probe_limit(self):
+        breaker = self.breaker()
+        self.open_breaker(breaker)
+        self.clock.advance(30)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.is_open())
+        # 시험 호출은 half_open_max_calls개만 허용
+        breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        breaker.on_success(0.1)
+        self.assertEqual(breaker.state, CLOSED)
+
+        # 시험 호출이 실패하면 다시 열림
+        self.open_breaker(breaker)
+        self.clock.advance(30)
+        self.call_failing(breaker)
+        self.assertEqual(breaker.state, OPEN)
+
+    async def test_cancelled_probe_releases_slot(self):
+        breaker = self.breaker()
+        self.open_breaker(breaker)
+        self.clock.advance(30)
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.Event().wait()
+
+        task = asyncio.ensure_future(breaker.acall(hang))
+        await started.wait()
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        # 취소는 실패로 세지 않고 시험 호출 자리만 반환
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertEqual(await breaker.acall(mock.AsyncMock(return_value="ok")), "ok")
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_throttling_is_not_a_failure(self):
+        breaker = self.breaker(failure_threshold=1)
+        # SDK가 RateLimitExceeded를 감싸서 다시 발생시킨 경우
+        try:
+            try:
+                raise QuotaExceeded("quota")
+            except QuotaExceeded as e:
+                raise ConnectionError("wrapped") from e
+        except ConnectionError as e:
+            wrapped = e
+        self.call_failing(breaker, RateLimitExceeded("throttled"))
+        self.call_failing(breaker, wrapped)
+        self.assertEqual(breaker.state, CLOSED)
+        self.call_failing(breaker)
+        self.assertEqual(breaker.state, OPEN)
+
+
+class SingleFlightTests(SimpleTestCase):
+    """동시 호출 합치기와 모든 대기자에게 결과/예외 전달"""
+
+    def run_threads(self, flight, func, count=4):
+        """count개 스레드에서 같은 키로 do()를 호출하고 (결과 또는 예외) 목록 반환"""
+        release = threading.Event()
+        results = []
+
+        def leader_func():
+            release.wait(5)
+            return func()
+
+        def worker():
+            try:
+                results.append(flight.do("key", leader_func))
+            except Exception as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        # 나머지 스레드가 모두 진행 중인 호출에 합류한 뒤 결과 반환
+        deadline = time.monotonic() + 5
+        while flight.shared_count < count - 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_do_coalesces_threads(self):
+        flight = SingleFlight("test_do")
+        func = mock.Mock(return_value="result")
+        self.assertEqual(self.run_threads(flight, func), ["result"] * 4)
+        self.assertEqual(func.call_count, 1)
+        self.assertFalse(flight._calls)
+        # 끝난 뒤의 호출은 새로 실행
+        self.assertEqual(flight.do("key", func), "result")
+        self.assertEqual(func.call_count, 2)
+
+    def test_do_propagates_error_to_all_waiters(self):
+        flight = SingleFlight("test_do_error")
+        error = ValueError("boom")
+        results = self.run_threads(flight, mock.Mock(side_effect=error))
+        self.assertEqual(results, [error] * 4)
+
+    async def test_ado_coalesces_and_propagates_error(self):
+        flight = SingleFlight("test_ado")
+        func = mock.AsyncMock(return_value="result")
+        results = await asyncio.gather(*(flight.ado("key", func) for _ in range(5)))
+        self.assertEqual(results, ["result"] * 5)
+        self.assertEqual(func.await_count, 1)
+        self.assertEqual(flight.shared_count, 4)
+
+        func = mock.AsyncMock(side_effect=ValueError("boom"))
+        results = await asyncio.gather(
+            *(flight.ado("key", func) for _ in range(3)), return_exceptions=True
+        )
+        self.assertEqual(func.await_count, 1)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    async def test_ado_cancelled_waiter_does_not_cancel_shared_call(self):
+        flight = SingleFlight("test_ado_cancel")
+        gate = asyncio.Event()
+
+        async def slow():
+            await gate.wait()
+            return "result"
+
+        first = asyncio.ensure_future(flight.ado("key", slow))
+        second = asyncio.ensure_future(flight.ado("key", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        gate.set()
+        self.assertEqual(await second, "result")
+        self.assertTrue(first.cancelled())
+
+    async def cancel_all_waiters(self, flight, func):
+        """같은 키의 대기자를 모두 취소한 뒤 공유 호출을 끝내고 정리될 때까지 대기"""
+        gate = asyncio.Event()
+
+        async def gated():
+            await gate.wait()
+            return await func()
+
+        waiters = [asyncio.ensure_future(flight.ado("key", gated)) for _ in range(3)]
+        await asyncio.sleep(0)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        gate.set()
+        while flight._tasks:
+            await asyncio.sleep(0)
+
+    async def test_ado_error_retrieved_when_all_waiters_cancelled(self):
+        flight = SingleFlight("test_ado_orphan")
+        loop = asyncio.get_running_loop()
+        errors = []
+        loop.set_exception_handler(lambda _loop, context: errors.append(context))
+        self.addCleanup(loop.set_exception_handler, None)
+
+        async def failing():
+            raise ValueError("boom")
+
+        # 대기자 프레임이 모두 끝난 뒤 공유 태스크가 GC될 때 경고가 없어야 함
+        await self.cancel_all_waiters(flight, failing)
+        gc.collect()
+        self.assertEqual(errors, [])
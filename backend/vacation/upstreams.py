@@ -0,0 +1,75 @@
+"""외부 API(OpenAI, 네이버, 기상청) 주소 설정 모듈
+
+부하 테스트나 벤치마크에서는 settings의 *_BASE_URL 값(또는 FAKE_UPSTREAM_URL)을
+로컬 대역 서버로 바꿔 실제 API 할당량을 사용하지 않고 실행할 수 있습니다.
+"""
+
+from django.conf import settings
+
+
+def get_openai_base_url():
+    """OpenAI API 주소 반환 (설정이 없으면 None - 기본 주소 사용)"""
+    return getattr(settings, "OPENAI_BASE_URL", None) or None
+
+
+def openai_client_kwargs() -> dict:
+    """ChatOpenAI / OpenAI 클라이언트 생성 시 넘길 공통 인자"""
+    base_url = get_openai_base_url()
+    return {"base_url": base_url} if base_url else {}
+
+
+def openai_timeout():
+    """OpenAI 요청 타임아웃 (연결 HTTP_CONNECT_TIMEOUT초, 나머지 OPENAI_TIMEOUT초)"""
+    import httpx
+
+    return httpx.Timeout(settings.OPENAI_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT)
+
+
+def chat_model_kwargs() -> dict:
+    """ChatOpenAI 생성 시 넘길 공통 인자 (공용 httpx 클라이언트 포함)
+
+    ChatOpenAI를 호출마다 만들어도 연결 풀은 프로세스(이벤트 루프) 단위로 재사용합니다.
+    """
+    from vacation.http_client import (
+        get_openai_async_http_client,
+        get_openai_http_client,
+    )
+
+    kwargs = openai_client_kwargs()
+    kwargs["timeout"] = openai_timeout()
+    kwargs["http_client"] = get_openai_http_client()
+    async_client = get_openai_async_http_client()
+    if async_client is not None:
+        kwargs["http_async_client"] = async_client
+    return kwargs
+
+
+def embeddings_kwargs() -> dict:
+    """OpenAIEmbeddings 생성 시 넘길 공통 인자
+
+    대역 서버를 사용할 때는 tiktoken 파일을 내려받지 않도록 토큰 길이 검사를 끕니다.
+    동기 임베딩 요청은 공용 httpx 클라이언트(호출 한도 적용)를 사용합니다. 임베딩
+    모델은 프로세스 싱글톤이라 이벤트 루프별 비동기 클라이언트를 넘길 수 없으므로,
+    비동기 요청의 호출 한도/차단기는 CoalescingOpenAIEmbeddings.aembed_query에서
+    적용합니다.
+    """
+    from vacation.http_client import get_openai_http_client
+
+    kwargs = openai_client_kwargs()
+    if kwargs:
+        kwargs["check_embedding_ctx_length"] = False
+    kwargs["timeout"] = openai_timeout()
+    kwargs["http_client"] = get_openai_http_client()
+    return kwargs
+
+
+def naver_api_url(path: str) -> str:
+    """네이버 오픈 API 전체 주소 생성"""
+    base_url = getattr(settings, "NAVER_API_BASE_URL", "https://openapi.naver.com")
+    return f"{base_url.rstrip('/')}{path}"
+
+
+def kma_api_url(path: str) -> str:
+    """기상청(공공데이터포털) API 전체 주소 생성"""
+    base_url = getattr(settings, "KMA_API_BASE_URL", "http://apis.data.go.kr")
+    return f"{base_url.rstrip('/')}{path}"
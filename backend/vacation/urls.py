@@ -17,9 +17,14 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path, include
+from vacation.metrics import metrics_view
+from chatbot.warmup import healthz_view, readyz_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
+    path("healthz", healthz_view, name="healthz"),
+    path("readyz", readyz_view, name="readyz"),
     path("", include("accounts.urls")),
     path("calendar/", include("calendar_app.urls")),
     path("chat/", include("chatbot.urls")),
@@ -260,6 +260,9 @@ async function loadScheduleDirectly() {
         
         // 일정 정보 채우기
         if (foundSchedule) {
+            // 메모는 목록 API에 포함되지 않으므로 상세 API로 조회
+            foundSchedule.memo = await fetchScheduleMemo(foundSchedule.id, token);
+            
             const locationInput = document.getElementById('location');
             const companionInput = document.getElementById('companion');
             const memoInput = document.getElementById('memo');
@@ -504,8 +507,8 @@ async function fetchWeatherForDate(dateStr) {
         }
         
         // 3. 일정 API 요청으로 날씨 데이터 가져오기 
-        // (백엔드에는 별도 weather API가 없고 일정 API에서 날씨 정보를 포함하여 반환)
-        const response = await fetch(`${BACKEND_BASE_URL}/calendar/schedules/`, {
+        // (백엔드에는 별도 weather API가 없고 일정 API에서 조회 날짜의 날씨 정보를 포함하여 반환)
+        const response = await fetch(`${BACKEND_BASE_URL}/calendar/schedules/?date=${normalizedDate}`, {
             headers: {'Authorization': `Bearer ${token}`}
         });
         
@@ -864,8 +867,8 @@ async function saveScheduleToDB() {
             return;
         }
         
-        // 기존 일정이 있는지 먼저 확인 (중복 저장 방지)
-        const checkResponse = await fetch(`${BACKEND_BASE_URL}/calendar/schedules/`, {
+        // 기존 일정이 있는지 먼저 확인 (중복 저장 방지, 해당 날짜 일정만 조회)
+        const checkResponse = await fetch(`${BACKEND_BASE_URL}/calendar/schedules/?date=${normalizedDate}&fields=id,date`, {
                 headers: {
                     'Authorization': `Bearer ${accessToken}`
                 }
@@ -1167,7 +1170,7 @@ async function submitSchedule() {
         }
         
         // 1. 기존 일정 확인 (같은 날짜의 일정 찾기)
-        const getResponse = await fetch(`${BACKEND_BASE_URL}/calendar/schedules/`, {
+        const getResponse = await fetch(`${BACKEND_BASE_URL}/calendar/schedules/?date=${normalizedDate}&fields=id,date`, {
             headers: { 'Authorization': `Bearer ${accessToken}` }
         });
         
@@ -1319,6 +1322,28 @@ async function logout() {
 }
 
 // 특정 날짜의 일정 불러오기
+/**
+ * 일정 상세 API에서 메모 가져오기 (목록 API는 메모를 반환하지 않음)
+ * @param {number} scheduleId - 일정 ID
+ * @param {string} token - 접근 토큰
+ * @returns {Promise<string>} 메모 (실패 시 빈 문자열)
+ */
+async function fetchScheduleMemo(scheduleId, token) {
+    try {
+        const response = await fetch(`${BACKEND_BASE_URL}/calendar/schedules/${scheduleId}/`, {
+            headers: {'Authorization': `Bearer ${token}`}
+        });
+        if (!response.ok) {
+            return '';
+        }
+        const data = await response.json();
+        return data.memo || '';
+    } catch (error) {
+        console.error('메모 조회 오류:', error);
+        return '';
+    }
+}
+
 async function fetchScheduleForDate(date) {
     try {
         // URL 파라미터에서 added=true 여부 확인
@@ -1409,6 +1434,9 @@ async function fetchScheduleForDate(date) {
         
         // 8. 일정이 있으면 폼에 데이터 표시
         if (foundSchedule) {
+            // 메모는 목록 API에 포함되지 않으므로 상세 API로 조회
+            foundSchedule.memo = await fetchScheduleMemo(foundSchedule.id, token);
+            
             // a. 요소 찾기
             const locationInput = document.getElementById('location');
             const companionInput = document.getElementById('companion');
@@ -1574,8 +1602,8 @@ window.deleteSchedule = function() {
             deleteBtn.textContent = '삭제 중...';
         }
         
-        // 모든 일정 조회 (서버측 필터링 사용하지 않음)
-        fetch(`${BACKEND_BASE_URL}/calendar/schedules/`, {
+        // 해당 날짜 일정 조회 (서버측 날짜 필터링)
+        fetch(`${BACKEND_BASE_URL}/calendar/schedules/?date=${normalizedDate}&fields=id,date`, {
             headers: { 'Authorization': `Bearer ${token}` }
         })
         .then(response => response.json())
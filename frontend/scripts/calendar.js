@@ -155,8 +155,8 @@ class Calendar {
             // 로딩 상태 표시 (선택사항)
             this.showLoading();
             
-            // 정확한 API URL 구성
-            const apiUrl = `${BACKEND_BASE_URL}/calendar/schedules/?year=${this.currentYear}&month=${this.currentMonth + 1}`;
+            // 날짜별 요약(일정 수, 날씨 아이콘, 추천 장소 수)만 조회
+            const apiUrl = `${BACKEND_BASE_URL}/calendar/summary/?year=${this.currentYear}&month=${this.currentMonth + 1}`;
             
             const response = await fetch(apiUrl, {
                 headers: {
@@ -189,13 +189,21 @@ class Calendar {
             
             // JSON 응답 파싱
             const data = await response.json();
+            const days = Array.isArray(data.days) ? data.days : [];
+            
+            // 날짜별 요약을 일정/날씨 표시 데이터로 변환
+            const schedules = days
+                .filter(day => day.schedule_count > 0)
+                .map(day => ({ date: day.date, schedule_count: day.schedule_count }));
+            const weather = days
+                .filter(day => day.weather_icon || day.weather_main)
+                .map(day => ({ date: day.date, icon: day.weather_icon, weather_main: day.weather_main }));
+            this.recommendedCounts = Object.fromEntries(
+                days.map(day => [day.date, day.recommended_count || 0])
+            );
             
             // 일정 및 날씨 데이터 처리
-            if (data.schedules) {
-                this.updateCalendarWithSchedules(data.schedules, data.weather || []);
-            } else {
-                this.updateCalendarWithSchedules([]);
-            }
+            this.updateCalendarWithSchedules(schedules, weather);
             
         } catch (error) {
             console.error('스케줄 가져오기 오류:', error);
@@ -389,6 +397,15 @@ class Calendar {
                 day.classList.add('has-event');
             }
             
+            // 추천 장소 수 (달력 요약 API)
+            const fullDate = `${this.currentYear}-${(this.currentMonth + 1).toString().padStart(2, '0')}-${dateAttr.padStart(2, '0')}`;
+            const recommendedCount = (this.recommendedCounts || {})[fullDate] || 0;
+            if (recommendedCount > 0) {
+                day.dataset.recommendedCount = recommendedCount;
+            } else {
+                delete day.dataset.recommendedCount;
+            }
+            
             // 날씨 정보 표시
             const weatherInfo = simplifiedWeather.find(w => w.date === dateAttr);
             